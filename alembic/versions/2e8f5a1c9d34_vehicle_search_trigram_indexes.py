@@ -0,0 +1,39 @@
+"""Vehicle search trigram indexes
+
+Revision ID: 2e8f5a1c9d34
+Revises: 7c41d2e9a0b5
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2e8f5a1c9d34'
+down_revision: Union[str, None] = '7c41d2e9a0b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # GIN trigram indexes serve ILIKE '%term%' on plate and VIN (app/utils/vehicle_search.py).
+    # Postgres only: other databases run the same query without them.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index('ix_vehicle_plate_number_trgm', 'vehicle', ['plate_number'], unique=False, if_not_exists=True,
+                    postgresql_using='gin', postgresql_ops={'plate_number': 'gin_trgm_ops'})
+    op.create_index('ix_vehicle_vin_trgm', 'vehicle', ['vin'], unique=False, if_not_exists=True,
+                    postgresql_using='gin', postgresql_ops={'vin': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_vehicle_vin_trgm', table_name='vehicle', if_exists=True)
+    op.drop_index('ix_vehicle_plate_number_trgm', table_name='vehicle', if_exists=True)
@@ -0,0 +1,34 @@
+"""Request inbox indexes
+
+Revision ID: 7c41d2e9a0b5
+Revises: 383933affee8
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c41d2e9a0b5'
+down_revision: Union[str, None] = '383933affee8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # if_not_exists: databases created after these were added to the models already have them (create_all)
+    op.create_index('ix_vehicle_requests_status_id', 'vehicle_requests', ['status', 'id'], unique=False, if_not_exists=True)
+    op.create_index('ix_vehicle_requests_requester_id_id', 'vehicle_requests', ['requester_id', 'id'], unique=False, if_not_exists=True)
+    # Declared on Reparation.vehicle_id for the fleet status engine; create_all never adds it to an existing table
+    op.create_index('ix_reparation_vehicle_id', 'reparation', ['vehicle_id'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_reparation_vehicle_id', table_name='reparation', if_exists=True)
+    op.drop_index('ix_vehicle_requests_requester_id_id', table_name='vehicle_requests', if_exists=True)
+    op.drop_index('ix_vehicle_requests_status_id', table_name='vehicle_requests', if_exists=True)
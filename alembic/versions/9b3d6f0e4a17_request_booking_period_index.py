@@ -0,0 +1,38 @@
+"""Request booking period index
+
+Revision ID: 9b3d6f0e4a17
+Revises: 2e8f5a1c9d34
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b3d6f0e4a17'
+down_revision: Union[str, None] = '2e8f5a1c9d34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # GiST index on the trip window, serving the && overlap test of app/utils/availability.py.
+    # The expression must stay identical to availability.overlaps() for the planner to use it.
+    # Postgres only: other databases run the same query without it.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(
+        'CREATE INDEX IF NOT EXISTS ix_vehicle_requests_booking_period ON vehicle_requests '
+        "USING gist (tsrange(start_time, greatest(start_time, end_time), '[)'))"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_vehicle_requests_booking_period', table_name='vehicle_requests', if_exists=True)
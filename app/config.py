@@ -1,6 +1,7 @@
 # app/config.py
 
 import os
+import tempfile
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import computed_field
 from functools import lru_cache
@@ -25,6 +26,20 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 1440 
+    # Authenticated principals are cached per process to skip the token lookup query
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    # bcrypt runs on its own bounded executor; extra calls wait in a capped queue (503 beyond it)
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+
+    # Reference tables (makes, models, types, garages, roles, agencies, ...) and the /catalog document cached per process
+    LOOKUP_CACHE_TTL_SECONDS: int = 300
+    # Dashboard bundle (KPIs, charts, alerts) shared per period by every viewer for a few seconds
+    DASHBOARD_CACHE_TTL_SECONDS: int = 30
+
+    # Generated mission-order PDFs, keyed by a hash of their content
+    PDF_CACHE_DIR: str = os.path.join(tempfile.gettempdir(), "fleet_mission_orders")
 
     # Email Settings
     MAIL_USERNAME: str
@@ -37,6 +52,19 @@ class Settings(BaseSettings):
     MAIL_SSL_TLS: bool = False
     USE_CREDENTIALS: bool = True
 
+    # Outbox worker (python -m app.mail_worker): concurrent SMTP sessions, mails per session,
+    # retry backoff (doubles per attempt, capped) and attempts before a mail is dead-lettered
+    MAIL_WORKER_CONCURRENCY: int = 4
+    MAIL_WORKER_BATCH_SIZE: int = 20
+    MAIL_WORKER_POLL_SECONDS: float = 5
+    MAIL_OUTBOX_LEASE_SECONDS: int = 300
+    MAIL_OUTBOX_BACKOFF_SECONDS: int = 30
+    MAIL_OUTBOX_MAX_BACKOFF_SECONDS: int = 3600
+    MAIL_OUTBOX_MAX_ATTEMPTS: int = 8
+    # Sent / dead rows (and their attachments) are kept this long, then purged by the worker
+    MAIL_OUTBOX_RETENTION_DAYS: int = 14
+    MAIL_OUTBOX_PURGE_INTERVAL_SECONDS: int = 3600
+
     # Automatic Database URI Construction
     @computed_field
     @property
@@ -44,6 +72,13 @@ class Settings(BaseSettings):
         password = quote_plus(self.POSTGRES_PASSWORD)
         return f"postgresql://{self.POSTGRES_USER}:{password}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
+    # Same database, asyncpg driver (used by AsyncSession routes)
+    @computed_field
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        password = quote_plus(self.POSTGRES_PASSWORD)
+        return f"postgresql+asyncpg://{self.POSTGRES_USER}:{password}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+
     model_config = SettingsConfigDict(
         env_file=".env", 
         extra="ignore",
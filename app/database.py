@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.config import get_settings
 
@@ -10,6 +11,11 @@ engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async Engine (asyncpg) for `async def` routes, so queries don't block the event loop
+async_engine = create_async_engine(settings.ASYNC_DATABASE_URL, pool_pre_ping=True)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 def get_session():
@@ -22,3 +28,8 @@ def get_session():
 
 # Alias for compatibility if you used 'get_db' elsewhere
 get_db = get_session
+
+async def get_async_db():
+    """Dependency for async FastAPI Routes"""
+    async with AsyncSessionLocal() as db:
+        yield db
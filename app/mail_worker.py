@@ -0,0 +1,70 @@
+# app/mail_worker.py
+"""
+Outbox worker: drains the email_outbox table outside the API process.
+
+    python -m app.mail_worker
+
+Safe to run several replicas; rows are leased with FOR UPDATE SKIP LOCKED.
+"""
+
+import asyncio
+import logging
+import signal
+import time
+
+from app.config import settings
+from app.database import SessionLocal
+from app.utils import mail_outbox
+from app.utils.mail_dispatch import MailDispatcher
+
+
+async def run(stop: asyncio.Event):
+    dispatcher = MailDispatcher.from_settings()
+    logging.info(
+        f"Mail worker started: {settings.MAIL_WORKER_CONCURRENCY} sessions x "
+        f"{settings.MAIL_WORKER_BATCH_SIZE} mails, polling every {settings.MAIL_WORKER_POLL_SECONDS}s"
+    )
+    next_purge = 0.0
+    while not stop.is_set():
+        processed = 0
+        try:
+            if time.monotonic() >= next_purge:
+                with SessionLocal() as db:
+                    purged = mail_outbox.purge(db)
+                if purged:
+                    logging.info(f"Mail worker purged {purged} sent/dead outbox rows")
+                next_purge = time.monotonic() + settings.MAIL_OUTBOX_PURGE_INTERVAL_SECONDS
+
+            # Rows stay loaded across the lease commit (no per-row refresh before sending)
+            with SessionLocal(expire_on_commit=False) as db:
+                processed = await mail_outbox.drain_once(
+                    db, dispatcher, settings.MAIL_WORKER_CONCURRENCY, settings.MAIL_WORKER_BATCH_SIZE
+                )
+        except Exception:
+            # DB unavailable etc.: leased rows come back once their lease expires
+            logging.exception("Mail worker iteration failed")
+
+        # Keep draining while there is a backlog, otherwise wait for the next poll
+        if not processed:
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=settings.MAIL_WORKER_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+    logging.info("Mail worker stopped")
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    async def _main():
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        await run(stop)
+
+    asyncio.run(_main())
+
+
+if __name__ == "__main__":
+    main()
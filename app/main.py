@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
@@ -5,7 +7,11 @@ from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_settings
-from app.database import engine, Base
+from app.database import engine, Base, SessionLocal
+from app.utils import expense_rollup, fuel_eligibility, table_versions
+from app.utils.conditional_get import ConditionalGetMiddleware
+from app.utils.fast_json import FastJSONResponse
+from app.utils.pagination import NEXT_CURSOR_HEADER
 from fastapi.responses import HTMLResponse, Response, FileResponse
 
 # Import Routers
@@ -13,16 +19,27 @@ from app.routers import (
     user, agency, service, role, dashboard, vehicle, fuel, analytics_api,
     category_maintenance, maintenance, category_panne, garage, panne, reparation, 
     vehicle_make, vehicle_model, vehicle_transmission, vehicle_type,
-    approval, request as request_router, fuel_type 
+    approval, request as request_router, fuel_type, catalog
     # Make sure fuel_type.py exists in routers folder
 )
 
-# Initialize DB
-Base.metadata.create_all(bind=engine)
-
 settings = get_settings()
 
-app = FastAPI(title=settings.APP_NAME)
+# Database setup runs when the server starts, not on import (importing the app needs no database)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Initialize DB
+    Base.metadata.create_all(bind=engine)
+    table_versions.ensure_sequences(engine)
+
+    # Backfill derived tables on first start against an existing database
+    with SessionLocal() as startup_db:
+        expense_rollup.ensure_backfilled(startup_db)
+        fuel_eligibility.ensure_backfilled(startup_db)
+    yield
+
+# orjson for every JSON response
+app = FastAPI(title=settings.APP_NAME, default_response_class=FastJSONResponse, lifespan=lifespan)
 
 # Templates & Static
 templates = Jinja2Templates(directory="app/templates")
@@ -35,8 +52,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
+# ETags for the read endpoints guarded by conditional_get.validated_by
+app.add_middleware(ConditionalGetMiddleware)
+
 # =================================================================
 # REGISTER API ROUTERS
 # =================================================================
@@ -67,6 +88,7 @@ app.include_router(vehicle_make.router)
 app.include_router(vehicle_model.router)
 app.include_router(vehicle_type.router)
 app.include_router(vehicle_transmission.router)
+app.include_router(catalog.router)
 app.include_router(approval.router)
 
 # Page Routes (SPA)
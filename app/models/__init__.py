@@ -2,4 +2,7 @@
 from .users import *
 from .vehicles import *
 from .operations import *
-from .maintenance import *
\ No newline at end of file
+from .maintenance import *
+from .analytics import *
+from .outbox import *
+from .table_version import *
@@ -0,0 +1,40 @@
+# app/models/analytics.py
+
+from sqlalchemy import Column, DateTime, Float, Integer, String, UniqueConstraint, func
+from app.database import Base
+
+class MonthlyExpenseRollup(Base):
+    """
+    Pre-aggregated spend per (month x category x vehicle).
+    Maintained by app/utils/expense_rollup.py whenever fuel, maintenance
+    or reparation rows are written, verified or deleted.
+    """
+    __tablename__ = "monthly_expense_rollup"
+    id = Column(Integer, primary_key=True, index=True)
+    year = Column(Integer, nullable=False)
+    month = Column(Integer, nullable=False)
+    category = Column(String(20), nullable=False, index=True)  # fuel | maintenance | reparation
+    vehicle_id = Column(Integer, nullable=False, default=0, index=True)  # 0 = no vehicle linked
+
+    amount = Column(Float, nullable=False, default=0.0)
+    verified_amount = Column(Float, nullable=False, default=0.0)
+    quantity = Column(Float, nullable=False, default=0.0)  # Litres (fuel only)
+    record_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("year", "month", "category", "vehicle_id", name="uq_monthly_expense_rollup_bucket"),
+    )
+
+
+class VehicleFuelState(Base):
+    """
+    Per-vehicle inputs of the refuelling eligibility rule: the last fuel slip and
+    the end of the last completed mission. Maintained by app/utils/fuel_eligibility.py
+    whenever fuel rows are written or deleted and when a request is completed.
+    """
+    __tablename__ = "vehicle_fuel_state"
+    vehicle_id = Column(Integer, primary_key=True)
+    last_fuel_at = Column(DateTime, nullable=True)  # Naive, like the request times it is compared with
+    last_completed_mission_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
@@ -62,7 +62,7 @@ class Reparation(Base):
     id = Column(Integer, primary_key=True, index=True)
     panne_id = Column(Integer, ForeignKey("panne.id"), index=True)
     garage_id = Column(Integer, ForeignKey("garage.id"), index=True)
-    vehicle_id = Column(Integer, ForeignKey("vehicle.id"), nullable=True) # Added for back-populates
+    vehicle_id = Column(Integer, ForeignKey("vehicle.id"), nullable=True, index=True) # Added for back-populates
     
     cost = Column(Float, default=0.0)
     receipt = Column(String, nullable=False)
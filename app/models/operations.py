@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, func
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Index, func
+from sqlalchemy.orm import column_property, relationship
 from sqlalchemy.types import JSON 
 from app.database import Base
 from datetime import datetime
@@ -25,7 +25,12 @@ class VehicleRequest(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     requester_id = Column(Integer, ForeignKey("user.id", ondelete="SET NULL"), nullable=True, index=True)
-    vehicle_id = Column(Integer, ForeignKey("vehicle.id", ondelete="SET NULL"), nullable=True, index=True)
+    # active_history: the previous vehicle is loaded before it is replaced, even on an expired
+    # instance, so moving a mission refreshes the vehicle it leaves too (app/utils/fuel_eligibility.py)
+    vehicle_id = column_property(
+        Column(Integer, ForeignKey("vehicle.id", ondelete="SET NULL"), nullable=True, index=True),
+        active_history=True
+    )
     driver_id = Column(Integer, ForeignKey("user.id", ondelete="SET NULL"), nullable=True, index=True)
     
     destination = Column(String, nullable=False)
@@ -47,6 +52,12 @@ class VehicleRequest(Base):
     driver = relationship("User", foreign_keys=[driver_id], back_populates="driver_requests")
     approvals = relationship("RequestApproval", back_populates="request", cascade="all, delete-orphan")
 
+    # Request inbox (app/utils/request_inbox.py): status queues and "my requests", both read newest first
+    __table_args__ = (
+        Index("ix_vehicle_requests_status_id", "status", "id"),
+        Index("ix_vehicle_requests_requester_id_id", "requester_id", "id"),
+    )
+
 class RequestApproval(Base):
     __tablename__ = "request_approvals"
     id = Column(Integer, primary_key=True, index=True)
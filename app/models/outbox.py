@@ -0,0 +1,55 @@
+# app/models/outbox.py
+
+from datetime import datetime
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, LargeBinary, String, Text, Index
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+class EmailAttachment(Base):
+    """
+    Attachment content of queued mail, stored once per message: a fan-out to
+    N recipients (the mission-order PDF) shares one row.
+    """
+    __tablename__ = "email_outbox_attachments"
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+    mime_type = Column(String(100), nullable=False)
+    content = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+class EmailOutboxAttachment(Base):
+    """Links an outbox row to each of its attachments, in the order they are attached."""
+    __tablename__ = "email_outbox_attachment_links"
+    outbox_id = Column(Integer, ForeignKey("email_outbox.id", ondelete="CASCADE"), primary_key=True)
+    position = Column(Integer, primary_key=True)
+    attachment_id = Column(Integer, ForeignKey("email_outbox_attachments.id", ondelete="CASCADE"), nullable=False, index=True)
+    attachment = relationship("EmailAttachment")
+
+class EmailOutbox(Base):
+    """
+    Transactional outbox for outgoing mail. Rows are added in the same commit
+    as the change that triggers them and drained by app/mail_worker.py.
+    Sent and dead rows are purged after MAIL_OUTBOX_RETENTION_DAYS.
+    """
+    __tablename__ = "email_outbox"
+    id = Column(Integer, primary_key=True, index=True)
+    recipient = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    html = Column(Text, nullable=False)
+
+    # Attachments (the mission-order PDF), shared by the recipients of one message
+    attachment_links = relationship(
+        "EmailOutboxAttachment", order_by="EmailOutboxAttachment.position", cascade="all, delete-orphan"
+    )
+
+    status = Column(String(10), nullable=False, default="pending")  # pending | sent | dead
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    locked_until = Column(DateTime, nullable=True)  # Lease held by the worker that claimed the row
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_email_outbox_due", "status", "next_attempt_at"),
+    )
@@ -0,0 +1,14 @@
+# app/models/table_version.py
+
+from sqlalchemy import BigInteger, Column, String
+from app.database import Base
+
+class TableVersion(Base):
+    """
+    Change counter per table, bumped in the same transaction as every write to it
+    (app/utils/table_versions.py). Read endpoints derive their ETags from it.
+    Postgres keeps these counters in per-table sequences instead of this table.
+    """
+    __tablename__ = "table_versions"
+    name = Column(String(64), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
@@ -1,25 +1,89 @@
-from typing import List, Optional
+import logging
+from typing import Hashable, List, Optional
+from dataclasses import dataclass
 from datetime import datetime
 
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
-from app.database import get_session
+from app.database import get_async_db
 from app.config import get_settings
 from app import models
 from app.security import get_token_payload, str_decode
+from app.utils.cache import TTLCache
 
 settings = get_settings()
 
 # This defines where FastAPI looks for the token by default (Authorization: Bearer <token>)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
 
+# --- AUTHENTICATED PRINCIPAL (Cached) ---
+
+@dataclass(frozen=True)
+class RolePrincipal:
+    id: int
+    name: str
+
+
+@dataclass(frozen=True)
+class UserPrincipal:
+    """
+    Detached, read-only snapshot of the authenticated user.
+    Exposes the attributes routes read from `current_user` (including `role.name`),
+    so it can be cached across requests without holding a Session.
+    """
+    id: int
+    full_name: str
+    matricule: str
+    email: str
+    role_id: Optional[int]
+    service_id: Optional[int]
+    agency_id: Optional[int]
+    is_active: bool
+    role: Optional[RolePrincipal]
+
+    @classmethod
+    def from_user(cls, user: models.User) -> "UserPrincipal":
+        return cls(
+            id=user.id,
+            full_name=user.full_name,
+            matricule=user.matricule,
+            email=user.email,
+            role_id=user.role_id,
+            service_id=user.service_id,
+            agency_id=user.agency_id,
+            is_active=bool(user.is_active),
+            role=RolePrincipal(id=user.role.id, name=user.role.name) if user.role else None,
+        )
+
+
+# (user_token_id, access_key) -> UserPrincipal
+_principal_cache = TTLCache(maxsize=settings.AUTH_CACHE_MAX_ENTRIES, ttl=settings.AUTH_CACHE_TTL_SECONDS)
+
+
+def _cache_key(user_token_id, access_key) -> Hashable:
+    return (str(user_token_id), access_key)
+
+
+def invalidate_token(user_token_id, access_key):
+    """Forget the principal of one token (e.g. after it was expired by /auth/refresh)."""
+    _principal_cache.pop(_cache_key(user_token_id, access_key))
+
+
+def invalidate_user(user_id: int):
+    """Forget every cached principal of a user whose record changed or was deleted."""
+    _principal_cache.discard_where(lambda key, principal: principal.id == user_id)
+
+
 # --- CORE USER RETRIEVAL LOGIC ---
 
-async def get_token_user(token: str, db: Session) -> Optional[models.User]:
+async def get_token_user(token: str, db: AsyncSession) -> Optional[UserPrincipal]:
     """
     Decodes the token and verifies it against the database UserToken table.
+    Verified tokens are cached for AUTH_CACHE_TTL_SECONDS (never past their expiry).
     """
     if not token:
         return None
@@ -35,24 +99,33 @@ async def get_token_user(token: str, db: Session) -> Optional[models.User]:
         user_id = str_decode(payload.get('sub'))
         access_key = payload.get('a')
 
-        # DB Lookup: Check if this specific token exists and is valid
-        # FIX: Added eager loading for Role, Agency, and Service
-        user_token = db.query(models.UserToken).options(
-            joinedload(models.UserToken.user).joinedload(models.User.role),
-            joinedload(models.UserToken.user).joinedload(models.User.agency),
-            joinedload(models.UserToken.user).joinedload(models.User.service)
-        ).filter(
-            models.UserToken.access_key == access_key,
-            models.UserToken.id == user_token_id,
-            models.UserToken.user_id == user_id,
-            models.UserToken.expires_at > datetime.utcnow()
-        ).first()
+        cache_key = _cache_key(user_token_id, access_key)
+        principal = _principal_cache.get(cache_key)
+        if principal is not None and str(principal.id) == user_id:
+            return principal
+
+        # DB Lookup (cache miss): Check if this specific token exists and is valid.
+        # Only the role is eager loaded; the principal keeps agency/service as ids.
+        result = await db.execute(
+            select(models.UserToken).options(
+                joinedload(models.UserToken.user).joinedload(models.User.role)
+            ).where(
+                models.UserToken.access_key == access_key,
+                models.UserToken.id == int(user_token_id),
+                models.UserToken.user_id == int(user_id),
+                models.UserToken.expires_at > datetime.utcnow()
+            )
+        )
+        user_token = result.scalars().first()
 
         if user_token and user_token.user:
-            return user_token.user
+            principal = UserPrincipal.from_user(user_token.user)
+            remaining = (user_token.expires_at - datetime.utcnow()).total_seconds()
+            _principal_cache.set(cache_key, principal, ttl=remaining)
+            return principal
             
     except Exception as e:
-        print(f"Auth Error: {e}") # Helpful for debugging
+        logging.warning(f"Auth Error: {e}")
         return None
 
     return None
@@ -62,8 +135,8 @@ async def get_token_user(token: str, db: Session) -> Optional[models.User]:
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme), 
-    db: Session = Depends(get_session)
-) -> models.User:
+    db: AsyncSession = Depends(get_async_db)
+) -> UserPrincipal:
     """
     Dependency for API Routes expecting a Header Token.
     """
@@ -90,11 +163,23 @@ async def get_current_user(
 get_current_user_from_header = get_current_user
 
 
+async def get_optional_user(
+    token: Optional[str] = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> Optional[UserPrincipal]:
+    """
+    The caller's principal, or None for anonymous or invalid tokens.
+    For dependencies that vary by caller without requiring a login (public routes decide for themselves).
+    """
+    user = await get_token_user(token, db)
+    return user if user and user.is_active else None
+
+
 async def get_current_active_user_flexible(
     request: Request,
     token: Optional[str] = Depends(oauth2_scheme),
-    db: Session = Depends(get_session)
-) -> models.User:
+    db: AsyncSession = Depends(get_async_db)
+) -> UserPrincipal:
     """
     Flexible Dependency: Looks for token in Header first, then Cookie.
     """
@@ -123,7 +208,7 @@ def require_role(allowed_roles: List[str]):
     """
     Factory for role-based permission checks.
     """
-    async def role_checker(user: models.User = Depends(get_current_user)):
+    async def role_checker(user: UserPrincipal = Depends(get_current_user)):
         # Ensure role is loaded
         if not user.role:
              raise HTTPException(
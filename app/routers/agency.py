@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 
 from app import models, schemas, oauth2
 from app.database import get_db
+from app.utils import conditional_get, lookups
 
 router = APIRouter(
     prefix="/api/v1/agencies",
@@ -15,7 +16,7 @@ router = APIRouter(
 def create_agency(
     agency_data: schemas.AgencyCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api)
 ):
     # Check duplicate
     if db.query(models.Agency).filter(models.Agency.agency_name == agency_data.agency_name).first():
@@ -24,11 +25,12 @@ def create_agency(
     new_agency = models.Agency(**agency_data.model_dump())
     db.add(new_agency)
     db.commit()
+    lookups.invalidate("agency")
     db.refresh(new_agency)
     return new_agency
 
 # --- READ ALL (Public - For Dropdowns) ---
-@router.get("/", response_model=List[schemas.AgencyOut])
+@router.get("/", response_model=List[schemas.AgencyOut], dependencies=[conditional_get.validated_by(models.Agency, public=True)])
 def get_all_agencies(
     db: Session = Depends(get_db)
     # No auth dependency here so signup page can use it
@@ -40,7 +42,7 @@ def get_all_agencies(
 def get_agency_by_id(
     id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.get_current_user_from_header)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header)
 ):
     agency = db.query(models.Agency).filter(models.Agency.id == id).first()
     if not agency:
@@ -53,7 +55,7 @@ def update_agency(
     id: int,
     agency_data: schemas.AgencyCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api)
 ):
     query = db.query(models.Agency).filter(models.Agency.id == id)
     agency = query.first()
@@ -67,6 +69,7 @@ def update_agency(
 
     query.update(agency_data.model_dump(), synchronize_session=False)
     db.commit()
+    lookups.invalidate("agency")
     db.refresh(agency)
     return agency
 
@@ -75,7 +78,7 @@ def update_agency(
 def delete_agency(
     id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api)
 ):
     query = db.query(models.Agency).filter(models.Agency.id == id)
     if not query.first():
@@ -83,4 +86,5 @@ def delete_agency(
         
     query.delete(synchronize_session=False)
     db.commit()
+    lookups.invalidate("agency")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
@@ -1,24 +1,31 @@
-from fastapi import APIRouter, Depends, status, HTTPException, BackgroundTasks
+from typing import Optional
+from fastapi import APIRouter, Depends, status, HTTPException, Header, Response
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.orm.attributes import flag_modified
 from app import models, schemas, oauth2
 from app.database import get_db
-from fastapi.responses import StreamingResponse
-from app.utils.pdf_generator import generate_mission_order_pdf
+from app.utils import pdf_cache
+from app.utils.cache import etag_matches
 from app.utils.mailer import (
-    send_mission_order_email, send_rejection_email, 
-    send_accounting_email,#send_driver_assignment_email
+    queue_rejection_email, queue_full_approval_emails,#queue_driver_assignment_email
 )
 
 router = APIRouter(prefix="/api/v1/approvals", tags=['Approvals API'])
 
+def _mission_order_inputs(db: Session, request: models.VehicleRequest):
+    """Passengers and signing officers printed on the mission order."""
+    log_off = db.query(models.User).join(models.Role).filter(models.Role.name.ilike("logistic")).first()
+    darh_off = db.query(models.User).join(models.Role).filter(models.Role.name.ilike("darh")).first()
+    passenger_users = db.query(models.User).options(joinedload(models.User.service))\
+        .filter(models.User.matricule.in_(request.passengers or [])).all()
+    return passenger_users, log_off, darh_off
+
 @router.post("/{request_id}", response_model=schemas.VehicleRequestOut)
 def submit_approval(
     request_id: int,
     approval_data: schemas.RequestApprovalUpdate,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_role(["chef", "charoi", "logistic", "darh", "admin", "superadmin"]))
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_role(["chef", "charoi", "logistic", "darh", "admin", "superadmin"]))
 ):
     # 1. Fetch Request with ALL relationships to get Make/Model names instead of IDs
     db_request = db.query(models.VehicleRequest).options(
@@ -45,9 +52,10 @@ def submit_approval(
         db_request.status = models.RequestStatus.DENIED
         db_request.rejection_reason = approval_data.comments
         
+        # Queued in the outbox, committed together with the status change
         if db_request.requester.email:
-            background_tasks.add_task(
-                send_rejection_email, 
+            queue_rejection_email(
+                db,
                 email_to=db_request.requester.email, 
                 requester_name=db_request.requester.full_name, 
                 request_id=db_request.id, 
@@ -88,49 +96,29 @@ def submit_approval(
         
         # --- FINAL ACTIONS (3-WAY EMAIL DISPATCH) ---
         
-        # A. Fetch Data for PDF
-        log_off = db.query(models.User).join(models.Role).filter(models.Role.name.ilike("logistic")).first()
-        darh_off = db.query(models.User).join(models.Role).filter(models.Role.name.ilike("darh")).first()
-        passenger_users = db.query(models.User).filter(models.User.matricule.in_(db_request.passengers)).all()
-        
-        pdf_buffer = generate_mission_order_pdf(db_request, passenger_users, log_off, darh_off)
-        pdf_bytes = pdf_buffer.getvalue()
+        # A. Fetch Data for PDF (rendered once, also warms the download cache)
+        passenger_users, log_off, darh_off = _mission_order_inputs(db, db_request)
+        pdf_bytes, _ = pdf_cache.render(db_request, passenger_users, log_off, darh_off)
         filename = f"Mission_Order_{db_request.id}.pdf"
 
-        # 1. Email to Requester
+        # 1. Requester, 2. all users with 'charoi' role, 3. all users with 'accounting' role
+        recipients = []
         if db_request.requester.email:
-            background_tasks.add_task(
-                send_mission_order_email, 
-                email_to=db_request.requester.email, 
-                recipient_name=db_request.requester.full_name, 
-                pdf_bytes=pdf_bytes, 
-                filename=filename
-            )
-        
-        # 2. Email to all users with 'charoi' role
+            recipients.append((db_request.requester.email, db_request.requester.full_name))
         charoi_list = db.query(models.User).join(models.Role).filter(models.Role.name.ilike("charoi")).all()
-        for charoi_user in charoi_list:
-            if charoi_user.email:
-                background_tasks.add_task(
-                    send_mission_order_email, 
-                    email_to=charoi_user.email, 
-                    recipient_name=charoi_user.full_name, 
-                    pdf_bytes=pdf_bytes, 
-                    filename=filename
-                )
-
-        # 3. Email to all users with 'accounting' role
+        recipients += [(u.email, u.full_name) for u in charoi_list if u.email]
         accounting_list = db.query(models.User).join(models.Role).filter(models.Role.name.ilike("accounting")).all()
-        for accountant in accounting_list:
-            if accountant.email:
-                background_tasks.add_task(
-                    send_accounting_email, 
-                    email_to=accountant.email, 
-                    accountant_name=accountant.full_name, 
-                    pdf_bytes=pdf_bytes, 
-                    filename=filename, 
-                    request_id=db_request.id
-                )
+        accountants = [(u.email, u.full_name) for u in accounting_list if u.email]
+
+        # Queued in the outbox with the approval commit below; sent by the mail worker in one SMTP session
+        queue_full_approval_emails(
+            db,
+            recipients=recipients,
+            accountants=accountants,
+            pdf_bytes=pdf_bytes,
+            filename=filename,
+            request_id=db_request.id
+        )
 
     # Record the approval history
     db.add(models.RequestApproval(
@@ -143,7 +131,11 @@ def submit_approval(
     return db_request
 
 @router.get("/{request_id}/pdf")
-def get_pdf(request_id: int, db: Session = Depends(get_db)):
+def get_pdf(
+    request_id: int,
+    db: Session = Depends(get_db),
+    if_none_match: Optional[str] = Header(None)
+):
     request = db.query(models.VehicleRequest).options(
         joinedload(models.VehicleRequest.vehicle).joinedload(models.Vehicle.make_ref),
         joinedload(models.VehicleRequest.vehicle).joinedload(models.Vehicle.model_ref),
@@ -158,9 +150,13 @@ def get_pdf(request_id: int, db: Session = Depends(get_db)):
     if status_str != "fully_approved":
         raise HTTPException(status_code=400, detail="Mission not fully approved.")
     
-    log_off = db.query(models.User).join(models.Role).filter(models.Role.name.ilike("logistic")).first()
-    darh_off = db.query(models.User).join(models.Role).filter(models.Role.name.ilike("darh")).first()
-    passenger_users = db.query(models.User).filter(models.User.matricule.in_(request.passengers)).all()
+    passenger_users, log_off, darh_off = _mission_order_inputs(db, request)
+
+    # Content-addressed: the key changes whenever anything printed on the order changes
+    key = pdf_cache.mission_order_key(request, passenger_users, log_off, darh_off)
+    headers = {"ETag": f'"{key}"', "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, key):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
-    pdf_buffer = generate_mission_order_pdf(request, passenger_users, log_off, darh_off)
-    return StreamingResponse(pdf_buffer, media_type="application/pdf")
\ No newline at end of file
+    pdf_bytes, _ = pdf_cache.render(request, passenger_users, log_off, darh_off)
+    return Response(content=pdf_bytes, media_type="application/pdf", headers=headers)
\ No newline at end of file
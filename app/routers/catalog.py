@@ -0,0 +1,38 @@
+# app/routers/catalog.py
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Response, status
+from sqlalchemy.orm import Session
+
+from app import models, oauth2
+from app.database import get_db
+from app.utils import lookups
+from app.utils.cache import etag_matches
+
+router = APIRouter(
+    prefix="/api/v1/catalog",
+    tags=["Catalog API"]
+)
+
+
+# ---------------------------------------------------------
+# 🔵 All reference tables in one document (Authenticated)
+# ---------------------------------------------------------
+@router.get("/")
+def read_catalog(
+    db: Session = Depends(get_db),
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header),
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    Makes, models, types, transmissions, fuel types, garages, maintenance and panne
+    categories, roles, agencies and services, keyed by table, plus a `version`.
+    The version is also the ETag: browsers revalidate and get a 304 until a
+    reference table changes.
+    """
+    catalog = lookups.catalog(db)
+    headers = {"ETag": f'"{catalog.version}"', "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, catalog.version):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=catalog.body, media_type="application/json", headers=headers)
@@ -3,6 +3,7 @@ from fastapi import APIRouter, Depends, status, HTTPException, Response
 from sqlalchemy.orm import Session
 from app import models, schemas, oauth2
 from app.database import get_db
+from app.utils import conditional_get, lookups
 
 router = APIRouter(
     prefix="/api/v1/category_maintenance",
@@ -13,7 +14,7 @@ router = APIRouter(
 def create_maintenance_category(
     category_data: schemas.CategoryMaintenanceCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api)
 ):
     if db.query(models.CategoryMaintenance).filter(models.CategoryMaintenance.cat_maintenance.ilike(category_data.cat_maintenance)).first():
         raise HTTPException(status_code=409, detail="Category already exists.")
@@ -21,13 +22,14 @@ def create_maintenance_category(
     new_cat = models.CategoryMaintenance(**category_data.model_dump())
     db.add(new_cat)
     db.commit()
+    lookups.invalidate("category_maintenance")
     db.refresh(new_cat)
     return new_cat
 
-@router.get("/", response_model=List[schemas.CategoryMaintenanceOut])
+@router.get("/", response_model=List[schemas.CategoryMaintenanceOut], dependencies=[conditional_get.validated_by(models.CategoryMaintenance, public=True)])
 def get_all_maintenance_categories(
     db: Session = Depends(get_db),
-    #current_user: models.User = Depends(oauth2.get_current_user_from_header)
+    #current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header)
 ):
     return db.query(models.CategoryMaintenance).order_by(models.CategoryMaintenance.cat_maintenance).all()
 
@@ -35,7 +37,7 @@ def get_all_maintenance_categories(
 def get_maintenance_category_by_id(
     id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.get_current_user_from_header)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header)
 ):
     cat = db.query(models.CategoryMaintenance).filter(models.CategoryMaintenance.id == id).first()
     if not cat:
@@ -47,7 +49,7 @@ def update_maintenance_category(
     id: int,
     category_data: schemas.CategoryMaintenanceCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api)
 ):
     cat = db.query(models.CategoryMaintenance).filter(models.CategoryMaintenance.id == id).first()
     if not cat:
@@ -59,6 +61,7 @@ def update_maintenance_category(
 
     cat.cat_maintenance = category_data.cat_maintenance
     db.commit()
+    lookups.invalidate("category_maintenance")
     db.refresh(cat)
     return cat
 
@@ -66,11 +69,12 @@ def update_maintenance_category(
 def delete_maintenance_category(
     id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api)
 ):
     cat = db.query(models.CategoryMaintenance).filter(models.CategoryMaintenance.id == id).first()
     if not cat:
         raise HTTPException(status_code=404, detail="Category not found")
     db.delete(cat)
     db.commit()
+    lookups.invalidate("category_maintenance")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
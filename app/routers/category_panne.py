@@ -3,6 +3,7 @@ from fastapi import APIRouter, Depends, status, HTTPException, Response
 from sqlalchemy.orm import Session
 from app import models, schemas, oauth2
 from app.database import get_db
+from app.utils import conditional_get, lookups
 
 router = APIRouter(
     prefix="/api/v1/category_panne",
@@ -13,7 +14,7 @@ router = APIRouter(
 def create_panne_category(
     category_data: schemas.CategoryPanneCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api)
 ):
     if db.query(models.CategoryPanne).filter(models.CategoryPanne.panne_name.ilike(category_data.panne_name)).first():
         raise HTTPException(status_code=409, detail="Category already exists.")
@@ -21,13 +22,14 @@ def create_panne_category(
     new_cat = models.CategoryPanne(**category_data.model_dump())
     db.add(new_cat)
     db.commit()
+    lookups.invalidate("category_panne")
     db.refresh(new_cat)
     return new_cat
 
-@router.get("/", response_model=List[schemas.CategoryPanneOut])
+@router.get("/", response_model=List[schemas.CategoryPanneOut], dependencies=[conditional_get.validated_by(models.CategoryPanne, public=True)])
 def get_all_panne_categories(
     db: Session = Depends(get_db),
-    #current_user: models.User = Depends(oauth2.get_current_user_from_header)
+    #current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header)
 ):
     return db.query(models.CategoryPanne).order_by(models.CategoryPanne.panne_name).all()
 
@@ -35,7 +37,7 @@ def get_all_panne_categories(
 def get_panne_category_by_id(
     id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.get_current_user_from_header)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header)
 ):
     cat = db.query(models.CategoryPanne).filter(models.CategoryPanne.id == id).first()
     if not cat:
@@ -47,7 +49,7 @@ def update_panne_category(
     id: int,
     category_data: schemas.CategoryPanneCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api)
 ):
     cat = db.query(models.CategoryPanne).filter(models.CategoryPanne.id == id).first()
     if not cat:
@@ -59,6 +61,7 @@ def update_panne_category(
 
     cat.panne_name = category_data.panne_name
     db.commit()
+    lookups.invalidate("category_panne")
     db.refresh(cat)
     return cat
 
@@ -66,11 +69,12 @@ def update_panne_category(
 def delete_panne_category(
     id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api)
 ):
     cat = db.query(models.CategoryPanne).filter(models.CategoryPanne.id == id).first()
     if not cat:
         raise HTTPException(status_code=404, detail="Category not found")
     db.delete(cat)
     db.commit()
+    lookups.invalidate("category_panne")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
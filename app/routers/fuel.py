@@ -1,12 +1,14 @@
 from typing import List, Optional
 from datetime import datetime, date as date_type
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
 
 # --- Project Imports ---
 from app import models, schemas, oauth2
 from app.database import get_db
+from app.utils import bulk_verify, conditional_get, expense_rollup, fast_json, fuel_eligibility, fuel_import
+from app.utils.pagination import PageParams, page_params, paginate
 
 router = APIRouter(
     prefix="/api/v1/fuel",
@@ -16,30 +18,24 @@ router = APIRouter(
 # =================================================================================
 # BULK VERIFY (MUST BE DEFINED BEFORE /{fuel_id})
 # =================================================================================
-@router.put("/verify-bulk", status_code=status.HTTP_200_OK)
+@router.put("/verify-bulk", status_code=status.HTTP_200_OK, response_model=schemas.BulkVerifyResult)
 def verify_fuel_records_bulk(
     payload: schemas.FuelBulkVerify,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_charoi_role)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_charoi_role)
 ):
     """
     Verify multiple fuel records at once.
     """
-    records = db.query(models.Fuel).filter(
-        models.Fuel.id.in_(payload.ids),
-        models.Fuel.is_verified == False
-    ).all()
+    result = bulk_verify.verify(db, models.Fuel, payload.ids)
 
-    if not records:
+    if not result["verified"]:
         # It's better to return success with a message than 404 for bulk actions on empty selection
-        return {"message": "No applicable unverified records found."}
+        return {"message": "No applicable unverified records found.", **result}
 
-    for rec in records:
-        rec.is_verified = True
-        rec.verified_at = datetime.utcnow()
-    
+    expense_rollup.refresh_for_ids(db, "fuel", result["verified"])
     db.commit()
-    return {"message": f"Successfully verified {len(records)} records."}
+    return {"message": f"Successfully verified {len(result['verified'])} records.", **result}
 
 # =================================================================================
 # CREATE (Authenticated)
@@ -48,7 +44,7 @@ def verify_fuel_records_bulk(
 def create_new_fuel_record(
     fuel_payload: schemas.FuelCreatePayload,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.get_current_user_from_header)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header)
 ):
     # 1. Verify Vehicle
     vehicle = db.query(models.Vehicle).filter(models.Vehicle.id == fuel_payload.vehicle_id).first()
@@ -79,25 +75,51 @@ def create_new_fuel_record(
     )
     
     db.add(db_fuel_record)
+    expense_rollup.refresh_for_records(db, "fuel", [db_fuel_record])
+    fuel_eligibility.refresh(db, [db_fuel_record.vehicle_id])
     db.commit()
     db.refresh(db_fuel_record)
     return db_fuel_record
 
 
+# =================================================================================
+# BULK CREATE (CSV upload / JSON array)
+# =================================================================================
+@router.post("/bulk", response_model=schemas.BulkImportResult, status_code=status.HTTP_201_CREATED)
+async def create_fuel_records_bulk(
+    request: Request,
+    response: Response,
+    partial: bool = Query(False, description="Insert the valid slips even if some rows are rejected"),
+    db: Session = Depends(get_db),
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header)
+):
+    """
+    Imports many fuel slips at once: a multipart 'file' (.csv or .json), a JSON array
+    or a text/csv body. CSV columns: vehicle_id, fuel_type_id, quantity, price_little[, created_at].
+    Returns a per-row error report; rows are numbered from 1 (CSV header excluded).
+    """
+    rows = await fuel_import.read_rows(request)
+    report = await run_in_threadpool(fuel_import.ingest, db, rows, partial)
+    if not report["inserted"]:
+        response.status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    return report
+
+
 # =================================================================================
 # READ ALL (Authenticated)
 # =================================================================================
-@router.get("/", response_model=List[schemas.FuelOut])
+@router.get("/", response_model=List[schemas.FuelOut], dependencies=[conditional_get.validated_by(models.Fuel)])
 def read_all_fuel_records(
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.get_current_user_from_header),
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1),
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header),
+    page: PageParams = Depends(page_params()),
     vehicle_id: Optional[int] = None,
     date_after: Optional[date_type] = None,
     date_before: Optional[date_type] = None
 ):
-    query = db.query(models.Fuel)
+    # Plain column tuples, serialized by orjson: no ORM objects or Pydantic models per row
+    query = db.query(*fast_json.projection(models.Fuel, schemas.FuelOut))
 
     if vehicle_id:
         query = query.filter(models.Fuel.vehicle_id == vehicle_id)
@@ -107,7 +129,32 @@ def read_all_fuel_records(
     if date_before:
         query = query.filter(models.Fuel.created_at <= datetime.combine(date_before, datetime.max.time()))
     
-    return query.order_by(desc(models.Fuel.created_at)).offset(skip).limit(limit).all()
+    rows = paginate(query, page, response, models.Fuel.created_at, models.Fuel.id)
+    return fast_json.rows_response(rows, schemas.FuelOut, response)
+
+
+# =================================================================================
+# BATCH ELIGIBILITY (MUST BE DEFINED BEFORE /{fuel_id})
+# =================================================================================
+@router.get("/eligibility", response_model=List[schemas.VehicleEligibility])
+def check_fuel_eligibility_bulk(
+    vehicle_ids: List[int] = Query(..., description="Repeat the parameter: ?vehicle_ids=1&vehicle_ids=2"),
+    db: Session = Depends(get_db),
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header)
+):
+    """
+    Refuelling eligibility of many vehicles in one query, read from the per-vehicle
+    state kept by app/utils/fuel_eligibility.py. Unknown ids are reported, not skipped.
+    """
+    if len(vehicle_ids) > fuel_eligibility.MAX_VEHICLES:
+        raise HTTPException(status_code=400, detail=f"At most {fuel_eligibility.MAX_VEHICLES} vehicles per call.")
+    results = fuel_eligibility.check(db, vehicle_ids)
+    return fast_json.FastJSONResponse([
+        {"vehicle_id": vehicle_id, "eligible": results[vehicle_id][0], "message": results[vehicle_id][1]}
+        if vehicle_id in results else
+        {"vehicle_id": vehicle_id, "eligible": False, "message": "Vehicle not found."}
+        for vehicle_id in dict.fromkeys(vehicle_ids)
+    ])
 
 
 # =================================================================================
@@ -117,7 +164,7 @@ def read_all_fuel_records(
 def read_fuel_record_by_id(
     fuel_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.get_current_user_from_header)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header)
 ):
     db_fuel_record = db.query(models.Fuel).filter(models.Fuel.id == fuel_id).first()
     if not db_fuel_record:
@@ -133,7 +180,7 @@ def update_existing_fuel_record(
     fuel_id: int,
     fuel_payload: schemas.FuelUpdatePayload,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_charoi_role)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_charoi_role)
 ):
     db_fuel_record = db.query(models.Fuel).filter(models.Fuel.id == fuel_id).first()
     if not db_fuel_record:
@@ -143,6 +190,8 @@ def update_existing_fuel_record(
         raise HTTPException(status_code=403, detail="This record is verified and cannot be modified.")
 
     update_data = fuel_payload.model_dump(exclude_unset=True)
+    old_bucket = expense_rollup.bucket_of("fuel", db_fuel_record)
+    old_vehicle_id = db_fuel_record.vehicle_id
 
     # Verification Logic
     if "is_verified" in update_data:
@@ -163,6 +212,8 @@ def update_existing_fuel_record(
     for key, value in update_data.items():
         setattr(db_fuel_record, key, value)
 
+    expense_rollup.refresh_for_records(db, "fuel", [db_fuel_record], [old_bucket])
+    fuel_eligibility.refresh(db, [old_vehicle_id, db_fuel_record.vehicle_id])
     db.commit()
     db.refresh(db_fuel_record)
     return db_fuel_record
@@ -175,7 +226,7 @@ def update_existing_fuel_record(
 def delete_existing_fuel_record(
     fuel_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_charoi_role)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_charoi_role)
 ):
     db_fuel_record = db.query(models.Fuel).filter(models.Fuel.id == fuel_id).first()
     if not db_fuel_record:
@@ -184,7 +235,11 @@ def delete_existing_fuel_record(
     if db_fuel_record.is_verified:
         raise HTTPException(status_code=403, detail="Verified records cannot be deleted.")
 
+    bucket = expense_rollup.bucket_of("fuel", db_fuel_record)
+    vehicle_id = db_fuel_record.vehicle_id
     db.delete(db_fuel_record)
+    expense_rollup.refresh_buckets(db, "fuel", [bucket])
+    fuel_eligibility.refresh(db, [vehicle_id])
     db.commit()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
@@ -196,26 +251,10 @@ def delete_existing_fuel_record(
 def check_fuel_eligibility(
     vehicle_id: int, 
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.get_current_user_from_header)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header)
 ):
-    vehicle = db.query(models.Vehicle).filter(models.Vehicle.id == vehicle_id).first()
-    if not vehicle:
+    result = fuel_eligibility.check(db, [vehicle_id]).get(vehicle_id)
+    if result is None:
         raise HTTPException(status_code=404, detail="Vehicle not found.")
-
-    if vehicle.status != 'available':
-        return schemas.EligibilityResponse(eligible=False, message=f"Vehicle is not available.")
-
-    last_fuel = db.query(models.Fuel).filter(models.Fuel.vehicle_id == vehicle_id).order_by(desc(models.Fuel.created_at)).first()
-    
-    if last_fuel:
-        # Check for completed request
-        completed_req = db.query(models.VehicleRequest).filter(
-            models.VehicleRequest.vehicle_id == vehicle_id,
-            models.VehicleRequest.status == 'completed',
-            models.VehicleRequest.return_time > last_fuel.created_at
-        ).first()
-        
-        if not completed_req:
-            return schemas.EligibilityResponse(eligible=False, message="No completed mission since last refueling.")
-
-    return schemas.EligibilityResponse(eligible=True, message="Eligible.")
\ No newline at end of file
+    eligible, message = result
+    return schemas.EligibilityResponse(eligible=eligible, message=message)
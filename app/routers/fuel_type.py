@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 # --- Project Imports ---
 from app import models, schemas, oauth2
 from app.database import get_db
+from app.utils import conditional_get, lookups
 
 router = APIRouter(
     prefix="/api/v1/fuel-types",
@@ -18,7 +19,7 @@ router = APIRouter(
 def create_fuel_type(
     fuel_data: schemas.FuelTypeCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api)
 ):
     """
     Creates a new fuel type (e.g., 'Diesel', 'Essence', 'Electric').
@@ -37,6 +38,7 @@ def create_fuel_type(
     new_fuel = models.FuelType(**fuel_data.model_dump())
     db.add(new_fuel)
     db.commit()
+    lookups.invalidate("fuel_type")
     db.refresh(new_fuel)
     return new_fuel
 
@@ -44,10 +46,10 @@ def create_fuel_type(
 # =================================================================================
 # READ ALL (Authenticated Users)
 # =================================================================================
-@router.get("/", response_model=List[schemas.FuelTypeOut])
+@router.get("/", response_model=List[schemas.FuelTypeOut], dependencies=[conditional_get.validated_by(models.FuelType)])
 def get_all_fuel_types(
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.get_current_user_from_header)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header)
 ):
     """
     Get all fuel types sorted by name.
@@ -62,7 +64,7 @@ def get_all_fuel_types(
 def get_fuel_type_by_id(
     id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.get_current_user_from_header)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header)
 ):
     fuel_type = db.query(models.FuelType).filter(models.FuelType.id == id).first()
     if not fuel_type:
@@ -81,7 +83,7 @@ def update_fuel_type(
     id: int,
     fuel_data: schemas.FuelTypeCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api)
 ):
     query = db.query(models.FuelType).filter(models.FuelType.id == id)
     db_fuel = query.first()
@@ -102,6 +104,7 @@ def update_fuel_type(
 
     query.update(fuel_data.model_dump(), synchronize_session=False)
     db.commit()
+    lookups.invalidate("fuel_type")
     db.refresh(db_fuel)
     return db_fuel
 
@@ -113,7 +116,7 @@ def update_fuel_type(
 def delete_fuel_type(
     id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api)
 ):
     query = db.query(models.FuelType).filter(models.FuelType.id == id)
     
@@ -122,5 +125,6 @@ def delete_fuel_type(
         
     query.delete(synchronize_session=False)
     db.commit()
+    lookups.invalidate("fuel_type")
     
     return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
@@ -3,6 +3,7 @@ from fastapi import APIRouter, Depends, status, HTTPException, Response
 from sqlalchemy.orm import Session
 from app import models, schemas, oauth2
 from app.database import get_db
+from app.utils import conditional_get, lookups
 
 router = APIRouter(
     prefix="/api/v1/garage",
@@ -13,7 +14,7 @@ router = APIRouter(
 def create_garage(
     garage_data: schemas.GarageCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api)
 ):
     if db.query(models.Garage).filter(models.Garage.nom_garage.ilike(garage_data.nom_garage)).first():
         raise HTTPException(status_code=409, detail="Garage already exists.")
@@ -21,14 +22,15 @@ def create_garage(
     new_garage = models.Garage(**garage_data.model_dump())
     db.add(new_garage)
     db.commit()
+    lookups.invalidate("garage")
     db.refresh(new_garage)
     return new_garage
 
-@router.get("/", response_model=List[schemas.GarageOut])
+@router.get("/", response_model=List[schemas.GarageOut], dependencies=[conditional_get.validated_by(models.Garage, public=True)])
 def get_all_garages(
     db: Session = Depends(get_db),
     # If you want this public (e.g. for dropdowns before login), remove the dependency below.
-    #current_user: models.User = Depends(oauth2.get_current_user_from_header)
+    #current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header)
 ):
     return db.query(models.Garage).order_by(models.Garage.nom_garage).all()
 
@@ -36,7 +38,7 @@ def get_all_garages(
 def get_garage_by_id(
     id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.get_current_user_from_header)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header)
 ):
     garage = db.query(models.Garage).filter(models.Garage.id == id).first()
     if not garage:
@@ -48,7 +50,7 @@ def update_garage(
     id: int,
     garage_data: schemas.GarageCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api)
 ):
     garage = db.query(models.Garage).filter(models.Garage.id == id).first()
     if not garage:
@@ -60,6 +62,7 @@ def update_garage(
 
     garage.nom_garage = garage_data.nom_garage # Update field
     db.commit()
+    lookups.invalidate("garage")
     db.refresh(garage)
     return garage
 
@@ -67,11 +70,12 @@ def update_garage(
 def delete_garage(
     id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api)
 ):
     garage = db.query(models.Garage).filter(models.Garage.id == id).first()
     if not garage:
         raise HTTPException(status_code=404, detail="Garage not found")
     db.delete(garage)
     db.commit()
+    lookups.invalidate("garage")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
@@ -1,52 +1,17 @@
 from fastapi import APIRouter, Depends, status, HTTPException, Response
 from sqlalchemy.orm import Session
 from typing import List
-from datetime import datetime
 
 from app import models, schemas, oauth2
 from app.database import get_db
+from app.utils import bulk_verify, expense_rollup, fleet_status
+from app.utils.pagination import PageParams, page_params, paginate
 
 router = APIRouter(
     prefix="/api/v1/maintenances",
     tags=['Maintenances API']
 )
 
-# =================================================================================
-# GLOBAL HELPER: SYNC VEHICLE STATUS STRING
-# =================================================================================
-def sync_vehicle_status(db: Session, vehicle_id: int):
-    """
-    Updates the Vehicle.status string based on active maintenance or repairs.
-    """
-    vehicle = db.query(models.Vehicle).filter(models.Vehicle.id == vehicle_id).first()
-    if not vehicle:
-        return
-
-    # 1. Count Active Maintenances
-    active_maint = db.query(models.Maintenance).filter(
-        models.Maintenance.vehicle_id == vehicle_id,
-        models.Maintenance.status == "active"
-    ).count()
-
-    # 2. Count Active Reparations (as seen in your Vehicle model)
-    active_repairs = 0
-    try:
-        # Assuming Reparation has a 'status' field similarly
-        active_repairs = db.query(models.Reparation).filter(
-            models.Reparation.vehicle_id == vehicle_id,
-            models.Reparation.status == "active"
-        ).count()
-    except Exception:
-        active_repairs = 0
-
-    # 3. Update the Status String
-    if active_maint > 0 or active_repairs > 0:
-        vehicle.status = "maintenance"
-    else:
-        vehicle.status = "available"
-
-    db.commit()
-
 # =================================================================================
 # CREATE
 # =================================================================================
@@ -54,7 +19,7 @@ def sync_vehicle_status(db: Session, vehicle_id: int):
 def create_maintenance(
     maintenance_data: schemas.MaintenanceCreate, 
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.get_current_user_from_header)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header)
 ):
     # Check for existing active maintenance
     if maintenance_data.status == "active":
@@ -67,11 +32,10 @@ def create_maintenance(
 
     new_maint = models.Maintenance(**maintenance_data.model_dump())
     db.add(new_maint)
+    expense_rollup.refresh_for_records(db, "maintenance", [new_maint])
+    fleet_status.refresh(db, [new_maint.vehicle_id])
     db.commit()
     db.refresh(new_maint)
-
-    # Trigger Status Sync
-    sync_vehicle_status(db, new_maint.vehicle_id)
     
     return new_maint
 
@@ -83,7 +47,7 @@ def update_maintenance(
     id: int, 
     maint_update: schemas.MaintenanceUpdate, 
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_charoi_role)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_charoi_role)
 ):
     maint = db.query(models.Maintenance).filter(models.Maintenance.id == id).first()
     if not maint:
@@ -93,16 +57,17 @@ def update_maintenance(
     if maint.is_verified and maint.status == "resolved":
         raise HTTPException(status_code=403, detail="Locked record.")
 
+    old_bucket = expense_rollup.bucket_of("maintenance", maint)
+    old_vehicle_id = maint.vehicle_id
     update_data = maint_update.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(maint, key, value)
 
+    expense_rollup.refresh_for_records(db, "maintenance", [maint], [old_bucket])
+    fleet_status.refresh(db, [old_vehicle_id, maint.vehicle_id])
     db.commit()
     db.refresh(maint)
 
-    # Trigger Status Sync
-    sync_vehicle_status(db, maint.vehicle_id)
-
     return maint
 
 # =================================================================================
@@ -112,7 +77,7 @@ def update_maintenance(
 def delete_maintenance(
     id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_charoi_role)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_charoi_role)
 ):
     maint = db.query(models.Maintenance).filter(models.Maintenance.id == id).first()
     if not maint:
@@ -122,26 +87,28 @@ def delete_maintenance(
         raise HTTPException(status_code=403, detail="Verified records cannot be deleted.")
 
     v_id = maint.vehicle_id
+    bucket = expense_rollup.bucket_of("maintenance", maint)
     db.delete(maint)
+    expense_rollup.refresh_buckets(db, "maintenance", [bucket])
+    fleet_status.refresh(db, [v_id])
     db.commit()
 
-    # Trigger Status Sync
-    sync_vehicle_status(db, v_id)
-
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 # =================================================================================
 # OTHERS
 # =================================================================================
 @router.get("/", response_model=List[schemas.MaintenanceOut])
-def get_all_maintenances(db: Session = Depends(get_db)):
-    return db.query(models.Maintenance).order_by(models.Maintenance.id.desc()).all()
+def get_all_maintenances(response: Response, db: Session = Depends(get_db), page: PageParams = Depends(page_params())):
+    return paginate(db.query(models.Maintenance), page, response, models.Maintenance.id)
 
-@router.put("/verify-bulk", status_code=status.HTTP_200_OK)
-def verify_maintenance_bulk(payload: schemas.MaintenanceBulkVerify, db: Session = Depends(get_db)):
-    records = db.query(models.Maintenance).filter(models.Maintenance.id.in_(payload.ids)).all()
-    for rec in records:
-        rec.is_verified = True
-        rec.verified_at = datetime.utcnow()
+@router.put("/verify-bulk", status_code=status.HTTP_200_OK, response_model=schemas.BulkVerifyResult)
+def verify_maintenance_bulk(
+    payload: schemas.MaintenanceBulkVerify,
+    db: Session = Depends(get_db),
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_charoi_role)
+):
+    result = bulk_verify.verify(db, models.Maintenance, payload.ids)
+    expense_rollup.refresh_for_ids(db, "maintenance", result["verified"])
     db.commit()
-    return {"message": "Success"}
\ No newline at end of file
+    return {"message": "Success", **result}
\ No newline at end of file
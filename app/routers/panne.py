@@ -1,72 +1,33 @@
-from fastapi import APIRouter, Depends, status, HTTPException, Response
+from fastapi import APIRouter, Depends, status, HTTPException, Response, Query
 from sqlalchemy.orm import Session, joinedload
-from typing import List
-from datetime import datetime
+from typing import List, Optional
 
 from app import models, schemas, oauth2
 from app.database import get_db
+from app.utils import bulk_verify, fleet_status
+from app.utils.pagination import PageParams, page_params, paginate
 
 router = APIRouter(
     prefix="/api/v1/panne",
     tags=['Pannes API']
 )
 
-# =================================================================================
-# GLOBAL HELPER: FLEET STATUS SYNC
-# =================================================================================
-def sync_vehicle_status_logic(db: Session, vehicle_id: int):
-    """
-    Recalculates vehicle status based on active reports.
-    Priority: Panne > Maintenance > Available
-    """
-    vehicle = db.query(models.Vehicle).filter(models.Vehicle.id == vehicle_id).first()
-    if not vehicle:
-        return
-
-    # Check for any active panne
-    has_panne = db.query(models.Panne).filter(
-        models.Panne.vehicle_id == vehicle_id,
-        models.Panne.status == "active"
-    ).first()
-
-    # Check for any active maintenance
-    has_maint = db.query(models.Maintenance).filter(
-        models.Maintenance.vehicle_id == vehicle_id,
-        models.Maintenance.status == "active"
-    ).first()
-
-    if has_panne:
-        vehicle.status = "panne"
-    elif has_maint:
-        vehicle.status = "maintenance"
-    else:
-        vehicle.status = "available"
-    
-    db.commit()
-
 # =================================================================================
 # BULK VERIFY
 # =================================================================================
-@router.put("/verify-bulk", status_code=status.HTTP_200_OK)
+@router.put("/verify-bulk", status_code=status.HTTP_200_OK, response_model=schemas.BulkVerifyResult)
 def verify_panne_bulk(
     payload: schemas.PanneBulkVerify,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_charoi_role)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_charoi_role)
 ):
-    records = db.query(models.Panne).filter(
-        models.Panne.id.in_(payload.ids),
-        models.Panne.is_verified == False
-    ).all()
+    result = bulk_verify.verify(db, models.Panne, payload.ids)
 
-    if not records:
-        return {"message": "No unverified records found."}
+    if not result["verified"]:
+        return {"message": "No unverified records found.", **result}
 
-    for rec in records:
-        rec.is_verified = True
-        rec.verified_at = datetime.utcnow()
-    
     db.commit()
-    return {"message": f"Successfully verified {len(records)} records."}
+    return {"message": f"Successfully verified {len(result['verified'])} records.", **result}
 
 # =================================================================================
 # CREATE (Forced to Active)
@@ -75,7 +36,7 @@ def verify_panne_bulk(
 def create_panne(
     panne_data: schemas.PanneCreate, 
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.get_current_user_from_header)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header)
 ):
     # Check for existing active breakdown
     existing = db.query(models.Panne).filter(
@@ -91,10 +52,9 @@ def create_panne(
     new_panne.status = "active"
     
     db.add(new_panne)
+    fleet_status.refresh(db, [new_panne.vehicle_id])
     db.commit()
     db.refresh(new_panne)
-
-    sync_vehicle_status_logic(db, new_panne.vehicle_id)
     return new_panne
 
 # =================================================================================
@@ -105,7 +65,7 @@ def update_panne(
     id: int, 
     panne_update: schemas.PanneUpdate, 
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_charoi_role)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_charoi_role)
 ):
     panne = db.query(models.Panne).filter(models.Panne.id == id).first()
     if not panne:
@@ -115,14 +75,14 @@ def update_panne(
     if panne.is_verified and panne.status == "resolved":
         raise HTTPException(status_code=403, detail="Record is verified and completed. It cannot be modified.")
 
+    old_vehicle_id = panne.vehicle_id
     update_data = panne_update.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(panne, key, value)
 
+    fleet_status.refresh(db, [old_vehicle_id, panne.vehicle_id])
     db.commit()
     db.refresh(panne)
-
-    sync_vehicle_status_logic(db, panne.vehicle_id)
     return panne
 
 # =================================================================================
@@ -132,7 +92,7 @@ def update_panne(
 def delete_panne(
     id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_charoi_role)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_charoi_role)
 ):
     panne = db.query(models.Panne).filter(models.Panne.id == id).first()
     if not panne:
@@ -143,14 +103,21 @@ def delete_panne(
 
     v_id = panne.vehicle_id
     db.delete(panne)
+    fleet_status.refresh(db, [v_id])
     db.commit()
-
-    sync_vehicle_status_logic(db, v_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 # =================================================================================
 # READ ALL
 # =================================================================================
 @router.get("/", response_model=List[schemas.PanneOut])
-def get_all_pannes(db: Session = Depends(get_db)):
-    return db.query(models.Panne).options(joinedload(models.Panne.vehicle)).order_by(models.Panne.id.desc()).all()
\ No newline at end of file
+def get_all_pannes(
+    response: Response,
+    db: Session = Depends(get_db),
+    page: PageParams = Depends(page_params()),
+    panne_status: Optional[str] = Query(None, alias="status", description="e.g. status=active")
+):
+    query = db.query(models.Panne).options(joinedload(models.Panne.vehicle))
+    if panne_status:
+        query = query.filter(models.Panne.status == panne_status)
+    return paginate(query, page, response, models.Panne.id)
\ No newline at end of file
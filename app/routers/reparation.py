@@ -2,71 +2,30 @@
 from fastapi import APIRouter, Depends, status, HTTPException, Response
 from sqlalchemy.orm import Session, joinedload
 from typing import List
-from datetime import datetime
 from app import models, schemas, oauth2
 from app.database import get_db
+from app.utils import bulk_verify, expense_rollup, fleet_status
+from app.utils.pagination import PageParams, page_params, paginate
 
 router = APIRouter(prefix="/api/v1/reparation", tags=["Reparations API"])
 
 # ============================================================
 # 1. BULK VERIFY (MUST BE AT THE TOP)
 # ============================================================
-@router.put("/verify-bulk", status_code=status.HTTP_200_OK)
+@router.put("/verify-bulk", status_code=status.HTTP_200_OK, response_model=schemas.BulkVerifyResult)
 def verify_reparation_bulk(
     payload: schemas.ReparationBulkVerify,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_charoi_role)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_charoi_role)
 ):
-    records = db.query(models.Reparation).filter(
-        models.Reparation.id.in_(payload.ids),
-        models.Reparation.is_verified == False
-    ).all()
+    result = bulk_verify.verify(db, models.Reparation, payload.ids)
 
-    if not records:
-        return {"message": "No unverified records found."}
+    if not result["verified"]:
+        return {"message": "No unverified records found.", **result}
 
-    for rec in records:
-        rec.is_verified = True
-        rec.verified_at = datetime.utcnow()
-    
-    db.commit()
-    return {"message": f"Successfully verified {len(records)} records."}
-
-# ============================================================
-# HELPER: MASTER FLEET SYNC
-# ============================================================
-def sync_fleet_status(db: Session, vehicle_id: int):
-    vehicle = db.query(models.Vehicle).filter(models.Vehicle.id == vehicle_id).first()
-    if not vehicle: return
-
-    # Check for active Reparation (Takes priority)
-    active_rep = db.query(models.Reparation).filter(
-        models.Reparation.vehicle_id == vehicle_id, 
-        models.Reparation.status == "Inprogress"
-    ).first()
-
-    # Check for active Panne
-    active_panne = db.query(models.Panne).filter(
-        models.Panne.vehicle_id == vehicle_id, 
-        models.Panne.status == "active"
-    ).first()
-
-    # Check for active Maintenance
-    active_maint = db.query(models.Maintenance).filter(
-        models.Maintenance.vehicle_id == vehicle_id, 
-        models.Maintenance.status == "active"
-    ).first()
-
-    if active_rep:
-        vehicle.status = "reparation"
-    elif active_panne:
-        vehicle.status = "panne"
-    elif active_maint:
-        vehicle.status = "maintenance"
-    else:
-        vehicle.status = "available"
-    
+    expense_rollup.refresh_for_ids(db, "reparation", result["verified"])
     db.commit()
+    return {"message": f"Successfully verified {len(result['verified'])} records.", **result}
 
 # ============================================================
 # 2. CRUD OPERATIONS
@@ -76,7 +35,7 @@ def sync_fleet_status(db: Session, vehicle_id: int):
 def create_reparation(
     reparation_data: schemas.ReparationCreate, 
     db: Session = Depends(get_db), 
-    current_user: models.User = Depends(oauth2.require_charoi_role)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_charoi_role)
 ):
     panne = db.query(models.Panne).filter(models.Panne.id == reparation_data.panne_id).first()
     if not panne: raise HTTPException(status_code=404, detail="Panne reference not found.")
@@ -89,10 +48,10 @@ def create_reparation(
 
     new_rep = models.Reparation(**reparation_data.model_dump(), vehicle_id=panne.vehicle_id, is_verified=False)
     db.add(new_rep)
+    expense_rollup.refresh_for_records(db, "reparation", [new_rep])
+    fleet_status.refresh(db, [new_rep.vehicle_id])
     db.commit()
     db.refresh(new_rep)
-
-    sync_fleet_status(db, new_rep.vehicle_id)
     return new_rep
 
 @router.put("/{id}", response_model=schemas.ReparationResponse)
@@ -100,7 +59,7 @@ def update_reparation(
     id: int, 
     rep_update: schemas.ReparationUpdate, 
     db: Session = Depends(get_db), 
-    current_user: models.User = Depends(oauth2.require_charoi_role)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_charoi_role)
 ):
     rep = db.query(models.Reparation).filter(models.Reparation.id == id).first()
     if not rep: raise HTTPException(status_code=404, detail="Not found")
@@ -109,6 +68,8 @@ def update_reparation(
     if rep.is_verified and rep.status == "Completed":
         raise HTTPException(status_code=403, detail="This record is verified and completed. Locked.")
 
+    old_bucket = expense_rollup.bucket_of("reparation", rep)
+    old_vehicle_id = rep.vehicle_id
     data = rep_update.model_dump(exclude_unset=True)
     for key, value in data.items(): setattr(rep, key, value)
 
@@ -116,23 +77,27 @@ def update_reparation(
         panne = db.query(models.Panne).filter(models.Panne.id == rep.panne_id).first()
         if panne: panne.status = "resolved"
 
+    expense_rollup.refresh_for_records(db, "reparation", [rep], [old_bucket])
+    fleet_status.refresh(db, [old_vehicle_id, rep.vehicle_id])
     db.commit()
     db.refresh(rep)
-    sync_fleet_status(db, rep.vehicle_id)
     return rep
 
 @router.delete("/{id}", status_code=204)
-def delete_reparation(id: int, db: Session = Depends(get_db), current_user: models.User = Depends(oauth2.require_charoi_role)):
+def delete_reparation(id: int, db: Session = Depends(get_db), current_user: oauth2.UserPrincipal = Depends(oauth2.require_charoi_role)):
     rep = db.query(models.Reparation).filter(models.Reparation.id == id).first()
     if not rep: raise HTTPException(status_code=404, detail="Not found")
     if rep.is_verified: raise HTTPException(status_code=403, detail="Verified records cannot be deleted.")
 
     v_id = rep.vehicle_id
+    bucket = expense_rollup.bucket_of("reparation", rep)
     db.delete(rep)
+    expense_rollup.refresh_buckets(db, "reparation", [bucket])
+    fleet_status.refresh(db, [v_id])
     db.commit()
-    sync_fleet_status(db, v_id)
     return Response(status_code=204)
 
 @router.get("/", response_model=List[schemas.ReparationResponse])
-def get_all(db: Session = Depends(get_db)):
-    return db.query(models.Reparation).options(joinedload(models.Reparation.panne)).order_by(models.Reparation.id.desc()).all()
\ No newline at end of file
+def get_all(response: Response, db: Session = Depends(get_db), page: PageParams = Depends(page_params())):
+    query = db.query(models.Reparation).options(joinedload(models.Reparation.panne))
+    return paginate(query, page, response, models.Reparation.id)
\ No newline at end of file
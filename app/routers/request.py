@@ -1,61 +1,101 @@
-from fastapi import APIRouter, Depends, status, HTTPException
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, status, HTTPException, Response, Query
+from sqlalchemy.orm import Session, aliased, joinedload, selectinload
 from sqlalchemy.orm.attributes import flag_modified
-from sqlalchemy import or_
-from typing import List
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import List, Optional, Union
 from app import models, schemas, oauth2
-from app.database import get_db
+from app.database import get_db, get_async_db
+from app.utils.pagination import PageParams, page_params, paginate_async
+from app.utils import availability, conditional_get, fast_json, pdf_cache, request_inbox
 
 router = APIRouter(prefix="/api/v1/requests", tags=['Requests API'])
 
 # =================================================================
 # 1. GET ALL REQUESTS (Professional Visibility & Pagination)
 # =================================================================
-@router.get("/", response_model=List[schemas.VehicleRequestOut])
-def get_all_requests(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.get_current_user_from_header),
-    limit: int = 100, 
-    skip: int = 0
+# Every table VehicleRequestOut renders from: a write to any of them changes the ETag
+requests_list_validator = conditional_get.validated_by(
+    models.VehicleRequest, models.RequestApproval, models.User, models.Vehicle,
+    models.Role, models.Service, models.Agency,
+)
+
+# Every relationship rendered by VehicleRequestOut is eager loaded: no lazy loads on an AsyncSession.
+# The approvals collection goes through selectinload so it does not multiply the joined rows.
+FULL_REQUEST_OPTIONS = (
+    joinedload(models.VehicleRequest.requester).joinedload(models.User.service),
+    joinedload(models.VehicleRequest.requester).joinedload(models.User.agency),
+    joinedload(models.VehicleRequest.requester).joinedload(models.User.role),
+    joinedload(models.VehicleRequest.vehicle),
+    joinedload(models.VehicleRequest.driver),
+    selectinload(models.VehicleRequest.approvals).joinedload(models.RequestApproval.approver),
+)
+
+
+def _summary_query():
+    """One row per request: its own columns plus the few joined names the table shows."""
+    requester, driver = aliased(models.User), aliased(models.User)
+    return select(
+        models.VehicleRequest.id, models.VehicleRequest.status, models.VehicleRequest.destination,
+        models.VehicleRequest.description, models.VehicleRequest.departure_time, models.VehicleRequest.return_time,
+        models.VehicleRequest.passengers, models.VehicleRequest.created_at, models.VehicleRequest.rejection_reason,
+        models.VehicleRequest.requester_id, models.VehicleRequest.vehicle_id, models.VehicleRequest.driver_id,
+        requester.full_name.label("requester_name"), requester.matricule.label("requester_matricule"),
+        models.Vehicle.plate_number.label("vehicle_plate"), driver.full_name.label("driver_name"),
+    ).outerjoin(requester, models.VehicleRequest.requester_id == requester.id)\
+     .outerjoin(models.Vehicle, models.VehicleRequest.vehicle_id == models.Vehicle.id)\
+     .outerjoin(driver, models.VehicleRequest.driver_id == driver.id)
+
+
+def _summary_row(row) -> dict:
+    """A _summary_query row shaped as VehicleRequestSummaryOut."""
+    return {
+        "id": row.id,
+        "status": row.status,
+        "destination": row.destination,
+        "description": row.description,
+        "departure_time": row.departure_time,
+        "return_time": row.return_time,
+        "passengers": row.passengers or [],
+        "created_at": row.created_at,
+        "rejection_reason": row.rejection_reason,
+        "requester_id": row.requester_id,
+        "vehicle_id": row.vehicle_id,
+        "driver_id": row.driver_id,
+        "requester": {"id": row.requester_id, "full_name": row.requester_name, "matricule": row.requester_matricule} if row.requester_id else None,
+        "vehicle": {"id": row.vehicle_id, "plate_number": row.vehicle_plate} if row.vehicle_id else None,
+        "driver": {"id": row.driver_id, "full_name": row.driver_name} if row.driver_id else None,
+    }
+
+
+# Both views are in the OpenAPI contract; the full one is validated explicitly so the
+# union always resolves to VehicleRequestOut for it (the summary view bypasses validation).
+@router.get(
+    "/",
+    response_model=Union[List[schemas.VehicleRequestOut], List[schemas.VehicleRequestSummaryOut]],
+    dependencies=[requests_list_validator]
+)
+async def get_all_requests(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header),
+    page: PageParams = Depends(page_params()),
+    view: str = Query("full", pattern="^(full|summary)$", description="summary: VehicleRequestSummaryOut rows (no approvals, no nested user/vehicle objects)"),
+    actionable: bool = Query(False, description="Only the requests waiting on the caller's workflow step")
 ):
-    query = db.query(models.VehicleRequest).options(
-        joinedload(models.VehicleRequest.requester).joinedload(models.User.service),
-        joinedload(models.VehicleRequest.vehicle),
-        joinedload(models.VehicleRequest.driver),
-        joinedload(models.VehicleRequest.approvals).joinedload(models.RequestApproval.approver) 
-    )
-    
-    user_role = current_user.role.name.lower()
-
-    # --- ROLE-BASED VISIBILITY LOGIC ---
-    if user_role in ["admin", "superadmin", "darh"]:
-        pass # Administrative oversight: See everything
-        
-    elif user_role == "chef":
-        # See own requests OR requests from staff in their specific service
-        query = query.join(models.User, models.VehicleRequest.requester_id == models.User.id)\
-                     .filter(or_(models.VehicleRequest.requester_id == current_user.id,
-                                 models.User.service_id == current_user.service_id))
-                                 
-    elif user_role == "charoi":
-        # See own requests OR requests ready for asset allocation (Approved by Chef)
-        query = query.filter(or_(models.VehicleRequest.requester_id == current_user.id,
-                                 models.VehicleRequest.status == "approved_by_chef",
-                                 models.VehicleRequest.status == "fully_approved"))
-                                 
-    elif user_role == "logistic":
-        # UPGRADED: Logistic can see items waiting for Charoi (to help assign) 
-        # AND items waiting for Logistic approval
-        query = query.filter(or_(
-            models.VehicleRequest.requester_id == current_user.id,
-            models.VehicleRequest.status.in_(["approved_by_charoi","fully_approved"])
-        ))
-        
-    else:
-        # Standard Users and Drivers: See only requests they are involved in
-        query = query.filter(models.VehicleRequest.requester_id == current_user.id)
-
-    return query.order_by(models.VehicleRequest.id.desc()).offset(skip).limit(limit).all()
+    def scoped(query):
+        query = request_inbox.visible(query, current_user)
+        return query.where(request_inbox.actionable(current_user)) if actionable else query
+
+    if view == "summary":
+        query = scoped(_summary_query())
+        rows = await paginate_async(db, query, page, response, models.VehicleRequest.id, scalars=False)
+        return fast_json.page_response([_summary_row(row) for row in rows], response)
+
+    query = scoped(select(models.VehicleRequest).options(*FULL_REQUEST_OPTIONS))
+    rows = await paginate_async(db, query, page, response, models.VehicleRequest.id)
+    return [schemas.VehicleRequestOut.model_validate(row) for row in rows]
 
 
 # =================================================================
@@ -65,7 +105,7 @@ def get_all_requests(
 def create_request(
     request_data: schemas.VehicleRequestCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.get_current_user_from_header)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header)
 ):
     # Logic: Ensure the requester's matricule is always present in the manifest
     matricule_list = request_data.passengers if request_data.passengers else []
@@ -96,7 +136,7 @@ def assign_vehicle_and_driver(
     assignment_data: schemas.RequestAssignment, 
     db: Session = Depends(get_db),
     # Logistic, DARH, and Admins are now permitted to Modify/Assign
-    current_user: models.User = Depends(oauth2.require_role(["admin", "superadmin", "charoi", "darh", "logistic"]))
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_role(["admin", "superadmin", "charoi", "darh", "logistic"]))
 ):
     req = db.query(models.VehicleRequest).filter(models.VehicleRequest.id == id).first()
     if not req:
@@ -106,6 +146,18 @@ def assign_vehicle_and_driver(
     if req.status in ["denied", "completed"] and current_user.role.name.lower() not in ["admin", "superadmin"]:
          raise HTTPException(status_code=400, detail="Cannot modify a closed or denied request.")
 
+    # Rule: A newly chosen vehicle must be in service, and neither resource may be
+    # booked by another live request over an overlapping window
+    if assignment_data.vehicle_id != req.vehicle_id:
+        vehicle = db.query(models.Vehicle).filter(models.Vehicle.id == assignment_data.vehicle_id).first()
+        if not vehicle:
+            raise HTTPException(status_code=404, detail=f"Vehicle {assignment_data.vehicle_id} not found.")
+        if vehicle.status not in availability.ASSIGNABLE_VEHICLE_STATUSES:
+            raise HTTPException(status_code=409, detail=f"Vehicle {vehicle.plate_number} is not available ({vehicle.status}).")
+    clashes = availability.conflicts(db, req, assignment_data.vehicle_id, assignment_data.driver_id)
+    if clashes:
+        raise HTTPException(status_code=409, detail=" ".join(clashes))
+
     # 1. Update Assets
     req.vehicle_id = assignment_data.vehicle_id
     req.driver_id = assignment_data.driver_id
@@ -125,6 +177,7 @@ def assign_vehicle_and_driver(
     # assets (Editing) without regressing the status.
 
     db.commit()
+    pdf_cache.invalidate(req.id)
     db.refresh(req)
     return req
 
@@ -144,7 +197,56 @@ def get_active_drivers(db: Session = Depends(get_db)):
     ).all()
 
 
+# =================================================================
+# 5. AVAILABILITY (Assignment: free vehicles and drivers for a window)
+# =================================================================
+@router.get("/availability", response_model=schemas.AvailabilityOut)
+def get_availability(
+    start: datetime,
+    end: datetime,
+    exclude_request_id: Optional[int] = Query(None, description="Request being (re)assigned: its own booking does not count"),
+    db: Session = Depends(get_db),
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_role(["admin", "superadmin", "charoi", "darh", "logistic"]))
+):
+    """
+    Assignable vehicles and active drivers with no live request overlapping
+    [start, end): two indexed anti-joins, whatever the number of requests.
+    """
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end.")
+    return fast_json.FastJSONResponse({
+        "vehicles": availability.free_vehicles(db, start, end, exclude_request_id),
+        "drivers": availability.free_drivers(db, start, end, exclude_request_id),
+    })
 
 
+# =================================================================
+# 6. PENDING COUNT (Dashboard KPI)
+# =================================================================
+@router.get("/count/pending", response_model=schemas.PendingRequestsCount,
+            dependencies=[conditional_get.validated_by(models.VehicleRequest, models.User)])
+async def count_pending_requests(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header)
+):
+    """Requests waiting on the caller (see request_inbox.actionable): one indexed COUNT."""
+    return {"count": await request_inbox.count_actionable(db, current_user)}
 
 
+# =================================================================
+# 7. GET ONE REQUEST (Full dossier, same visibility as the list)
+# =================================================================
+@router.get("/{id}", response_model=schemas.VehicleRequestOut, dependencies=[requests_list_validator])
+async def get_request_by_id(
+    id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header)
+):
+    query = request_inbox.visible(
+        select(models.VehicleRequest).options(*FULL_REQUEST_OPTIONS).where(models.VehicleRequest.id == id),
+        current_user
+    )
+    req = (await db.execute(query)).unique().scalars().first()
+    if not req:
+        raise HTTPException(status_code=404, detail="Request not found.")
+    return req
@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 
 from app import models, schemas, oauth2
 from app.database import get_db
+from app.utils import conditional_get, lookups
 
 router = APIRouter(
     prefix="/api/v1/roles",
@@ -15,7 +16,7 @@ router = APIRouter(
 def create_role(
     role_data: schemas.RoleCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api)
 ):
     existing_role = db.query(models.Role).filter(models.Role.name == role_data.name.lower()).first()
     if existing_role:
@@ -24,11 +25,12 @@ def create_role(
     new_role = models.Role(name=role_data.name.lower(), description=role_data.description)
     db.add(new_role)
     db.commit()
+    lookups.invalidate("role")
     db.refresh(new_role)
     return new_role
 
 # --- READ ALL (Public - For Dropdowns) ---
-@router.get("/", response_model=List[schemas.RoleOut])
+@router.get("/", response_model=List[schemas.RoleOut], dependencies=[conditional_get.validated_by(models.Role, public=True)])
 def get_all_roles(
     db: Session = Depends(get_db)
     # No auth dependency here so signup page can use it
@@ -40,7 +42,7 @@ def get_all_roles(
 def get_role_by_id(
     id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.get_current_user_from_header)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header)
 ):
     role = db.query(models.Role).filter(models.Role.id == id).first()
     if not role:
@@ -53,7 +55,7 @@ def update_role(
     id: int,
     role_data: schemas.RoleCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api)
 ):
     query = db.query(models.Role).filter(models.Role.id == id)
     role = query.first()
@@ -69,6 +71,7 @@ def update_role(
     update_data['name'] = update_data['name'].lower()
     query.update(update_data, synchronize_session=False)
     db.commit()
+    lookups.invalidate("role")
     db.refresh(role)
     return role
 
@@ -77,7 +80,7 @@ def update_role(
 def delete_role(
     id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api)
 ):
     query = db.query(models.Role).filter(models.Role.id == id)
     if not query.first():
@@ -85,4 +88,5 @@ def delete_role(
         
     query.delete(synchronize_session=False)
     db.commit()
+    lookups.invalidate("role")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
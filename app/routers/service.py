@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 
 from app import models, schemas, oauth2
 from app.database import get_db
+from app.utils import conditional_get, lookups
 
 router = APIRouter(
     prefix="/api/v1/services",
@@ -15,7 +16,7 @@ router = APIRouter(
 def create_service(
     service_data: schemas.ServiceCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api)
 ):
     if db.query(models.Service).filter(models.Service.service_name == service_data.service_name).first():
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Service already exists.")
@@ -23,11 +24,12 @@ def create_service(
     new_service = models.Service(**service_data.model_dump())
     db.add(new_service)
     db.commit()
+    lookups.invalidate("service")
     db.refresh(new_service)
     return new_service
 
 # --- READ ALL (Public - For Dropdowns) ---
-@router.get("/", response_model=List[schemas.ServiceOut])
+@router.get("/", response_model=List[schemas.ServiceOut], dependencies=[conditional_get.validated_by(models.Service, public=True)])
 def get_all_services(
     db: Session = Depends(get_db)
     # No auth dependency here so signup page can use it
@@ -39,7 +41,7 @@ def get_all_services(
 def get_service_by_id(
     id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.get_current_user_from_header)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header)
 ):
     service = db.query(models.Service).filter(models.Service.id == id).first()
     if not service:
@@ -52,7 +54,7 @@ def update_service(
     id: int,
     service_data: schemas.ServiceCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api)
 ):
     query = db.query(models.Service).filter(models.Service.id == id)
     service = query.first()
@@ -66,6 +68,7 @@ def update_service(
 
     query.update(service_data.model_dump(), synchronize_session=False)
     db.commit()
+    lookups.invalidate("service")
     db.refresh(service)
     return service
 
@@ -74,7 +77,7 @@ def update_service(
 def delete_service(
     id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api)
 ):
     query = db.query(models.Service).filter(models.Service.id == id)
     if not query.first():
@@ -82,4 +85,5 @@ def delete_service(
         
     query.delete(synchronize_session=False)
     db.commit()
+    lookups.invalidate("service")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
@@ -6,7 +6,7 @@ import logging
 
 from fastapi import (
     APIRouter, Depends, status, HTTPException, 
-    Response, BackgroundTasks, Header, Request
+    Response, Header, Request
 )
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.responses import JSONResponse, HTMLResponse
@@ -19,12 +19,14 @@ from app import models, schemas, oauth2
 from app.database import get_db
 from app.config import get_settings
 from app.utils import unique_string
+from app.utils.pagination import PageParams, page_params, paginate
 from app.email_context import FORGOT_PASSWORD, USER_VERIFY_ACCOUNT
 
 # Security & Auth Logic
 from app.security import (
-    hash_password,
-    verify_password,
+    hash_password_pooled,
+    verify_password_pooled,
+    password_hasher,
     is_password_strong_enough,
     generate_token,
     get_token_payload,
@@ -40,10 +42,10 @@ from app.oauth2 import (
 
 # Email Services
 from app.utils.mailer import (
-    send_account_verification_email,
-    send_account_activation_confirmation_email,
-    send_password_reset_email,
-    send_password_changed_email # <--- Ensure this is imported
+    queue_account_verification_email,
+    queue_account_activation_confirmation_email,
+    queue_password_reset_email,
+    queue_password_changed_email
 )
 
 
@@ -117,11 +119,12 @@ def _generate_tokens_helper(user: models.User, db: Session):
 # =================================================================================
 # AUTH ENDPOINTS (Login, Register, Reset)
 # =================================================================================
+# Plain `def` on purpose: FastAPI runs them in its threadpool, so the sync Session
+# and the pooled bcrypt calls never block the event loop.
 
 @router.post("/auth/register", status_code=status.HTTP_201_CREATED, response_model=schemas.UserResponse)
-async def register_user(
+def register_user(
     user_data: schemas.RegisterUserRequest,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
@@ -152,13 +155,14 @@ async def register_user(
             detail="System configuration error: Default user role not found."
         )
 
-    # 5. Create the User object
+    # 5. Create the User object (bcrypt runs on the bounded hasher pool)
+    hashed_password = hash_password_pooled(user_data.password)
     new_user = models.User(
         full_name=user_data.full_name,
         matricule=user_data.matricule,
         email=user_data.email,
         telephone=user_data.telephone,
-        password=hash_password(user_data.password),
+        password=hashed_password,
         is_active=False, # Account must be verified via email first
         agency_id=user_data.agency_id,
         service_id=user_data.service_id,
@@ -167,13 +171,12 @@ async def register_user(
     )
     
     try:
+        # 6. Queue the Verification Email in the same commit as the account
         db.add(new_user)
+        queue_account_verification_email(db, new_user)
         db.commit()
         db.refresh(new_user)
         
-        # 6. Send Verification Email
-        await send_account_verification_email(new_user, background_tasks=background_tasks)
-        
         return new_user
         
     except Exception as e:
@@ -182,7 +185,7 @@ async def register_user(
 
 
 @router.post("/auth/login", status_code=status.HTTP_200_OK, response_model=schemas.LoginResponse)
-async def login(
+def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
@@ -205,7 +208,7 @@ async def login(
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect email/matricule or password.")
 
-    if not verify_password(form_data.password, user.password):
+    if not verify_password_pooled(form_data.password, user.password):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect email/matricule or password.")
 
     if not user.verified_at:
@@ -249,14 +252,14 @@ def refresh_token(
     user_token.expires_at = datetime.utcnow()
     db.add(user_token)
     db.commit()
+    oauth2.invalidate_token(user_token.id, user_token.access_key)
 
     return _generate_tokens_helper(user_token.user, db)
 
 
 @router.post("/auth/verify", status_code=status.HTTP_200_OK)
-async def verify_account(
+def verify_account(
     data: schemas.VerifyUserRequest,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
@@ -267,24 +270,21 @@ async def verify_account(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid link.")
 
     context_str = user.get_context_string(context=USER_VERIFY_ACCOUNT)
-    if not verify_password(context_str, data.token):
+    if not verify_password_pooled(context_str, data.token):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Link expired or invalid.")
 
     user.is_active = True
     user.updated_at = datetime.utcnow()
     user.verified_at = datetime.utcnow()
     db.add(user)
+    queue_account_activation_confirmation_email(db, user)
     db.commit()
-    db.refresh(user)
-
-    await send_account_activation_confirmation_email(user, background_tasks)
     return JSONResponse({"message": "Account activated successfully."})
 
 
 @router.post("/auth/forgot-password", status_code=status.HTTP_200_OK)
-async def forgot_password(
+def forgot_password(
     data: schemas.ForgotPasswordRequest, 
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
@@ -298,7 +298,8 @@ async def forgot_password(
     ).first()
     
     if user and user.email and user.is_active:
-        await send_password_reset_email(user, background_tasks)
+        queue_password_reset_email(db, user)
+        db.commit()
     
     return JSONResponse({"message": "If an account exists, a reset link has been sent."})
 
@@ -306,7 +307,6 @@ async def forgot_password(
 @router.put("/auth/reset-password", status_code=status.HTTP_200_OK)
 def reset_password(
     data: schemas.ResetRequest,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
@@ -323,49 +323,66 @@ def reset_password(
 
     # 2. Verify Token
     context_str = user.get_context_string(context=FORGOT_PASSWORD)
-    if not verify_password(context_str, data.token):
+    if not verify_password_pooled(context_str, data.token):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Link is invalid or has expired.")
 
     # 3. Update Password
-    user.password = hash_password(data.password)
+    user.password = hash_password_pooled(data.password)
     user.updated_at = datetime.utcnow()
     db.add(user)
+
+    # 4. Queue the Confirmation Email (outbox row, same commit)
+    queue_password_changed_email(db, user.email, user.full_name)
     db.commit()
-    
-    # 4. Send Confirmation Email (Background Task)
-    # FIX: Pass strings (email, name) instead of user object to avoid DetachedInstanceError
-    background_tasks.add_task(send_password_changed_email, user.email, user.full_name)
 
     return JSONResponse({"message": "Password updated successfully."})
 
 
+@router.get("/auth/password-hasher/stats", status_code=status.HTTP_200_OK)
+def get_password_hasher_stats(
+    current_user: oauth2.UserPrincipal = Depends(require_admin_role_for_api)
+):
+    """
+    Load of the bcrypt executor (running / queued / rejected calls).
+    """
+    return password_hasher.stats()
+
+
 # =================================================================================
 # USER MANAGEMENT ENDPOINTS
 # =================================================================================
 
 @router.get("/users/me", response_model=schemas.UserResponse)
 def get_current_user_profile(
-    current_user: models.User = Depends(get_current_user)
+    db: Session = Depends(get_db),
+    current_user: oauth2.UserPrincipal = Depends(get_current_user)
 ):
-    return current_user
+    # current_user is a cached principal; the profile needs the full record
+    return db.query(models.User).options(
+        joinedload(models.User.role),
+        joinedload(models.User.agency),
+        joinedload(models.User.service)
+    ).filter(models.User.id == current_user.id).first()
 
 @router.get("/users", response_model=List[schemas.UserResponse])
 def get_all_users(
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(require_admin_role_for_api),
-    limit: int = 100, skip: int = 0
+    current_user: oauth2.UserPrincipal = Depends(require_admin_role_for_api),
+    page: PageParams = Depends(page_params())
 ):
-    return db.query(models.User).options(
+    query = db.query(models.User).options(
         joinedload(models.User.role),
         joinedload(models.User.agency),
         joinedload(models.User.service)
-    ).limit(limit).offset(skip).all()
+    )
+    return paginate(query, page, response, models.User.id)
 
 @router.get("/users/{id}", response_model=schemas.UserResponse)
 def get_user_by_id(
     id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(require_admin_role_for_api)
+    current_user: oauth2.UserPrincipal = Depends(require_admin_role_for_api)
 ):
     user = db.query(models.User).options(
         joinedload(models.User.role),
@@ -382,7 +399,7 @@ def update_user(
     id: int,
     user_update: schemas.UserUpdate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(require_admin_role_for_api)
+    current_user: oauth2.UserPrincipal = Depends(require_admin_role_for_api)
 ):
     # 1. Fetch user with joinedload to ensure relationships are available
     query = db.query(models.User).options(
@@ -402,6 +419,7 @@ def update_user(
 
     try:
         db.commit()
+        oauth2.invalidate_user(id)
         # 2. Refresh ensures the DB state is synced, 
         # but we re-query to ensure relationships are fully populated for the response
         db.refresh(user)
@@ -421,7 +439,7 @@ def update_user(
 def delete_user(
     id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(require_admin_role_for_api)
+    current_user: oauth2.UserPrincipal = Depends(require_admin_role_for_api)
 ):
     user = db.query(models.User).filter(models.User.id == id).first()
     if not user:
@@ -432,6 +450,7 @@ def delete_user(
 
     db.delete(user)
     db.commit()
+    oauth2.invalidate_user(id)
     return None
 
 # =================================================================================
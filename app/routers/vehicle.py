@@ -1,11 +1,14 @@
 # app/routers/vehicle.py
 from typing import List
-from fastapi import APIRouter, Depends, status, HTTPException, Response, Query
+from fastapi import APIRouter, Depends, status, HTTPException, Response, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from datetime import datetime
 
 from app import models, schemas, oauth2
 from app.database import get_db
+from app.utils import bulk_verify, conditional_get, expense_rollup, fast_json, fleet_status, fuel_eligibility, vehicle_import, vehicle_search
+from app.utils.pagination import PageParams, page_params, paginate
 
 router = APIRouter(
     prefix="/api/v1/vehicles",
@@ -17,7 +20,7 @@ router = APIRouter(
 def create_vehicle(
     vehicle_data: schemas.VehicleCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.get_current_user_from_header)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header)
 ):
     if db.query(models.Vehicle).filter(models.Vehicle.plate_number == vehicle_data.plate_number).first():
         raise HTTPException(status_code=409, detail="Plate number already exists.")
@@ -35,48 +38,90 @@ def create_vehicle(
     db.refresh(new_vehicle)
     return new_vehicle
 
+# 1b. BULK IMPORT (CSV / JSON array)
+@router.post("/bulk", response_model=schemas.BulkImportResult, status_code=status.HTTP_201_CREATED)
+async def import_vehicles_bulk(
+    request: Request,
+    response: Response,
+    partial: bool = Query(False, description="Insert the valid rows even if some rows are rejected"),
+    db: Session = Depends(get_db),
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_charoi_role)
+):
+    """
+    Onboards many vehicles at once from a multipart 'file' (.csv or .json), a JSON array
+    or a text/csv body. make, model, vehicle_type, vehicle_transmission and
+    vehicle_fuel_type take either an id or a name. Returns a per-row error report.
+    """
+    rows = await vehicle_import.read_rows(request)
+    report = await run_in_threadpool(vehicle_import.ingest, db, rows, partial)
+    if not report["inserted"]:
+        response.status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    return report
+
 # 2. BULK VERIFY (Must be before /{id})
-@router.put("/verify-bulk", status_code=status.HTTP_200_OK)
+@router.put("/verify-bulk", status_code=status.HTTP_200_OK, response_model=schemas.BulkVerifyResult)
 def verify_vehicles_bulk(
     payload: schemas.VehicleBulkVerify,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_charoi_role)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_charoi_role)
 ):
-    records = db.query(models.Vehicle).filter(
-        models.Vehicle.id.in_(payload.ids),
-        models.Vehicle.is_verified == False
-    ).all()
+    result = bulk_verify.verify(db, models.Vehicle, payload.ids)
 
-    if not records:
+    if not result["verified"]:
         raise HTTPException(status_code=404, detail="No unverified vehicles found with provided IDs.")
 
-    for rec in records:
-        rec.is_verified = True
-        rec.verified_at = datetime.utcnow()
-    
     db.commit()
-    return {"message": f"Successfully verified {len(records)} vehicles."}
+    return {"message": f"Successfully verified {len(result['verified'])} vehicles.", **result}
+
+# 2b. RECOMPUTE FLEET STATUS (Must be before /{id})
+@router.post("/status/recompute", status_code=status.HTTP_200_OK)
+def recompute_fleet_status(
+    db: Session = Depends(get_db),
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api)
+):
+    """Re-derives every vehicle's status from open reparations, pannes and maintenances."""
+    fleet_status.refresh(db)
+    db.commit()
+    return {"message": "Fleet status recomputed."}
 
 # 3. READ ALL
-@router.get("/", response_model=List[schemas.VehicleOut])
+@router.get("/", response_model=List[schemas.VehicleOut],
+            dependencies=[conditional_get.validated_by(models.Vehicle, models.VehicleMake, models.VehicleModel)])
 def get_all_vehicles(
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.get_current_user_from_header),
-    limit: int = 1000,
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header),
+    page: PageParams = Depends(page_params(default_limit=1000)),
     search: str = ""
 ):
-    query = db.query(models.Vehicle)
-    if search:
-        query = query.filter(models.Vehicle.plate_number.ilike(f"%{search}%"))
+    # Plain column tuples, serialized by orjson: no ORM objects or Pydantic models per row
+    query = db.query(*fast_json.projection(models.Vehicle, schemas.VehicleOut))
+    if search.strip():
+        query = query.filter(vehicle_search.match(db, search))
     
-    return query.limit(limit).all()
+    rows = paginate(query, page, response, models.Vehicle.id)
+    return fast_json.rows_response(rows, schemas.VehicleOut, response)
+
+# 3b. SEARCH (Typeahead; MUST BE DEFINED BEFORE /{id})
+@router.get("/search", response_model=List[schemas.VehicleSearchHit],
+            dependencies=[conditional_get.validated_by(models.Vehicle, models.VehicleMake, models.VehicleModel)])
+def search_vehicles(
+    db: Session = Depends(get_db),
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header),
+    q: str = Query("", max_length=100, description="Part of a plate, VIN, make or model name"),
+    vehicle_status: List[str] = Query(None, alias="status", description="Repeatable, e.g. status=available&status=active"),
+    limit: int = Query(10, ge=1, le=vehicle_search.MAX_RESULTS),
+    ids: List[int] = Query(None, description="Repeatable: only these vehicles, e.g. ids=1&ids=2")
+):
+    """Ranked matches: exact plate, plate prefix, VIN, plate/VIN substring, then make/model."""
+    return fast_json.FastJSONResponse(vehicle_search.search(db, q, vehicle_status, limit, ids))
 
 # 4. READ ONE
 @router.get("/{id}", response_model=schemas.VehicleOut)
 def get_vehicle_by_id(
     id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.get_current_user_from_header)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header)
 ):
     vehicle = db.query(models.Vehicle).filter(models.Vehicle.id == id).first()
     if not vehicle:
@@ -89,7 +134,7 @@ def update_vehicle(
     id: int,
     vehicle_data: schemas.VehicleUpdate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_charoi_role)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_charoi_role)
 ):
     vehicle = db.query(models.Vehicle).filter(models.Vehicle.id == id).first()
     if not vehicle:
@@ -119,7 +164,7 @@ def update_vehicle(
 def delete_vehicle(
     id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_charoi_role)
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_charoi_role)
 ):
     vehicle = db.query(models.Vehicle).filter(models.Vehicle.id == id).first()
     if not vehicle:
@@ -128,6 +173,8 @@ def delete_vehicle(
     if vehicle.is_verified:
         raise HTTPException(status_code=403, detail="Verified vehicles cannot be deleted.")
 
+    expense_rollup.forget_vehicle(db, vehicle.id)
+    fuel_eligibility.forget_vehicle(db, vehicle.id)
     db.delete(vehicle)
     db.commit()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
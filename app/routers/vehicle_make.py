@@ -6,6 +6,7 @@ from typing import List
 
 from .. import models, schemas, oauth2
 from ..database import get_db
+from ..utils import conditional_get, lookups
 
 router = APIRouter(
     prefix="/api/v1/vehicle-makes",
@@ -20,7 +21,7 @@ router = APIRouter(
 def create_vehicle_make(
     payload: schemas.VehicleMakeCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api),
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api),
 ):
     """
     Create a new vehicle make (e.g., Toyota). 
@@ -42,6 +43,7 @@ def create_vehicle_make(
     new_make = models.VehicleMake(**payload.model_dump())
     db.add(new_make)
     db.commit()
+    lookups.invalidate("vehicle_make")
     db.refresh(new_make)
 
     return new_make
@@ -50,10 +52,10 @@ def create_vehicle_make(
 # ---------------------------------------------------------
 # 🔵 Get All Vehicle Makes (Any authenticated user)
 # ---------------------------------------------------------
-@router.get("/", response_model=List[schemas.VehicleMakeOut])
+@router.get("/", response_model=List[schemas.VehicleMakeOut], dependencies=[conditional_get.validated_by(models.VehicleMake)])
 def get_all_vehicle_makes(
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.get_current_user_from_header),
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header),
 ):
     """
     Return all vehicle makes sorted alphabetically.
@@ -76,7 +78,7 @@ def get_all_vehicle_makes(
 def get_vehicle_make_by_id(
     id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.get_current_user_from_header),
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header),
 ):
     """
     Get a single vehicle make by ID.
@@ -101,7 +103,7 @@ def update_vehicle_make(
     id: int,
     payload: schemas.VehicleMakeCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api),
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api),
 ):
     """
     Update a vehicle make. Admin or SuperAdmin required.
@@ -131,6 +133,7 @@ def update_vehicle_make(
 
     make_query.update(payload.model_dump(), synchronize_session=False)
     db.commit()
+    lookups.invalidate("vehicle_make")
     db.refresh(db_make)
 
     return db_make
@@ -143,7 +146,7 @@ def update_vehicle_make(
 def delete_vehicle_make(
     id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api),
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api),
 ):
     """
     Delete a vehicle make. Admin or SuperAdmin only.
@@ -160,5 +163,6 @@ def delete_vehicle_make(
 
     make_query.delete(synchronize_session=False)
     db.commit()
+    lookups.invalidate("vehicle_make")
 
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -6,6 +6,7 @@ from typing import List
 
 from .. import models, schemas, oauth2
 from ..database import get_db
+from ..utils import conditional_get, lookups
 
 router = APIRouter(
     prefix="/api/v1/vehicle-models",
@@ -19,7 +20,7 @@ router = APIRouter(
 def create_vehicle_model(
     model_data: schemas.VehicleModelCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api),
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api),
 ):
     """
     Create a new vehicle model (e.g., 'Corolla', 'Civic', 'F150').
@@ -42,6 +43,7 @@ def create_vehicle_model(
     new_model = models.VehicleModel(**model_data.model_dump())
     db.add(new_model)
     db.commit()
+    lookups.invalidate("vehicle_model")
     db.refresh(new_model)
 
     return new_model
@@ -50,10 +52,10 @@ def create_vehicle_model(
 # ──────────────────────────────────────────────────────────────────────────────
 # GET all vehicle models (Any Authenticated User)
 # ──────────────────────────────────────────────────────────────────────────────
-@router.get("/", response_model=List[schemas.VehicleModelOut])
+@router.get("/", response_model=List[schemas.VehicleModelOut], dependencies=[conditional_get.validated_by(models.VehicleModel)])
 def get_all_vehicle_models(
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.get_current_user_from_header),
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header),
 ):
     """
     Get list of all vehicle models.
@@ -74,7 +76,7 @@ def get_all_vehicle_models(
 def get_vehicle_model_by_id(
     id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.get_current_user_from_header),
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header),
 ):
     """
     Retrieve a single vehicle model by ID.
@@ -100,7 +102,7 @@ def update_vehicle_model(
     id: int,
     model_data: schemas.VehicleModelCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api),
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api),
 ):
     """
     Update vehicle model information.
@@ -132,6 +134,7 @@ def update_vehicle_model(
 
     query.update(model_data.model_dump(), synchronize_session=False)
     db.commit()
+    lookups.invalidate("vehicle_model")
     db.refresh(db_model)
 
     return db_model
@@ -144,7 +147,7 @@ def update_vehicle_model(
 def delete_vehicle_model(
     id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api),
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api),
 ):
     """
     Delete a vehicle model.
@@ -161,5 +164,6 @@ def delete_vehicle_model(
 
     query.delete(synchronize_session=False)
     db.commit()
+    lookups.invalidate("vehicle_model")
 
     return Response(status_code=status.HTTP_204_NO_CONTENT)
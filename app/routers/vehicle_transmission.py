@@ -6,6 +6,7 @@ from typing import List
 
 from .. import models, schemas, oauth2
 from ..database import get_db
+from ..utils import conditional_get, lookups
 
 router = APIRouter(
     prefix="/api/v1/vehicle-transmissions",
@@ -19,7 +20,7 @@ router = APIRouter(
 def create_vehicle_transmission(
     transmission_data: schemas.VehicleTransmissionCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api),
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api),
 ):
     """
     Create a new vehicle transmission type (e.g., 'Automatic', 'Manual').
@@ -41,6 +42,7 @@ def create_vehicle_transmission(
     new_transmission = models.VehicleTransmission(**transmission_data.model_dump())
     db.add(new_transmission)
     db.commit()
+    lookups.invalidate("vehicle_transmission")
     db.refresh(new_transmission)
 
     return new_transmission
@@ -49,10 +51,10 @@ def create_vehicle_transmission(
 # ──────────────────────────────────────────────────────────────────────────────
 # GET all transmissions (Authenticated Users)
 # ──────────────────────────────────────────────────────────────────────────────
-@router.get("/", response_model=List[schemas.VehicleTransmissionOut])
+@router.get("/", response_model=List[schemas.VehicleTransmissionOut], dependencies=[conditional_get.validated_by(models.VehicleTransmission)])
 def get_all_vehicle_transmissions(
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.get_current_user_from_header),
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header),
 ):
     """
     Get list of all vehicle transmission types.
@@ -73,7 +75,7 @@ def get_all_vehicle_transmissions(
 def get_vehicle_transmission_by_id(
     id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.get_current_user_from_header),
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header),
 ):
     """
     Get a single vehicle transmission by ID.
@@ -103,7 +105,7 @@ def update_vehicle_transmission(
     id: int,
     transmission_data: schemas.VehicleTransmissionCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api),
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api),
 ):
     """
     Update a vehicle transmission type.
@@ -135,6 +137,7 @@ def update_vehicle_transmission(
 
     query.update(transmission_data.model_dump(), synchronize_session=False)
     db.commit()
+    lookups.invalidate("vehicle_transmission")
     db.refresh(db_transmission)
 
     return db_transmission
@@ -147,7 +150,7 @@ def update_vehicle_transmission(
 def delete_vehicle_transmission(
     id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api),
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api),
 ):
     """
     Delete a vehicle transmission type.
@@ -164,5 +167,6 @@ def delete_vehicle_transmission(
 
     query.delete(synchronize_session=False)
     db.commit()
+    lookups.invalidate("vehicle_transmission")
 
     return Response(status_code=status.HTTP_204_NO_CONTENT)
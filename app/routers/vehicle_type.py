@@ -6,6 +6,7 @@ from typing import List
 
 from .. import models, schemas, oauth2
 from ..database import get_db
+from ..utils import conditional_get, lookups
 
 router = APIRouter(
     prefix="/api/v1/vehicle-types",
@@ -19,7 +20,7 @@ router = APIRouter(
 def create_vehicle_type(
     type_data: schemas.VehicleTypeCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api),
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api),
 ):
     """
     Create a new vehicle type (e.g., 'Sedan', 'SUV').
@@ -41,6 +42,7 @@ def create_vehicle_type(
     new_type = models.VehicleType(**type_data.model_dump())
     db.add(new_type)
     db.commit()
+    lookups.invalidate("vehicle_type")
     db.refresh(new_type)
 
     return new_type
@@ -49,10 +51,10 @@ def create_vehicle_type(
 # ──────────────────────────────────────────────────────────────────────────────
 # GET all vehicle types (Authenticated Users)
 # ──────────────────────────────────────────────────────────────────────────────
-@router.get("/", response_model=List[schemas.VehicleTypeOut])
+@router.get("/", response_model=List[schemas.VehicleTypeOut], dependencies=[conditional_get.validated_by(models.VehicleType)])
 def get_all_vehicle_types(
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.get_current_user_from_header),
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header),
 ):
     """
     Get a list of all available vehicle types.
@@ -73,7 +75,7 @@ def get_all_vehicle_types(
 def get_vehicle_type_by_id(
     id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.get_current_user_from_header),
+    current_user: oauth2.UserPrincipal = Depends(oauth2.get_current_user_from_header),
 ):
     """
     Retrieve a single vehicle type by ID.
@@ -103,7 +105,7 @@ def update_vehicle_type(
     id: int,
     type_data: schemas.VehicleTypeCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api),
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api),
 ):
     """
     Update a vehicle type.
@@ -134,6 +136,7 @@ def update_vehicle_type(
 
     type_query.update(type_data.model_dump(), synchronize_session=False)
     db.commit()
+    lookups.invalidate("vehicle_type")
     db.refresh(db_type)
 
     return db_type
@@ -146,7 +149,7 @@ def update_vehicle_type(
 def delete_vehicle_type(
     id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.require_admin_role_for_api),
+    current_user: oauth2.UserPrincipal = Depends(oauth2.require_admin_role_for_api),
 ):
     """
     Delete a vehicle type.
@@ -163,5 +166,6 @@ def delete_vehicle_type(
 
     type_query.delete(synchronize_session=False)
     db.commit()
+    lookups.invalidate("vehicle_type")
 
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -12,10 +12,11 @@ from .vehicles import (
     VehicleTypeBase, VehicleTypeCreate, VehicleTypeOut,
     VehicleMakeBase, VehicleMakeCreate, VehicleMakeOut,
     VehicleModelBase, VehicleModelCreate, VehicleModelOut,
-    VehicleTransmissionBase, VehicleTransmissionCreate, VehicleTransmissionOut,VehicleBulkVerify,
+    VehicleTransmissionBase, VehicleTransmissionCreate, VehicleTransmissionOut,VehicleBulkVerify,BulkVerifyResult,
     FuelTypeBase, FuelTypeCreate, FuelTypeOut,
-    VehicleBase, VehicleCreate, VehicleUpdate, VehicleOut, VehicleNestedInTrip,
+    VehicleBase, VehicleCreate, VehicleUpdate, VehicleOut, VehicleNestedInTrip, VehicleBulkRow,
     FuelBase, FuelCreatePayload, FuelUpdatePayload, FuelOut,
+    FuelBulkRow, BulkRowError, BulkImportResult,
     CategoryFuelBase, CategoryFuelCreate, CategoryFuelOut,
     EligibilityResponse,FuelBulkVerify  
 )
@@ -13,6 +13,7 @@ class KPIStats(BaseModel):
     repairs_this_month: int
     fuel_cost_this_week: float
     total_purchase_cost: float  # Ensure this is here
+    active_alerts_count: int = 0
 
 # --- INSIGHTS ---
 class FuelEfficiencyData(BaseModel):
@@ -174,4 +175,55 @@ class DetailedReportDataResponse(BaseModel):
     fuel_records: List[FuelRecordDetail] = []
     reparation_records: List[ReparationRecordDetail] = []
     maintenance_records: List[MaintenanceRecordDetail] = []
-    purchase_records: List[PurchaseRecordDetail] = []
\ No newline at end of file
+    purchase_records: List[PurchaseRecordDetail] = []
+
+
+# --- VEHICLE COST OF OWNERSHIP (GET /analytics-data/vehicle-tco) ---
+class VehicleTCOMonth(BaseModel):
+    month: str  # YYYY-MM
+    fuel_cost: float
+    maintenance_cost: float
+    reparation_cost: float
+    fuel_litres: float
+    cumulative_cost: float  # Running total since the start of the period
+
+class VehicleTCOItem(BaseModel):
+    vehicle_id: int
+    plate_number: str
+    make: Optional[str] = None
+    model: Optional[str] = None
+    status: Optional[str] = None
+    mileage: Optional[float] = None
+    purchase_price: Optional[float] = None
+    fuel_cost: float
+    maintenance_cost: float
+    reparation_cost: float
+    running_cost: float  # fuel + maintenance + reparation
+    ownership_cost: float  # purchase price + running cost
+    cost_per_km: Optional[float] = None  # None when no mileage is recorded
+    fuel_litres: float
+    avg_monthly_litres: Optional[float] = None  # Over the months with refuels
+    litres_per_100km: Optional[float] = None
+    cost_rank: int  # 1 = highest running cost in the fleet
+    fleet_share: Optional[float] = None  # Share of the fleet's running cost
+    monthly: Optional[List[VehicleTCOMonth]] = None
+
+class FleetTCOTotals(BaseModel):
+    vehicles: int
+    running_cost: float
+    fuel_litres: float
+
+class VehicleTCOReport(BaseModel):
+    fleet: FleetTCOTotals
+    vehicles: List[VehicleTCOItem]
+
+
+# --- DASHBOARD BUNDLE (GET /dashboard-data/bundle) ---
+class DashboardBundle(BaseModel):
+    kpis: KPIStats
+    alerts: AlertsResponse
+    pending_requests: int  # Requests waiting on the caller
+    vehicle_status: VehicleStatusChartData
+    monthly_activity: MonthlyActivityChartData
+    expenses: AnalyticsExpenseSummaryResponse
+    recent_alerts: List[AlertItem]
@@ -2,13 +2,24 @@ from typing import List, Optional
 from datetime import datetime
 from pydantic import BaseModel, ConfigDict
 from .users import UserOut, UserSimpleOut
-from .vehicles import VehicleOut
+from .vehicles import VehicleOut, VehicleSearchHit
 
 class DriverNestedInRequest(BaseModel):
     id: int
     full_name: Optional[str] = None
     model_config = ConfigDict(from_attributes=True)
 
+class RequesterNestedInRequest(BaseModel):
+    id: int
+    full_name: Optional[str] = None
+    matricule: Optional[str] = None
+    model_config = ConfigDict(from_attributes=True)
+
+class VehicleNestedInRequest(BaseModel):
+    id: int
+    plate_number: Optional[str] = None
+    model_config = ConfigDict(from_attributes=True)
+
 class RequestApprovalOut(BaseModel):
     id: int
     approval_step: int
@@ -49,4 +60,25 @@ class VehicleRequestOut(VehicleRequestBase):
     driver: Optional[DriverNestedInRequest] = None
     approvals: List[RequestApprovalOut] = []
     
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class VehicleRequestSummaryOut(VehicleRequestBase):
+    """Row of GET /requests/?view=summary: only what the requests table renders."""
+    id: int
+    status: str
+    requester_id: Optional[int] = None
+    vehicle_id: Optional[int] = None
+    driver_id: Optional[int] = None
+    created_at: datetime
+    rejection_reason: Optional[str] = None
+    requester: Optional[RequesterNestedInRequest] = None
+    vehicle: Optional[VehicleNestedInRequest] = None
+    driver: Optional[DriverNestedInRequest] = None
+
+class PendingRequestsCount(BaseModel):
+    count: int
+
+class AvailabilityOut(BaseModel):
+    """Resources free over a trip window (GET /requests/availability)."""
+    vehicles: List[VehicleSearchHit]
+    drivers: List[UserSimpleOut]
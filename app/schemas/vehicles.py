@@ -1,5 +1,5 @@
  # Vehicle, Fuel, Types
-from typing import Optional,List
+from typing import Optional,List,Union
 from datetime import datetime
 from pydantic import BaseModel, Field, computed_field
 
@@ -60,6 +60,22 @@ class VehicleBase(BaseModel):
 class VehicleCreate(VehicleBase):
     pass
 
+class VehicleBulkRow(BaseModel):
+    """One row of POST /vehicles/bulk. Reference columns take an id or a name."""
+    plate_number: str
+    vin: str
+    color: str
+    year: int
+    make: Union[int, str]
+    model: Union[int, str]
+    vehicle_type: Union[int, str]
+    vehicle_transmission: Union[int, str]
+    vehicle_fuel_type: Union[int, str]
+    mileage: float = 0.0
+    engine_size: float = 0.0
+    purchase_price: float = 0.0
+    purchase_date: datetime
+
 class VehicleUpdate(BaseModel):
     plate_number: Optional[str] = None
     make: Optional[int] = None
@@ -88,9 +104,26 @@ class VehicleOut(VehicleBase):
     class Config:
         from_attributes = True
 
+class VehicleSearchHit(BaseModel):
+    """Typeahead-sized row of GET /vehicles/search (make/model as names)."""
+    id: int
+    plate_number: str
+    vin: str
+    make: Optional[str] = None
+    model: Optional[str] = None
+    vehicle_fuel_type: Optional[int] = None
+    status: Optional[str] = None
+
 class VehicleBulkVerify(BaseModel):
     ids: List[int]
 
+class BulkVerifyResult(BaseModel):
+    """Shared response of every /verify-bulk endpoint."""
+    message: str
+    verified: List[int] = []
+    already_verified: List[int] = []
+    missing: List[int] = []
+
 
 class VehicleNestedInTrip(BaseModel):
     id: int
@@ -122,6 +155,22 @@ class FuelCreatePayload(BaseModel):
     price_little: float
 
 
+class FuelBulkRow(FuelCreatePayload):
+    """One slip of POST /fuel/bulk. created_at defaults to the time of import."""
+    created_at: Optional[datetime] = None
+
+class BulkRowError(BaseModel):
+    row: int  # 1-based position in the upload (CSV: data line, header excluded)
+    errors: List[str]
+
+class BulkImportResult(BaseModel):
+    """Shared response of the /bulk import endpoints."""
+    received: int
+    inserted: int
+    ids: List[int] = []
+    errors: List[BulkRowError] = []
+
+
 class FuelUpdatePayload(BaseModel):
     vehicle_id: Optional[int] = None
     fuel_type_id: Optional[int] = None
@@ -153,4 +202,8 @@ class EligibilityResponse(BaseModel):
     eligible: bool
     message: str
 
+class VehicleEligibility(EligibilityResponse):
+    """One row of GET /fuel/eligibility."""
+    vehicle_id: int
+
 
@@ -1,8 +1,11 @@
 import logging
 import base64
+import threading
 import jwt
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
 from app.config import get_settings
 
@@ -19,6 +22,84 @@ def hash_password(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+# --- Bounded bcrypt executor ---
+
+class PasswordHasherPool:
+    """
+    Dedicated executor for bcrypt (~250 ms of CPU per call).
+    At most `max_workers` hashes run at once; up to `max_queue` more wait.
+    Beyond that, callers get a 503 instead of growing the backlog, so a login
+    burst cannot starve the event loop or the generic threadpool.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self._pending = 0   # submitted and not finished (running + queued)
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def _admit(self, reject_when_full: bool):
+        with self._lock:
+            if reject_when_full and self._pending >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                logging.warning("Password hasher saturated: %s calls pending", self._pending)
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication service is busy. Please retry shortly.",
+                    headers={"Retry-After": "1"}
+                )
+            self._pending += 1
+
+    def _submit(self, fn: Callable, *args, reject_when_full: bool):
+        self._admit(reject_when_full)
+        try:
+            return self._executor.submit(self._call, fn, *args)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+
+    def _call(self, fn: Callable, *args):
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._pending -= 1
+                self._completed += 1
+
+    def run(self, fn: Callable, *args, reject_when_full: bool = True):
+        """Runs `fn` on the pool and waits for it (from sync, threadpool handlers)."""
+        return self._submit(fn, *args, reject_when_full=reject_when_full).result()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queued": self._pending - self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+
+password_hasher = PasswordHasherPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_QUEUE)
+
+# The entry points for request handlers and mail tokens: bcrypt always runs on the bounded pool.
+# reject_when_full=False for work that must not fail once the request was accepted (mail tokens).
+def hash_password_pooled(password: str, reject_when_full: bool = True) -> str:
+    return password_hasher.run(hash_password, password, reject_when_full=reject_when_full)
+
+def verify_password_pooled(plain_password: str, hashed_password: str) -> bool:
+    return password_hasher.run(verify_password, plain_password, hashed_password)
+
 def is_password_strong_enough(password: str) -> bool:
     if len(password) < 8: return False
     if not any(char.isupper() for char in password): return False
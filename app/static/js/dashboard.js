@@ -3,6 +3,7 @@
 let mainChartInstance = null;
 let statusChartInstance = null;
 let expenseChartInstance = null;
+let activityChartInstance = null;
 let currentChartType = 'line'; 
 let currentPeriod = 'month';
 
@@ -71,25 +72,17 @@ async function loadDashboardData() {
         setLoadingStates(true);
         const range = getDateRangeForPeriod(currentPeriod);
         
-        const [kpi, alertsSum, pending, expSum, vStatus, recent] = await Promise.all([
-            window.fetchWithAuth('/dashboard-data/kpis'),
-            window.fetchWithAuth('/dashboard-data/alerts'),
-            window.fetchWithAuth('/requests/count/pending'),
-            window.fetchWithAuth(`/analytics-data/expense-summary?start_date=${range.start}&end_date=${range.end}`),
-            window.fetchWithAuth('/dashboard-data/charts/vehicle-status'),
-            window.fetchWithAuth('/dashboard-data/recent-alerts')
-        ]);
-
-        const detailedExp = await window.fetchWithAuth(
-            `/analytics-data/expense-summary?start_date=${range.start}&end_date=${range.end}&detailed=true`
-        );
-
-        updateKPIDisplay(kpi, alertsSum, pending, expSum);
-        updateRecentAlerts(recent);
+        // Every widget in one response (KPIs, alerts, charts), aggregated and cached server-side
+        const bundle = await window.fetchWithAuth(`/dashboard-data/bundle?start_date=${range.start}&end_date=${range.end}`);
+        if (!bundle) return;
+
+        updateKPIDisplay(bundle.kpis, bundle.alerts, { count: bundle.pending_requests }, bundle.expenses);
+        updateRecentAlerts(bundle.recent_alerts);
         
-        await loadMonthlyChart(detailedExp);
-        await loadVehicleStatusChart(vStatus);
-        await loadExpenseChart(expSum);
+        await loadMonthlyChart(bundle.expenses);
+        await loadVehicleStatusChart(bundle.vehicle_status);
+        await loadExpenseChart(bundle.expenses);
+        await loadActivityChart(bundle.monthly_activity);
 
     } catch (err) {
         console.error("Dashboard Load Error:", err);
@@ -245,6 +238,32 @@ async function loadExpenseChart(data) {
     });
 }
 
+async function loadActivityChart(data) {
+    const ctx = getDashEl('activityChart')?.getContext('2d');
+    if (!ctx) return;
+    if (activityChartInstance) activityChartInstance.destroy();
+
+    activityChartInstance = new Chart(ctx, {
+        type: 'bar',
+        data: {
+            labels: data?.labels || [],
+            datasets: [
+                { label: 'Trips', data: data?.trips || [], backgroundColor: '#10b981' },
+                { label: 'Maintenances', data: data?.maintenances || [], backgroundColor: '#3b82f6' },
+                { label: 'Pannes', data: data?.pannes || [], backgroundColor: '#ef4444' }
+            ]
+        },
+        options: {
+            responsive: true, maintainAspectRatio: false,
+            plugins: { legend: { labels: { color: '#94a3b8' } } },
+            scales: {
+                y: { beginAtZero: true, ticks: { color: '#94a3b8', precision: 0 }, grid: { color: 'rgba(255,255,255,0.05)' } },
+                x: { ticks: { color: '#94a3b8' }, grid: { display: false } }
+            }
+        }
+    });
+}
+
 // =================================================================
 // 5. UTILS
 // =================================================================
@@ -17,6 +17,8 @@ let fuelActionId = null;
 let fuelCurrentPage = 1;
 const fuelPageLimit = 10;
 let filteredFuelLogs = [];
+// Refuelling eligibility of the units offered by the add form, keyed by vehicle id
+let fuelEligibility = {};
 
 /**
  * Professional Element Getter
@@ -78,25 +80,32 @@ function setupFuelRoleFilters() {
 /**
  * 2. DATA PIPELINE
  */
-async function loadFuelData() {
+// cursor = X-Next-Cursor of the previous page ("Load more"); none reloads from the newest row
+async function loadFuelData(cursor = null) {
     const tbody = getFuelEl('fuelLogsBody');
     if(!tbody) return;
     
-    tbody.innerHTML = `<tr><td colspan="8" class="p-12 text-center text-slate-500">
+    if (!cursor) tbody.innerHTML = `<tr><td colspan="8" class="p-12 text-center text-slate-500">
         <i data-lucide="loader-2" class="w-6 h-6 animate-spin mx-auto mb-2 text-indigo-500"></i>
         Synchronizing fuel archives...
     </td></tr>`;
     if(window.lucide) window.lucide.createIcons();
 
     try {
-        const data = await window.fetchWithAuth('/fuel/'); 
-        const items = Array.isArray(data) ? data : (data.items || []);
+        const { items, nextCursor } = await window.fetchPage(`/fuel/?limit=${window.LIST_PAGE_SIZE}`, cursor);
         
         // LIFO SORTING: Most recent transactions at the top
-        allFuelLogs = items.sort((a, b) => b.id - a.id);
+        allFuelLogs = (cursor ? allFuelLogs.concat(items || []) : (items || [])).sort((a, b) => b.id - a.id);
+
+        // Plates of the vehicles these logs reference; the filter lists only those
+        await window.fetchVehicleLabels(allFuelLogs.map(l => l.vehicle_id), fuelOptions.vehicles);
+        const loggedIds = new Set(allFuelLogs.map(l => l.vehicle_id));
+        populateSelect('fuelVehicleFilter', fuelOptions.vehicles.filter(v => loggedIds.has(v.id)),
+            getFuelEl('fuelVehicleFilter')?.value || '', 'plate_number', 'All Vehicles');
         
-        selectedFuelIds.clear(); 
+        if (!cursor) selectedFuelIds.clear(); 
         renderFuelTable();
+        window.renderMoreRowsBar(tbody, allFuelLogs.length, nextCursor, loadFuelData);
     } catch (error) {
         tbody.innerHTML = `<tr><td colspan="8" class="p-8 text-center text-red-400 font-bold uppercase tracking-widest">Network sync failed</td></tr>`;
     }
@@ -105,18 +114,27 @@ async function loadFuelData() {
 async function fetchFuelDropdowns() {
     try {
         const [vehicles, types] = await Promise.all([
-            window.fetchWithAuth('/vehicles/?limit=1000'),
+            // First page of active units only: the typeahead fetches the others on demand
+            window.fetchWithAuth(`/vehicles/search?limit=${window.VEHICLE_FIRST_PAGE}&status=available&status=active`),
             window.fetchWithAuth('/fuel-types/')
         ]);
         
-        fuelOptions.vehicles = Array.isArray(vehicles) ? vehicles : (vehicles.items || []);
+        window.mergeVehicles(fuelOptions.vehicles, Array.isArray(vehicles) ? vehicles : []);
         fuelOptions.fuelTypes = Array.isArray(types) ? types : (types.items || []);
         
-        populateSelect('fuelVehicleFilter', fuelOptions.vehicles, '', 'plate_number', 'All Vehicles');
-        
         const activeUnits = fuelOptions.vehicles.filter(v => v.status === 'available' || v.status === 'active');
         populateSelect('fuelVehicleSelect', activeUnits, '', 'plate_number', 'Select Active Unit');
         populateSelect('fuelTypeSelect', fuelOptions.fuelTypes, '', 'fuel_type', 'Select Grade');
+
+        window.attachVehicleTypeahead(getFuelEl('fuelVehicleSelect'), {
+            statuses: ['available', 'active'],
+            onResults: hits => {
+                // Kept so the fuel grade can be preselected from the chosen unit
+                window.mergeVehicles(fuelOptions.vehicles, hits);
+                populateSelect('fuelVehicleSelect', hits, getFuelEl('fuelVehicleSelect').value, 'plate_number', 'Select Active Unit');
+                markIneligibleUnits('fuelVehicleSelect');
+            }
+        });
         
     } catch (e) { console.warn("Resource fetch error", e); }
 }
@@ -303,7 +321,7 @@ async function executeFuelConfirmAction() {
 /**
  * 7. FORM & MODAL LOGIC
  */
-window.openAddFuelModal = function() {
+window.openAddFuelModal = async function() {
     getFuelEl('fuelEditId').value = ""; 
     getFuelEl('fuelModalTitle').innerText = "Log Fuel Entry";
     getFuelEl('fuelQuantity').value = "";
@@ -313,6 +331,8 @@ window.openAddFuelModal = function() {
     const activeUnits = fuelOptions.vehicles.filter(v => v.status === 'available' || v.status === 'active');
     populateSelect('fuelVehicleSelect', activeUnits, '', 'plate_number', 'Select Active Unit');
     populateSelect('fuelTypeSelect', fuelOptions.fuelTypes, '', 'fuel_type', 'Select Grade');
+    await loadFuelEligibility(activeUnits);
+    markIneligibleUnits('fuelVehicleSelect');
     
     getFuelEl('addFuelModal').classList.remove('hidden');
     if(window.lucide) window.lucide.createIcons();
@@ -327,6 +347,7 @@ window.openEditFuelModal = function(id) {
 
     getFuelEl('fuelEditId').value = log.id; 
     getFuelEl('fuelModalTitle').innerText = "Update Transaction";
+    fuelEligibility = {};
     populateSelect('fuelVehicleSelect', fuelOptions.vehicles, log.vehicle_id, 'plate_number', 'Select Unit');
     populateSelect('fuelTypeSelect', fuelOptions.fuelTypes, log.fuel_type_id, 'fuel_type', 'Select Grade');
     
@@ -433,6 +454,28 @@ window.openViewFuelModal = function(id) {
     if(window.lucide) window.lucide.createIcons();
 }
 
+// One call for the whole dropdown (GET /fuel/eligibility)
+async function loadFuelEligibility(vehicles) {
+    fuelEligibility = {};
+    if (!vehicles.length) return;
+    const params = new URLSearchParams();
+    vehicles.forEach(v => params.append('vehicle_ids', v.id));
+    const data = await window.fetchWithAuth(`/fuel/eligibility?${params}`);
+    if (Array.isArray(data)) data.forEach(e => { fuelEligibility[e.vehicle_id] = e; });
+}
+
+function markIneligibleUnits(id) {
+    const el = getFuelEl(id); if(!el) return;
+    Array.from(el.options).forEach(opt => {
+        const e = fuelEligibility[opt.value];
+        if (e && !e.eligible) {
+            opt.disabled = true;
+            opt.title = e.message;
+            opt.text = `${opt.text} (${e.message})`;
+        }
+    });
+}
+
 function populateSelect(id, list, sel, key, def) {
     const el = getFuelEl(id); if(!el) return;
     el.innerHTML = `<option value="">-- ${def.toUpperCase()} --</option>` + list.map(i => `<option value="${i.id}" ${i.id == sel ? 'selected' : ''}>${i[key]}</option>`).join('');
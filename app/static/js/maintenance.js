@@ -54,22 +54,29 @@ async function initMaintenance() {
 // =================================================================
 // 2. DATA LOADING
 // =================================================================
-async function loadMaintData() {
+// cursor = X-Next-Cursor of the previous page ("Load more"); none reloads from the newest row
+async function loadMaintData(cursor = null) {
     const tbody = getMaintEl('maintLogsBody');
     if(!tbody) return;
     
-    tbody.innerHTML = `<tr><td colspan="9" class="p-12 text-center text-slate-500"><i data-lucide="loader-2" class="w-6 h-6 animate-spin mx-auto mb-2 text-blue-500"></i>Refreshing maintenance records...</td></tr>`;
+    if (!cursor) tbody.innerHTML = `<tr><td colspan="9" class="p-12 text-center text-slate-500"><i data-lucide="loader-2" class="w-6 h-6 animate-spin mx-auto mb-2 text-blue-500"></i>Refreshing maintenance records...</td></tr>`;
     if(window.lucide) window.lucide.createIcons();
 
     try {
-        const data = await window.fetchWithAuth('/maintenances/?limit=1000');
-        const items = data.items || data;
+        const { data, items, nextCursor } = await window.fetchPage(`/maintenances/?limit=${window.LIST_PAGE_SIZE}`, cursor);
 
         if (Array.isArray(items)) {
             // LIFO SORTING
-            allMaintLogs = items.sort((a, b) => b.id - a.id);
-            selectedMaintIds.clear();
+            allMaintLogs = (cursor ? allMaintLogs.concat(items) : items).sort((a, b) => b.id - a.id);
+
+            // Plates of the vehicles these records reference; the filter lists only those
+            await window.fetchVehicleLabels(allMaintLogs.map(l => l.vehicle_id), maintOptions.vehicles);
+            const servicedIds = new Set(allMaintLogs.map(l => l.vehicle_id));
+            populateSelect('maintVehicleFilter', maintOptions.vehicles.filter(v => servicedIds.has(v.id)),
+                getMaintEl('maintVehicleFilter')?.value || '', 'plate_number', 'All Vehicles');
+            if (!cursor) selectedMaintIds.clear();
             renderMaintTable();
+            window.renderMoreRowsBar(tbody, allMaintLogs.length, nextCursor, loadMaintData);
         } else {
             handleFriendlyMaintError(data, "load");
         }
@@ -81,19 +88,26 @@ async function loadMaintData() {
 async function fetchMaintDropdowns() {
     try {
         const [vehicles, cats, garages] = await Promise.all([
-            window.fetchWithAuth('/vehicles/?limit=1000'),
+            // First page only: the typeahead fetches the other vehicles on demand
+            window.fetchWithAuth(`/vehicles/search?limit=${window.VEHICLE_FIRST_PAGE}`),
             window.fetchWithAuth('/category_maintenance/'), 
             window.fetchWithAuth('/garage/') 
         ]);
 
-        if(vehicles) maintOptions.vehicles = Array.isArray(vehicles) ? vehicles : (vehicles.items || []);
+        if(Array.isArray(vehicles)) window.mergeVehicles(maintOptions.vehicles, vehicles);
         if(cats) maintOptions.cats = Array.isArray(cats) ? cats : (cats.items || []);
         if(garages) maintOptions.garages = Array.isArray(garages) ? garages : (garages.items || []);
         
-        populateSelect('maintVehicleFilter', maintOptions.vehicles, '', 'plate_number', 'All Vehicles');
         populateSelect('maintVehicleSelect', maintOptions.vehicles, '', 'plate_number', 'Select Vehicle');
         populateSelect('maintCatSelect', maintOptions.cats, '', 'cat_maintenance', 'Select Category');
         populateSelect('maintGarageSelect', maintOptions.garages, '', 'nom_garage', 'Select Garage');
+
+        window.attachVehicleTypeahead(getMaintEl('maintVehicleSelect'), {
+            onResults: hits => {
+                window.mergeVehicles(maintOptions.vehicles, hits);
+                populateSelect('maintVehicleSelect', hits, getMaintEl('maintVehicleSelect').value, 'plate_number', 'Select Vehicle');
+            }
+        });
     } catch(e) { console.warn("Dropdown load error", e); }
 }
 
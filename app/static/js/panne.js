@@ -61,25 +61,32 @@ async function initPanne() {
 /**
  * 2. DATA LOADING
  */
-async function loadPanneData() {
+// cursor = X-Next-Cursor of the previous page ("Load more"); none reloads from the newest row
+async function loadPanneData(cursor = null) {
     const tbody = getPanneEl('panneLogsBody');
     if(!tbody) return;
     
-    tbody.innerHTML = `<tr><td colspan="9" class="p-12 text-center text-slate-500">
+    if (!cursor) tbody.innerHTML = `<tr><td colspan="9" class="p-12 text-center text-slate-500">
         <i data-lucide="loader-2" class="w-6 h-6 animate-spin mx-auto mb-2 text-indigo-500"></i>
         Syncing incident records...
     </td></tr>`;
     if(window.lucide) window.lucide.createIcons();
 
     try {
-        const data = await window.fetchWithAuth('/panne/?limit=1000');
-        const items = data.items || data;
+        const { data, items, nextCursor } = await window.fetchPage(`/panne/?limit=${window.LIST_PAGE_SIZE}`, cursor);
         
         if (Array.isArray(items)) {
             // LIFO: Newest first
-            allPannes = items.sort((a, b) => b.id - a.id);
-            selectedPanneIds.clear();
+            allPannes = (cursor ? allPannes.concat(items) : items).sort((a, b) => b.id - a.id);
+
+            // Plates of the vehicles these incidents reference; the filter lists only those
+            await window.fetchVehicleLabels(allPannes.map(p => p.vehicle_id), panneOptions.vehicles);
+            const reportedIds = new Set(allPannes.map(p => p.vehicle_id));
+            populateSelect('panneVehicleFilter', panneOptions.vehicles.filter(v => reportedIds.has(v.id)),
+                getPanneEl('panneVehicleFilter')?.value || '', 'plate_number', 'All Vehicles');
+            if (!cursor) selectedPanneIds.clear();
             renderPanneTable();
+            window.renderMoreRowsBar(tbody, allPannes.length, nextCursor, loadPanneData);
         } else {
             handleFriendlyPanneError(data, "load");
         }
@@ -91,16 +98,23 @@ async function loadPanneData() {
 async function fetchPanneDropdowns() {
     try {
         const [vehicles, cats] = await Promise.all([
-            window.fetchWithAuth('/vehicles/?limit=1000'),
+            // First page only: the typeahead fetches the other vehicles on demand
+            window.fetchWithAuth(`/vehicles/search?limit=${window.VEHICLE_FIRST_PAGE}`),
             window.fetchWithAuth('/category_panne/')
         ]);
 
-        panneOptions.vehicles = Array.isArray(vehicles) ? vehicles : (vehicles.items || []);
+        window.mergeVehicles(panneOptions.vehicles, Array.isArray(vehicles) ? vehicles : []);
         panneOptions.cats = Array.isArray(cats) ? cats : (cats.items || []);
         
-        populateSelect('panneVehicleFilter', panneOptions.vehicles, '', 'plate_number', 'All Vehicles');
         populateSelect('panneVehicleSelect', panneOptions.vehicles, '', 'plate_number', 'Select Vehicle');
         populateSelect('panneCatSelect', panneOptions.cats, '', 'panne_name', 'Select Category');
+
+        window.attachVehicleTypeahead(getPanneEl('panneVehicleSelect'), {
+            onResults: hits => {
+                window.mergeVehicles(panneOptions.vehicles, hits);
+                populateSelect('panneVehicleSelect', hits, getPanneEl('panneVehicleSelect').value, 'plate_number', 'Select Vehicle');
+            }
+        });
     } catch(e) { console.warn("Dropdown sync error", e); }
 }
 
@@ -54,22 +54,24 @@ async function initReparation() {
 /**
  * 2. DATA LOADING
  */
-async function loadRepData() {
+// cursor = X-Next-Cursor of the previous page ("Load more"); none reloads from the newest row
+async function loadRepData(cursor = null) {
     const tbody = getRepEl('repLogsBody');
     if(!tbody) return;
 
-    tbody.innerHTML = `<tr><td colspan="8" class="p-12 text-center">
+    if (!cursor) tbody.innerHTML = `<tr><td colspan="8" class="p-12 text-center">
         <i data-lucide="loader-2" class="w-6 h-6 animate-spin mx-auto mb-2 text-blue-500"></i>
         <div class="text-[10px] font-black uppercase tracking-widest text-slate-500">Syncing mechanical records...</div>
     </td></tr>`;
     if(window.lucide) window.lucide.createIcons();
 
     try {
-        const data = await window.fetchWithAuth('/reparation/?limit=1000');
+        const { items, nextCursor } = await window.fetchPage(`/reparation/?limit=${window.LIST_PAGE_SIZE}`, cursor);
         // LIFO: Newest first
-        allRepLogs = (Array.isArray(data) ? data : (data.items || [])).sort((a,b) => b.id - a.id);
-        selectedRepIds.clear();
+        allRepLogs = (cursor ? allRepLogs.concat(items || []) : (items || [])).sort((a,b) => b.id - a.id);
+        if (!cursor) selectedRepIds.clear();
         renderRepTable();
+        window.renderMoreRowsBar(tbody, allRepLogs.length, nextCursor, loadRepData);
     } catch (e) { 
         console.error("Load failed", e);
         tbody.innerHTML = `<tr><td colspan="8" class="p-8 text-center text-red-500 uppercase font-black">Connection Failure</td></tr>`;
@@ -79,10 +81,11 @@ async function loadRepData() {
 async function fetchRepDropdowns() {
     try {
         const [pannes, garages] = await Promise.all([
-            window.fetchWithAuth('/panne/?limit=1000'),
+            // Only open incidents can be repaired: a short list, read to its last page
+            window.fetchAllPages(`/panne/?status=active&limit=${window.LIST_PAGE_SIZE}`),
             window.fetchWithAuth('/garage/')
         ]);
-        repOptions.pannes = Array.isArray(pannes) ? pannes : (pannes.items || []);
+        repOptions.pannes = pannes;
         repOptions.garages = Array.isArray(garages) ? garages : (garages.items || []);
         
         populateSelect('repGarageSelect', repOptions.garages, '', 'nom_garage', 'Executing Garage');
@@ -55,27 +55,20 @@ async function initRequests() {
 
     // Synchronize initial dataset from API
     await loadRequestsData();
-    
-    // Authorization check for resource pre-loading (Required for Assignment/Edit roles)
-    const elevatedRoles = ['admin', 'superadmin', 'charoi', 'logistic', 'darh', 'chef'];
-    if (elevatedRoles.includes(requestUserRole)) {
-        await Promise.all([
-            fetchAvailableVehicles(),
-            fetchActiveDrivers()
-        ]);
-    }
+    // Vehicle/driver pools are loaded per request window when an assign/approve modal opens
 }
 
 // =================================================================
 // 1. DATA SYNCHRONIZATION ENGINE
 // =================================================================
 
-async function loadRequestsData() {
+// cursor = X-Next-Cursor of the previous page ("Load more"); none reloads from the newest row
+async function loadRequestsData(cursor = null) {
     const tbody = getReqEl('requestsBody');
     if (!tbody) return;
 
     // Loading State UI
-    tbody.innerHTML = `<tr><td colspan="6" class="p-12 text-center">
+    if (!cursor) tbody.innerHTML = `<tr><td colspan="6" class="p-12 text-center">
         <div class="flex flex-col items-center justify-center gap-3">
             <i data-lucide="loader-2" class="w-8 h-8 animate-spin text-blue-500"></i>
             <span class="text-[10px] font-black uppercase tracking-[0.2em] text-slate-500">${window.t('loading')}</span>
@@ -84,29 +77,39 @@ async function loadRequestsData() {
     if (window.lucide) window.lucide.createIcons();
 
     try {
-        const data = await window.fetchWithAuth('/requests/?limit=1000');
-        allRequests = Array.isArray(data) ? data : (data.items || []);
+        const { items, nextCursor } = await window.fetchPage(`/requests/?limit=${window.LIST_PAGE_SIZE}&view=summary`, cursor);
+        allRequests = cursor ? allRequests.concat(items || []) : (items || []);
         renderRequestsTable();
+        window.renderMoreRowsBar(tbody, allRequests.length, nextCursor, loadRequestsData);
     } catch (e) {
         console.error("Critical Sync Failure:", e);
         tbody.innerHTML = `<tr><td colspan="6" class="p-8 text-center text-red-500 font-black uppercase">Server Connection Error</td></tr>`;
     }
 }
 
-async function fetchAvailableVehicles() {
+// Vehicles and drivers free over the request's window (its own booking excluded), in one call
+async function fetchAvailability(r) {
+    availableVehicles = [];
+    activeDrivers = [];
     try {
-        const data = await window.fetchWithAuth('/vehicles/?limit=500');
-        if (Array.isArray(data)) {
-            availableVehicles = data.filter(v => v.status.toLowerCase() === 'available' || v.status.toLowerCase() === 'active');
-        }
-    } catch (err) { console.error("Vehicle pool fetch error", err); }
+        const params = new URLSearchParams({ start: r.departure_time, end: r.return_time, exclude_request_id: r.id });
+        const data = await window.fetchWithAuth(`/requests/availability?${params}`);
+        if (data && Array.isArray(data.vehicles)) availableVehicles = data.vehicles;
+        if (data && Array.isArray(data.drivers)) activeDrivers = data.drivers;
+    } catch (err) { console.error("Availability fetch error", err); }
 }
 
-async function fetchActiveDrivers() {
-    try {
-        const data = await window.fetchWithAuth('/requests/drivers');
-        activeDrivers = Array.isArray(data) ? data : [];
-    } catch (err) { console.error("Driver pool fetch error", err); }
+// Vehicle <select> of the assign/approve modals, narrowed server-side as the user types
+// (hits are kept only if they are free over the window)
+function fillVehicleSelect(id, vehicles, selectedId) {
+    const el = getReqEl(id);
+    if (!el) return;
+    el.innerHTML = `<option value="">-- NO CHANGES --</option>` + vehicles.map(v => `<option value="${v.id}" ${selectedId == v.id ? 'selected':''}>${v.plate_number}</option>`).join('');
+    const freeIds = new Set(availableVehicles.map(v => v.id));
+    window.attachVehicleTypeahead(el, {
+        statuses: ['available', 'active'],
+        onResults: hits => fillVehicleSelect(id, hits.filter(v => freeIds.has(v.id)), el.value)
+    });
 }
 
 /**
@@ -323,15 +326,16 @@ window.saveNewRequest = async () => {
     }
 };
 
-window.openAssignModal = (id) => {
+window.openAssignModal = async (id) => {
     currentRequestId = id;
     const r = allRequests.find(req => req.id === id);
     if (!r) return;
     
     const duration = calculateDuration(r.departure_time, r.return_time);
+    await fetchAvailability(r);
     getReqEl('assignSummary').innerHTML = `<div class="bg-blue-600/10 border border-blue-500/20 p-4 rounded-2xl mb-6 text-[10px] font-bold uppercase text-center"><p class="text-blue-400 font-black tracking-widest">${r.destination}</p><p class="text-slate-500 font-mono mt-1">${duration} Mission</p></div>`;
     
-    getReqEl('assignVehicle').innerHTML = `<option value="">-- NO CHANGES --</option>` + availableVehicles.map(v => `<option value="${v.id}" ${r.vehicle_id == v.id ? 'selected':''}>${v.plate_number}</option>`).join('');
+    fillVehicleSelect('assignVehicle', availableVehicles, r.vehicle_id);
     getReqEl('assignDriver').innerHTML = `<option value="">-- NO CHANGES --</option>` + activeDrivers.map(d => `<option value="${d.id}" ${r.driver_id == d.id ? 'selected':''}>${d.full_name}</option>`).join('');
     
     getReqEl('assignPassengers').value = r.passengers.join(', ');
@@ -351,7 +355,7 @@ window.submitAssignment = async () => {
     }
 };
 
-window.openApprovalModal = (id, stage) => {
+window.openApprovalModal = async (id, stage) => {
     currentRequestId = id;
     const r = allRequests.find(req => req.id === id);
     if (!r) return;
@@ -385,7 +389,8 @@ window.openApprovalModal = (id, stage) => {
 
     if (managerRoles.includes(requestUserRole)) {
         editSection.classList.remove('hidden');
-        getReqEl('approveVehicle').innerHTML = `<option value="">-- NO CHANGES --</option>` + availableVehicles.map(v => `<option value="${v.id}" ${r.vehicle_id == v.id ? 'selected':''}>${v.plate_number}</option>`).join('');
+        await fetchAvailability(r);
+        fillVehicleSelect('approveVehicle', availableVehicles, r.vehicle_id);
         getReqEl('approveDriver').innerHTML = `<option value="">-- NO CHANGES --</option>` + activeDrivers.map(d => `<option value="${d.id}" ${r.driver_id == d.id ? 'selected':''}>${d.full_name}</option>`).join('');
         getReqEl('approvePassengers').value = r.passengers.join(', ');
     } else {
@@ -38,7 +38,8 @@ function updateContentContainers(html) {
 }
 
 // GLOBAL API HELPER (Available to all modules)
-window.fetchWithAuth = async function(endpoint, method = 'GET', body = null) {
+// onResponse, if given, sees the raw Response first (e.g. to read a header)
+window.fetchWithAuth = async function(endpoint, method = 'GET', body = null, onResponse = null) {
     const token = localStorage.getItem('access_token');
     
     // Redirect to root if no token found
@@ -62,6 +63,7 @@ window.fetchWithAuth = async function(endpoint, method = 'GET', body = null) {
         const url = `${API_BASE}${cleanEndpoint}`;
 
         const response = await fetch(url, config);
+        if (onResponse) onResponse(response);
         
         // Handle Token Expiry
         if (response.status === 401) { 
@@ -90,6 +92,109 @@ window.fetchWithAuth = async function(endpoint, method = 'GET', body = null) {
     }
 };
 
+// CURSOR PAGINATION (X-Next-Cursor)
+// List endpoints return one keyset page; while older rows remain, the response
+// carries the cursor of the next page in the X-Next-Cursor header.
+window.LIST_PAGE_SIZE = 200;
+
+window.fetchPage = async function(endpoint, cursor = null) {
+    let nextCursor = null;
+    const url = cursor ? `${endpoint}${endpoint.includes('?') ? '&' : '?'}cursor=${encodeURIComponent(cursor)}` : endpoint;
+    const data = await window.fetchWithAuth(url, 'GET', null, response => { nextCursor = response.headers.get('X-Next-Cursor'); });
+    const items = Array.isArray(data) ? data : (data && Array.isArray(data.items) ? data.items : null);
+    return { data, items, nextCursor };
+};
+
+// Every page of a list that is small by construction (e.g. filtered to active rows)
+window.fetchAllPages = async function(endpoint) {
+    let rows = [], cursor = null;
+    do {
+        const page = await window.fetchPage(endpoint, cursor);
+        if (!Array.isArray(page.items)) break;
+        rows = rows.concat(page.items);
+        cursor = page.nextCursor;
+    } while (cursor);
+    return rows;
+};
+
+// "More rows" bar under a list table: says how many rows are loaded and fetches
+// the next page on click. Hidden on the last page.
+window.renderMoreRowsBar = function(tbody, loaded, nextCursor, onLoadMore) {
+    const table = tbody?.closest('table');
+    if (!table) return;
+    let bar = table.nextElementSibling;
+    if (!bar || !bar.classList.contains('more-rows-bar')) {
+        bar = document.createElement('div');
+        bar.className = 'more-rows-bar flex items-center justify-between gap-3 px-4 py-3 border-t border-slate-800 text-[10px] font-bold uppercase tracking-widest text-slate-500';
+        table.insertAdjacentElement('afterend', bar);
+    }
+    if (!nextCursor) {
+        bar.classList.add('hidden');
+        bar.innerHTML = '';
+        return;
+    }
+    bar.classList.remove('hidden');
+    bar.innerHTML = `<span>${loaded} most recent rows loaded, older rows not shown</span>
+        <button type="button" class="px-3 py-1.5 rounded-lg bg-slate-800 text-white hover:bg-slate-700 transition-all">Load more</button>`;
+    const button = bar.querySelector('button');
+    button.addEventListener('click', async () => {
+        button.disabled = true;
+        button.textContent = 'Loading...';
+        await onLoadMore(nextCursor);
+    });
+};
+
+// VEHICLE TYPEAHEAD (GET /vehicles/search)
+// Puts a search box above a vehicle <select>; typing asks the server for ranked
+// matches (plate, VIN, make, model) and hands them to options.onResults.
+window.attachVehicleTypeahead = function(selectEl, options = {}) {
+    if (!selectEl || selectEl.dataset.typeahead) return;
+    selectEl.dataset.typeahead = '1';
+
+    const input = document.createElement('input');
+    input.type = 'search';
+    input.placeholder = options.placeholder || 'Search plate, VIN, make, model...';
+    input.className = `${selectEl.className} mb-2`;
+    selectEl.parentNode.insertBefore(input, selectEl);
+
+    let timer = null;
+    input.addEventListener('input', () => {
+        clearTimeout(timer);
+        timer = setTimeout(async () => {
+            const params = new URLSearchParams({ q: input.value.trim(), limit: options.limit || 25 });
+            (options.statuses || []).forEach(s => params.append('status', s));
+            const hits = await window.fetchWithAuth(`/vehicles/search?${params}`);
+            if (Array.isArray(hits) && options.onResults) options.onResults(hits);
+        }, 200);
+    });
+};
+
+// Small first page for a vehicle <select>; the typeahead fetches the rest on demand
+window.VEHICLE_FIRST_PAGE = 25;
+
+// Adds the vehicles of `hits` missing from `known`, in place (callers share one array)
+window.mergeVehicles = function(known, hits) {
+    const have = new Set(known.map(v => v.id));
+    (hits || []).forEach(v => { if (!have.has(v.id)) { have.add(v.id); known.push(v); } });
+    return known;
+};
+
+// VEHICLE LABELS (GET /vehicles/search?ids=...)
+// Lists label their rows with a plate: fetch only the vehicles those rows
+// reference, never the whole fleet. Returns `known`, completed in place.
+window.fetchVehicleLabels = async function(ids, known) {
+    const have = new Set(known.map(v => v.id));
+    const missing = [...new Set(ids)].filter(id => id != null && !have.has(id));
+    for (let i = 0; i < missing.length; i += 200) {
+        const chunk = missing.slice(i, i + 200);
+        const params = new URLSearchParams({ limit: chunk.length });
+        chunk.forEach(id => params.append('ids', id));
+        const hits = await window.fetchWithAuth(`/vehicles/search?${params}`);
+        if (Array.isArray(hits)) window.mergeVehicles(known, hits);
+    }
+    return known;
+};
+
 // PAGE LOADER
 async function loadPage(pageName) {
     // Default to dashboard if route doesn't exist
@@ -52,15 +52,12 @@ async function loadUsersData() {
 async function fetchDropdownData() {
     if(dropdownsLoaded) return;
     try {
-        const [roles, agencies, services] = await Promise.all([
-            window.fetchWithAuth('/roles/'),
-            window.fetchWithAuth('/agencies/'),
-            window.fetchWithAuth('/services/')
-        ]);
-
-        if(Array.isArray(roles)) dropdownOptions.roles = roles;
-        if(Array.isArray(agencies)) dropdownOptions.agencies = agencies;
-        if(Array.isArray(services)) dropdownOptions.services = services;
+        const catalog = await window.fetchWithAuth('/catalog/');
+        if (!catalog || catalog.detail) return;
+
+        if(Array.isArray(catalog.roles)) dropdownOptions.roles = catalog.roles;
+        if(Array.isArray(catalog.agencies)) dropdownOptions.agencies = catalog.agencies;
+        if(Array.isArray(catalog.services)) dropdownOptions.services = catalog.services;
         dropdownsLoaded = true;
     } catch (e) {
         console.warn("Dropdown load error:", e);
@@ -52,11 +52,12 @@ async function initVehicles() {
 // =================================================================
 // 2. DATA LOADING
 // =================================================================
-async function loadVehiclesData() {
+// cursor = X-Next-Cursor of the previous page ("Load more"); none reloads from the newest row
+async function loadVehiclesData(cursor = null) {
     const tbody = getVehicleEl('vehiclesBody');
     if(!tbody) return;
     
-    tbody.innerHTML = `<tr><td colspan="7" class="p-12 text-center text-slate-500">
+    if (!cursor) tbody.innerHTML = `<tr><td colspan="7" class="p-12 text-center text-slate-500">
         <i data-lucide="loader-2" class="w-6 h-6 animate-spin mx-auto mb-2 text-blue-500"></i>
         <div class="text-sm mt-2">Loading vehicles...</div>
     </td></tr>`;
@@ -64,16 +65,14 @@ async function loadVehiclesData() {
     if(window.lucide) window.lucide.createIcons();
 
     try {
-        const data = await window.fetchWithAuth('/vehicles/?limit=1000');
-        
-        // Handle pagination or list response
-        const items = data.items || data;
+        const { data, items, nextCursor } = await window.fetchPage(`/vehicles/?limit=${window.LIST_PAGE_SIZE}`, cursor);
         
         if (Array.isArray(items)) {
-            allVehicles = items;
-            selectedVehicleIds.clear();
+            allVehicles = cursor ? allVehicles.concat(items) : items;
+            if (!cursor) selectedVehicleIds.clear();
             updateVehicleBulkUI();
             renderVehiclesTable();
+            window.renderMoreRowsBar(tbody, allVehicles.length, nextCursor, loadVehiclesData);
         } else {
             const msg = data && data.detail ? data.detail : "Failed to load data.";
             showVehicleAlert("Error", msg, false);
@@ -94,19 +93,15 @@ async function loadVehiclesData() {
 
 async function fetchVehicleDropdowns() {
     try {
-        const [makes, models, types, trans, fuels] = await Promise.all([
-            window.fetchWithAuth('/vehicle-makes/?limit=200'),
-            window.fetchWithAuth('/vehicle-models/?limit=1000'),
-            window.fetchWithAuth('/vehicle-types/?limit=200'),
-            window.fetchWithAuth('/vehicle-transmissions/?limit=200'),
-            window.fetchWithAuth('/fuel-types/?limit=200')
-        ]);
-        
-        vehicleOptions.makes = Array.isArray(makes) ? makes : (makes.items || []);
-        vehicleOptions.models = Array.isArray(models) ? models : (models.items || []);
-        vehicleOptions.types = Array.isArray(types) ? types : (types.items || []);
-        vehicleOptions.trans = Array.isArray(trans) ? trans : (trans.items || []);
-        vehicleOptions.fuels = Array.isArray(fuels) ? fuels : (fuels.items || []);
+        // One cached document for every reference table (revalidated via ETag)
+        const catalog = await window.fetchWithAuth('/catalog/');
+        if (!catalog || catalog.detail) throw new Error(catalog ? catalog.detail : 'No catalog');
+
+        vehicleOptions.makes = catalog.vehicle_makes || [];
+        vehicleOptions.models = catalog.vehicle_models || [];
+        vehicleOptions.types = catalog.vehicle_types || [];
+        vehicleOptions.trans = catalog.vehicle_transmissions || [];
+        vehicleOptions.fuels = catalog.fuel_types || [];
         
     } catch (e) {
         console.warn("Dropdown Error", e);
@@ -0,0 +1,99 @@
+# app/utils/availability.py
+
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.utils import vehicle_search
+
+Request = models.VehicleRequest
+
+# Requests that hold their vehicle and driver for the trip window (denied and completed ones release them)
+BOOKING_STATUSES = (
+    "pending", "approved_by_chef", "approved_by_charoi", "approved_by_logistic",
+    "fully_approved", "in_progress",
+)
+
+# Vehicle statuses that can be assigned at all (panne, maintenance, ... cannot)
+ASSIGNABLE_VEHICLE_STATUSES = ("available", "active")
+
+
+# =================================================================
+# OVERLAP
+# On Postgres the trip window is a half-open tsrange, matched with && against the
+# GiST index on the same expression (alembic: request booking period index).
+# greatest() turns a return before the departure into an empty range instead of an
+# error. Elsewhere (SQLite tests) the equivalent comparison runs as a scan.
+# =================================================================
+def _naive(value: datetime) -> datetime:
+    # start_time/end_time are naive columns, stored as the client sent them
+    return value.replace(tzinfo=None) if value.tzinfo else value
+
+
+def overlaps(db: Session, start: datetime, end: datetime):
+    """WHERE clause: the request's trip window intersects [start, end)."""
+    start, end = _naive(start), _naive(end)
+    if db.get_bind().dialect.name == "postgresql":
+        period = func.tsrange(Request.departure_time, func.greatest(Request.departure_time, Request.return_time), "[)")
+        return period.op("&&")(func.tsrange(start, end, "[)"))
+    return and_(Request.departure_time < end, Request.return_time > start, Request.return_time > Request.departure_time)
+
+
+def _bookings(db: Session, start: datetime, end: datetime, exclude_request_id: Optional[int] = None) -> list:
+    """WHERE clauses: live requests whose window intersects [start, end), other than `exclude_request_id`."""
+    clauses = [Request.status.in_(BOOKING_STATUSES), overlaps(db, start, end)]
+    if exclude_request_id is not None:
+        clauses.append(Request.id != exclude_request_id)
+    return clauses
+
+
+def _booked(db: Session, column, start: datetime, end: datetime, exclude_request_id: Optional[int] = None):
+    """Subquery: ids in `column` (vehicle_id or driver_id) held over the window."""
+    return select(column).where(column.isnot(None), *_bookings(db, start, end, exclude_request_id))
+
+
+# =================================================================
+# FREE RESOURCES
+# One anti-join per resource, whatever the fleet or request volume.
+# =================================================================
+def free_vehicles(db: Session, start: datetime, end: datetime, exclude_request_id: Optional[int] = None) -> List[dict]:
+    """Assignable vehicles with no overlapping booking (VehicleSearchHit dicts, by plate)."""
+    stmt = select(*vehicle_search.HIT_COLUMNS).where(
+        models.Vehicle.status.in_(ASSIGNABLE_VEHICLE_STATUSES),
+        models.Vehicle.id.notin_(_booked(db, Request.vehicle_id, start, end, exclude_request_id)),
+    ).order_by(models.Vehicle.plate_number)
+    return vehicle_search.hits(db, db.execute(stmt).all())
+
+
+def free_drivers(db: Session, start: datetime, end: datetime, exclude_request_id: Optional[int] = None) -> List[dict]:
+    """Active drivers with no overlapping booking (UserSimpleOut dicts, by name)."""
+    stmt = select(models.User.id, models.User.full_name, models.User.matricule)\
+        .join(models.Role, models.User.role_id == models.Role.id)\
+        .where(
+            models.Role.name.ilike("driver"),
+            models.User.is_active == True,
+            models.User.id.notin_(_booked(db, Request.driver_id, start, end, exclude_request_id)),
+        ).order_by(models.User.full_name)
+    return [dict(row) for row in db.execute(stmt).mappings()]
+
+
+# =================================================================
+# ASSIGNMENT CHECK
+# =================================================================
+def conflicts(db: Session, req, vehicle_id: Optional[int], driver_id: Optional[int]) -> List[str]:
+    """Why `vehicle_id`/`driver_id` cannot take `req`'s trip window (empty list: they can)."""
+    problems = []
+    for label, column, resource_id in (("Vehicle", Request.vehicle_id, vehicle_id), ("Driver", Request.driver_id, driver_id)):
+        if resource_id is None:
+            continue
+        clash = db.execute(
+            select(Request.id)
+            .where(column == resource_id, *_bookings(db, req.departure_time, req.return_time, req.id))
+            .order_by(Request.id).limit(1)
+        ).scalar()
+        if clash is not None:
+            problems.append(f"{label} {resource_id} is already booked by request {clash} over this period.")
+    return problems
@@ -0,0 +1,58 @@
+# app/utils/bulk_upload.py
+
+import csv
+import io
+import json
+from typing import List
+
+from fastapi import HTTPException, Request
+from pydantic import ValidationError
+
+
+def parse_csv(content: bytes) -> List[dict]:
+    try:
+        text = content.decode("utf-8-sig")  # Excel adds a BOM
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="CSV must be UTF-8 encoded.")
+    reader = csv.DictReader(io.StringIO(text))
+    # Blank cells mean "not provided", not an empty string to validate
+    return [
+        {key.strip(): value.strip() for key, value in row.items() if key and value and value.strip()}
+        for row in reader
+    ]
+
+
+def parse_json(content: bytes) -> List[dict]:
+    try:
+        data = json.loads(content)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body is not valid JSON.")
+    if not isinstance(data, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array.")
+    return data
+
+
+async def read_rows(request: Request, max_rows: int) -> List[dict]:
+    """Multipart upload (field 'file', .csv or .json), application/json array, or text/csv body."""
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(status_code=400, detail="Upload the rows in a 'file' field.")
+        content = await upload.read()
+        is_json = (upload.filename or "").lower().endswith(".json")
+    else:
+        content = await request.body()
+        is_json = "json" in content_type
+
+    rows = parse_json(content) if is_json else parse_csv(content)
+    if not rows:
+        raise HTTPException(status_code=400, detail="No rows found.")
+    if len(rows) > max_rows:
+        raise HTTPException(status_code=413, detail=f"At most {max_rows} rows per upload.")
+    return rows
+
+
+def validation_messages(error: ValidationError) -> List[str]:
+    return [f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in error.errors()]
@@ -0,0 +1,46 @@
+# app/utils/bulk_verify.py
+
+from datetime import datetime
+from typing import Dict, Iterable, List
+
+from sqlalchemy import Integer, any_, bindparam, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+
+
+def _id_in(db: Session, column, ids: List[int]):
+    # Postgres: one array parameter (id = ANY(:ids)) instead of thousands of IN placeholders
+    if db.get_bind().dialect.name == "postgresql":
+        return column == any_(bindparam("verify_ids", ids, type_=ARRAY(Integer)))
+    return column.in_(ids)
+
+
+def verify(db: Session, model, ids: Iterable[int]) -> Dict[str, List[int]]:
+    """
+    Marks `ids` of `model` verified with a single UPDATE ... RETURNING, inside the
+    caller's transaction. Returns the ids split into verified / already_verified / missing.
+    The model needs `id`, `is_verified` and `verified_at` columns.
+    """
+    ids = sorted(set(ids))
+    if not ids:
+        return {"verified": [], "already_verified": [], "missing": []}
+
+    verified = db.execute(
+        update(model)
+        .where(_id_in(db, model.id, ids), model.is_verified == False)
+        .values(is_verified=True, verified_at=datetime.utcnow())
+        .returning(model.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+
+    # Only the leftovers need a second look: they either exist (already verified) or not
+    remaining = sorted(set(ids) - set(verified))
+    already = []
+    if remaining:
+        already = db.execute(select(model.id).where(_id_in(db, model.id, remaining))).scalars().all()
+
+    return {
+        "verified": sorted(verified),
+        "already_verified": sorted(already),
+        "missing": sorted(set(remaining) - set(already)),
+    }
@@ -0,0 +1,142 @@
+# app/utils/dashboard_bundle.py
+
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import desc, extract, func, literal, select, union_all
+from sqlalchemy.orm import Session, joinedload
+
+from app import models
+from app.config import settings
+from app.utils import expense_summary
+from app.utils.cache import TTLCache
+from app.utils.kpi_engine import compute_fleet_kpis
+
+RECENT_ALERTS = 5
+
+# One entry per (start_date, end_date): every dashboard viewer of the same period
+# shares it for a few seconds, so a burst of page loads runs the queries once.
+# Writes do not invalidate it: the figures lag by at most DASHBOARD_CACHE_TTL_SECONDS.
+_cache = TTLCache(maxsize=32, ttl=settings.DASHBOARD_CACHE_TTL_SECONDS)
+
+
+# =================================================================
+# SHAPES (shared with the single-widget endpoints of routers/dashboard.py)
+# =================================================================
+def kpi_stats(kpis: dict) -> dict:
+    """KPIStats from a kpi_engine snapshot."""
+    return {
+        "total_vehicles": kpis["total_vehicles"],
+        "planned_trips": kpis["planned_trips"],
+        "repairs_this_month": kpis["repairs_this_month"],
+        "fuel_cost_this_week": kpis["fuel_cost_this_week"],
+        "total_purchase_cost": kpis["total_purchase_cost"],
+        # Active Alerts: ONLY count Pannes with status 'active'
+        "active_alerts_count": kpis["active_pannes"],
+    }
+
+
+def status_chart(kpis: dict) -> dict:
+    """VehicleStatusChartData; counts come from the Vehicle.status column."""
+    return {
+        "labels": ["Available", "Maintenance", "Panne", "Reparation"],
+        "counts": [
+            kpis["available_vehicles"],
+            kpis["maintenance_vehicles"],
+            kpis["panne_vehicles"],
+            kpis["reparation_vehicles"],
+        ],
+    }
+
+
+def panne_alert(panne, message: Optional[str] = None) -> dict:
+    """AlertItem for a panne (its vehicle eager loaded)."""
+    return {
+        "plate_number": panne.vehicle.plate_number if panne.vehicle else "N/A",
+        "message": message if message is not None else (panne.description or "No description"),
+        "entity_type": "panne",
+        "status": panne.status,
+    }
+
+
+def alerts_summary(kpis: dict, last_panne) -> dict:
+    """AlertsResponse: the active panne count and the most recent panne as preview."""
+    return {
+        "critical_panne": panne_alert(last_panne, f"Breakdown: {(last_panne.description or '')[:30]}") if last_panne else None,
+        "maintenance_alert": None,
+        "trip_alert": None,
+        "total_alerts": kpis["active_pannes"],
+    }
+
+
+def recent_pannes_statement(limit: int):
+    return select(models.Panne).options(joinedload(models.Panne.vehicle))\
+        .order_by(desc(models.Panne.panne_date)).limit(limit)
+
+
+# =================================================================
+# MONTHLY ACTIVITY
+# =================================================================
+def _months(start_dt: datetime, end_dt: datetime) -> List[Tuple[int, int]]:
+    months, (y, m) = [], (start_dt.year, start_dt.month)
+    while (y, m) <= (end_dt.year, end_dt.month):
+        months.append((y, m))
+        y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+    return months
+
+
+def monthly_activity(db: Session, start_dt: datetime, end_dt: datetime) -> dict:
+    """
+    MonthlyActivityChartData: trips (requests by departure, denied ones excluded),
+    maintenances and pannes per month, from one grouped UNION ALL. Every month of
+    the period gets a label, empty months count 0.
+    """
+    sources = (
+        ("trips", models.VehicleRequest.departure_time, [models.VehicleRequest.status != "denied"]),
+        ("maintenances", models.Maintenance.maintenance_date, []),
+        ("pannes", models.Panne.panne_date, []),
+    )
+    events = union_all(*(
+        select(literal(kind).label("kind"), extract("year", col).label("y"), extract("month", col).label("m"))
+        .where(col >= start_dt, col <= end_dt, *extra)
+        for kind, col, extra in sources
+    )).subquery()
+    counts = {
+        (kind, int(y), int(m)): n
+        for kind, y, m, n in db.execute(
+            select(events.c.kind, events.c.y, events.c.m, func.count()).group_by(events.c.kind, events.c.y, events.c.m)
+        ).all()
+    }
+
+    months = _months(start_dt, end_dt)
+    chart = {"labels": [expense_summary.month_label(y, m) for y, m in months]}
+    for kind, _, _ in sources:
+        chart[kind] = [counts.get((kind, y, m), 0) for y, m in months]
+    return chart
+
+
+# =================================================================
+# BUNDLE
+# =================================================================
+def build(db: Session, start_dt: datetime, end_dt: datetime) -> dict:
+    """Every user-independent widget of the dashboard: a handful of grouped queries."""
+    kpis = compute_fleet_kpis(db)
+    pannes = db.execute(recent_pannes_statement(RECENT_ALERTS)).scalars().all()
+    return {
+        "kpis": kpi_stats(kpis),
+        "alerts": alerts_summary(kpis, pannes[0] if pannes else None),
+        "vehicle_status": status_chart(kpis),
+        "monthly_activity": monthly_activity(db, start_dt, end_dt),
+        "expenses": expense_summary.build(db, start_dt, end_dt),
+        "recent_alerts": [panne_alert(p) for p in pannes],
+    }
+
+
+def cached(db: Session, start_date: date, end_date: date) -> dict:
+    """build() for whole days [start_date, end_date], served from the short-lived cache."""
+    key = (start_date, end_date)
+    bundle = _cache.get(key)
+    if bundle is None:
+        bundle = build(db, datetime.combine(start_date, datetime.min.time()), datetime.combine(end_date, datetime.max.time()))
+        _cache.set(key, bundle)
+    return bundle
@@ -0,0 +1,183 @@
+# app/utils/expense_export.py
+
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Iterator, List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import models
+
+EXPORT_CATEGORIES = ["fuel", "reparation", "maintenance", "purchases"]
+
+# Rows fetched per round-trip from the server-side cursor
+STREAM_BATCH_SIZE = 1000
+# Approximate size of each chunk handed to the HTTP layer
+CHUNK_SIZE = 64 * 1024
+
+CSV_COLUMNS = ["category", "id", "vehicle_plate", "date", "description", "quantity", "amount", "provider"]
+
+
+# =================================================================
+# ROW PROJECTIONS (Columns only, no ORM objects)
+# =================================================================
+def _fuel_stmt(start_dt: datetime, end_dt: datetime):
+    return select(
+        models.Fuel.id, models.Vehicle.plate_number, models.Fuel.created_at,
+        models.Fuel.quantity, models.Fuel.cost
+    ).outerjoin(models.Vehicle, models.Fuel.vehicle_id == models.Vehicle.id)\
+     .where(models.Fuel.created_at.between(start_dt, end_dt))\
+     .order_by(models.Fuel.id)
+
+
+def _reparation_stmt(start_dt: datetime, end_dt: datetime):
+    return select(
+        models.Reparation.id, models.Vehicle.plate_number, models.Reparation.repair_date,
+        models.Panne.description, models.Reparation.cost, models.Garage.nom_garage
+    ).outerjoin(models.Panne, models.Reparation.panne_id == models.Panne.id)\
+     .outerjoin(models.Vehicle, models.Panne.vehicle_id == models.Vehicle.id)\
+     .outerjoin(models.Garage, models.Reparation.garage_id == models.Garage.id)\
+     .where(models.Reparation.repair_date.between(start_dt, end_dt))\
+     .order_by(models.Reparation.id)
+
+
+def _maintenance_stmt(start_dt: datetime, end_dt: datetime):
+    return select(
+        models.Maintenance.id, models.Vehicle.plate_number, models.Maintenance.maintenance_date,
+        models.CategoryMaintenance.cat_maintenance, models.Maintenance.maintenance_cost, models.Garage.nom_garage
+    ).outerjoin(models.Vehicle, models.Maintenance.vehicle_id == models.Vehicle.id)\
+     .outerjoin(models.CategoryMaintenance, models.Maintenance.cat_maintenance_id == models.CategoryMaintenance.id)\
+     .outerjoin(models.Garage, models.Maintenance.garage_id == models.Garage.id)\
+     .where(models.Maintenance.maintenance_date.between(start_dt, end_dt))\
+     .order_by(models.Maintenance.id)
+
+
+def _purchase_stmt(start_dt: datetime, end_dt: datetime):
+    return select(
+        models.Vehicle.id, models.Vehicle.plate_number, models.VehicleMake.vehicle_make,
+        models.VehicleModel.vehicle_model, models.Vehicle.purchase_date, models.Vehicle.purchase_price
+    ).outerjoin(models.VehicleMake, models.Vehicle.make == models.VehicleMake.id)\
+     .outerjoin(models.VehicleModel, models.Vehicle.model == models.VehicleModel.id)\
+     .where(models.Vehicle.purchase_date.between(start_dt, end_dt))\
+     .order_by(models.Vehicle.id)
+
+
+def _fuel_record(row) -> dict:
+    id_, plate, created_at, quantity, cost = row
+    return {"id": id_, "vehicle_plate": plate or "N/A", "date": created_at, "quantity": quantity, "cost": cost, "notes": ""}
+
+
+def _reparation_record(row) -> dict:
+    id_, plate, repair_date, description, cost, garage = row
+    return {"id": id_, "vehicle_plate": plate or "N/A", "repair_date": repair_date, "description": description or "Repair", "cost": cost, "provider": garage or "N/A"}
+
+
+def _maintenance_record(row) -> dict:
+    id_, plate, maintenance_date, category, cost, garage = row
+    return {"id": id_, "vehicle_plate": plate or "N/A", "maintenance_date": maintenance_date, "description": category or "Maint.", "maintenance_cost": cost, "provider": garage or "N/A"}
+
+
+def _purchase_record(row) -> dict:
+    id_, plate, make, model, purchase_date, price = row
+    return {"id": id_, "plate_number": plate, "make": make or "N/A", "model": model or "N/A", "purchase_date": purchase_date, "purchase_price": price}
+
+
+_PROJECTIONS = {
+    "fuel": (_fuel_stmt, _fuel_record),
+    "reparation": (_reparation_stmt, _reparation_record),
+    "maintenance": (_maintenance_stmt, _maintenance_record),
+    "purchases": (_purchase_stmt, _purchase_record),
+}
+
+
+def iter_expense_records(db: Session, start_dt: datetime, end_dt: datetime, categories: List[str]) -> Iterator[Tuple[str, dict]]:
+    """
+    Yields (category, record) pairs using a server-side cursor,
+    so only STREAM_BATCH_SIZE rows are held in memory at a time.
+    """
+    for category in EXPORT_CATEGORIES:
+        if category not in categories:
+            continue
+        build_stmt, to_record = _PROJECTIONS[category]
+        result = db.execute(build_stmt(start_dt, end_dt).execution_options(yield_per=STREAM_BATCH_SIZE))
+        for row in result:
+            yield category, to_record(row)
+
+
+# Record fields the JSON report renders as a plain date (columns are timestamps)
+DATE_FIELDS = {"reparation": "repair_date", "maintenance": "maintenance_date", "purchases": "purchase_date"}
+
+
+def report_records(db: Session, start_dt: datetime, end_dt: datetime, categories: List[str]) -> dict:
+    """Body of the JSON detailed report (DetailedReportDataResponse), ready for orjson."""
+    records = {category: [] for category in EXPORT_CATEGORIES}
+    for category, record in iter_expense_records(db, start_dt, end_dt, categories):
+        field = DATE_FIELDS.get(category)
+        if field and isinstance(record[field], datetime):
+            record[field] = record[field].date()
+        records[category].append(record)
+    return {
+        "fuel_records": records["fuel"],
+        "reparation_records": records["reparation"],
+        "maintenance_records": records["maintenance"],
+        "purchase_records": records["purchases"],
+    }
+
+
+# =================================================================
+# STREAM ENCODERS
+# =================================================================
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _csv_row(category: str, record: dict) -> list:
+    record = {k: _json_default(v) if isinstance(v, (datetime, date)) else v for k, v in record.items()}
+    if category == "fuel":
+        return [category, record["id"], record["vehicle_plate"], record["date"], record["notes"], record["quantity"], record["cost"], ""]
+    if category == "reparation":
+        return [category, record["id"], record["vehicle_plate"], record["repair_date"], record["description"], "", record["cost"], record["provider"]]
+    if category == "maintenance":
+        return [category, record["id"], record["vehicle_plate"], record["maintenance_date"], record["description"], "", record["maintenance_cost"], record["provider"]]
+    description = f"{record['make']} {record['model']}".strip()
+    return [category, record["id"], record["plate_number"], record["purchase_date"], description, "", record["purchase_price"], ""]
+
+
+def stream_ndjson(db: Session, start_dt: datetime, end_dt: datetime, categories: List[str]) -> Iterator[str]:
+    """One JSON object per line, tagged with its category. Closes the session when done."""
+    try:
+        buffer = []
+        size = 0
+        for category, record in iter_expense_records(db, start_dt, end_dt, categories):
+            line = json.dumps({"category": category, **record}, default=_json_default) + "\n"
+            buffer.append(line)
+            size += len(line)
+            if size >= CHUNK_SIZE:
+                yield "".join(buffer)
+                buffer, size = [], 0
+        if buffer:
+            yield "".join(buffer)
+    finally:
+        db.close()
+
+
+def stream_csv(db: Session, start_dt: datetime, end_dt: datetime, categories: List[str]) -> Iterator[str]:
+    """Single CSV with a shared column set across categories. Closes the session when done."""
+    try:
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(CSV_COLUMNS)
+        for category, record in iter_expense_records(db, start_dt, end_dt, categories):
+            writer.writerow(_csv_row(category, record))
+            if out.tell() >= CHUNK_SIZE:
+                yield out.getvalue()
+                out.seek(0)
+                out.truncate(0)
+        yield out.getvalue()
+    finally:
+        db.close()
@@ -0,0 +1,224 @@
+# app/utils/expense_rollup.py
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Set, Tuple
+
+from sqlalchemy import select, delete, insert, func, case, extract, exists, literal
+from sqlalchemy.orm import Session
+
+from app import models
+from app.utils.upsert import upsert
+
+Rollup = models.MonthlyExpenseRollup
+
+# Bucket key: (vehicle_id, year, month). vehicle_id 0 = record without a vehicle.
+Bucket = Tuple[int, int, int]
+
+CATEGORIES = ("fuel", "maintenance", "reparation")
+
+
+def _source(category: str):
+    """(model, date column, amount column, quantity column) for a rollup category."""
+    if category == "fuel":
+        return models.Fuel, models.Fuel.created_at, models.Fuel.cost, models.Fuel.quantity
+    if category == "maintenance":
+        return models.Maintenance, models.Maintenance.maintenance_date, models.Maintenance.maintenance_cost, None
+    if category == "reparation":
+        return models.Reparation, models.Reparation.repair_date, models.Reparation.cost, None
+    raise ValueError(f"Unknown expense category: {category}")
+
+
+def _month_bounds(year: int, month: int) -> Tuple[datetime, datetime]:
+    start = datetime(year, month, 1)
+    end = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+    return start, end
+
+
+def _aggregate_columns(category: str):
+    model, date_col, amount_col, qty_col = _source(category)
+    vehicle_key = func.coalesce(model.vehicle_id, 0)
+    return model, date_col, vehicle_key, [
+        func.coalesce(func.sum(amount_col), 0.0),
+        func.coalesce(func.sum(case((model.is_verified == True, amount_col), else_=0.0)), 0.0),
+        func.coalesce(func.sum(qty_col), 0.0) if qty_col is not None else literal(0.0),
+        func.count(model.id),
+    ]
+
+
+# =================================================================
+# INCREMENTAL MAINTENANCE
+# =================================================================
+def bucket_of(category: str, record) -> Bucket:
+    """Returns the rollup bucket a fuel/maintenance/reparation record belongs to."""
+    _, date_col, _, _ = _source(category)
+    when = getattr(record, date_col.key) or datetime.utcnow()
+    return (record.vehicle_id or 0, when.year, when.month)
+
+
+def refresh_buckets(db: Session, category: str, buckets: Iterable[Bucket]):
+    """
+    Recomputes the given buckets from the source table inside the caller's transaction.
+    One aggregate query per touched month, whatever the number of vehicles.
+    """
+    by_month: Dict[Tuple[int, int], Set[int]] = defaultdict(set)
+    for vehicle_id, year, month in buckets:
+        by_month[(year, month)].add(vehicle_id)
+    if not by_month:
+        return
+
+    db.flush()
+    model, date_col, vehicle_key, aggregates = _aggregate_columns(category)
+
+    for (year, month), vehicle_ids in by_month.items():
+        start, end = _month_bounds(year, month)
+        rows = db.execute(
+            select(vehicle_key, *aggregates)
+            .where(date_col >= start, date_col < end, vehicle_key.in_(vehicle_ids))
+            .group_by(vehicle_key)
+        ).all()
+
+        found = set()
+        payload = []
+        for vehicle_id, amount, verified_amount, quantity, count in rows:
+            found.add(vehicle_id)
+            payload.append({
+                "year": year, "month": month, "category": category, "vehicle_id": vehicle_id,
+                "amount": float(amount or 0.0), "verified_amount": float(verified_amount or 0.0),
+                "quantity": float(quantity or 0.0), "record_count": int(count or 0),
+            })
+        if payload:
+            upsert(db, Rollup, payload, key=["year", "month", "category", "vehicle_id"],
+                   update_cols=["amount", "verified_amount", "quantity", "record_count"], set_={"updated_at": func.now()})
+
+        emptied = vehicle_ids - found
+        if emptied:
+            db.execute(delete(Rollup).where(
+                Rollup.year == year, Rollup.month == month,
+                Rollup.category == category, Rollup.vehicle_id.in_(emptied)
+            ))
+
+
+def _buckets_for_ids(db: Session, category: str, ids: List[int]) -> Set[Bucket]:
+    model, date_col, vehicle_key, _ = _aggregate_columns(category)
+    rows = db.execute(
+        select(vehicle_key, extract("year", date_col), extract("month", date_col))
+        .where(model.id.in_(ids))
+        .distinct()
+    ).all()
+    return {(int(v), int(y), int(m)) for v, y, m in rows}
+
+
+def refresh_for_ids(db: Session, category: str, ids: Iterable[int], extra_buckets: Iterable[Bucket] = ()):
+    """
+    Refreshes every bucket touched by the given source ids (e.g. after a create or bulk verify).
+    extra_buckets carries buckets a record left behind (old month/vehicle on update, or a delete).
+    """
+    db.flush()
+    ids = list(ids)
+    buckets = set(extra_buckets)
+    if ids:
+        buckets |= _buckets_for_ids(db, category, ids)
+    refresh_buckets(db, category, buckets)
+
+
+def refresh_for_records(db: Session, category: str, records: Iterable, extra_buckets: Iterable[Bucket] = ()):
+    db.flush()
+    refresh_for_ids(db, category, [r.id for r in records], extra_buckets)
+
+
+def forget_vehicle(db: Session, vehicle_id: int):
+    db.execute(delete(Rollup).where(Rollup.vehicle_id == vehicle_id))
+
+
+# =================================================================
+# FULL REBUILD (Backfill)
+# =================================================================
+def rebuild(db: Session):
+    """Recomputes the whole table with one INSERT ... SELECT per category."""
+    db.execute(delete(Rollup))
+    for category in CATEGORIES:
+        model, date_col, vehicle_key, aggregates = _aggregate_columns(category)
+        year_col = extract("year", date_col)
+        month_col = extract("month", date_col)
+        source = select(
+            year_col, month_col, literal(category), vehicle_key, *aggregates
+        ).where(date_col.isnot(None)).group_by(year_col, month_col, vehicle_key)
+        db.execute(insert(Rollup).from_select(
+            ["year", "month", "category", "vehicle_id", "amount", "verified_amount", "quantity", "record_count"],
+            source
+        ))
+
+
+def ensure_backfilled(db: Session):
+    """Builds the rollup once for databases that already hold expense rows."""
+    if db.execute(select(exists().where(Rollup.id.isnot(None)))).scalar():
+        return
+    has_source = any(
+        db.execute(select(exists().where(_source(c)[0].id.isnot(None)))).scalar()
+        for c in CATEGORIES
+    )
+    if has_source:
+        rebuild(db)
+        db.commit()
+
+
+# =================================================================
+# READ SIDE
+# =================================================================
+def _empty_totals():
+    return defaultdict(lambda: {c: 0.0 for c in CATEGORIES})
+
+
+def _base_monthly_totals(db: Session, start_dt: datetime, end_dt: datetime, inclusive_end: bool):
+    totals = _empty_totals()
+    for category in CATEGORIES:
+        _, date_col, amount_col, _ = _source(category)
+        y, m = extract("year", date_col), extract("month", date_col)
+        upper = date_col <= end_dt if inclusive_end else date_col < end_dt
+        for year, month, value in db.execute(
+            select(y, m, func.sum(amount_col))
+            .where(date_col >= start_dt, upper)
+            .group_by(y, m)
+        ).all():
+            totals[(int(year), int(month))][category] += float(value or 0.0)
+    return totals
+
+
+def monthly_expense_totals(db: Session, start_dt: datetime, end_dt: datetime) -> Dict[Tuple[int, int], Dict[str, float]]:
+    """
+    Spend per (year, month) and category for [start_dt, end_dt].
+    Whole months are read from the rollup (O(months) rows); partial months at the
+    edges of the range fall back to the source tables, bounded to those few days.
+    """
+    first_full = _month_bounds(start_dt.year, start_dt.month)[0]
+    if start_dt > first_full:
+        first_full = _month_bounds(start_dt.year, start_dt.month)[1]
+
+    end_month_start, end_month_next = _month_bounds(end_dt.year, end_dt.month)
+    after_full = end_month_next if end_dt >= end_month_next - timedelta(microseconds=1) else end_month_start
+
+    if first_full >= after_full:
+        return dict(_base_monthly_totals(db, start_dt, end_dt, inclusive_end=True))
+
+    totals = _empty_totals()
+    if start_dt < first_full:
+        totals = _base_monthly_totals(db, start_dt, first_full, inclusive_end=False)
+    if after_full <= end_dt:
+        for key, values in _base_monthly_totals(db, after_full, end_dt, inclusive_end=True).items():
+            for category, value in values.items():
+                totals[key][category] += value
+
+    period = Rollup.year * 100 + Rollup.month
+    last_full = after_full - timedelta(days=1)
+    for year, month, category, value in db.execute(
+        select(Rollup.year, Rollup.month, Rollup.category, func.sum(Rollup.amount))
+        .where(
+            period >= first_full.year * 100 + first_full.month,
+            period <= last_full.year * 100 + last_full.month
+        )
+        .group_by(Rollup.year, Rollup.month, Rollup.category)
+    ).all():
+        totals[(int(year), int(month))][category] += float(value or 0.0)
+
+    return dict(totals)
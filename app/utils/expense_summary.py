@@ -0,0 +1,56 @@
+# app/utils/expense_summary.py
+
+from calendar import month_abbr
+from datetime import datetime
+
+from sqlalchemy import extract, func
+from sqlalchemy.orm import Session
+
+from app import models
+from app.utils import expense_rollup
+
+
+def month_label(year: int, month: int) -> str:
+    """Chart label, e.g. "Mar '26"."""
+    return f"{month_abbr[month]} '{str(year)[-2:]}"
+
+
+def build(db: Session, start_dt: datetime, end_dt: datetime) -> dict:
+    """AnalyticsExpenseSummaryResponse for [start_dt, end_dt]: totals and the monthly breakdown."""
+    # --- 1. Monthly Trends (Fuel / Reparation / Maintenance from the rollup) ---
+    monthly_data = {}
+    for (y, m), values in expense_rollup.monthly_expense_totals(db, start_dt, end_dt).items():
+        monthly_data[f"{y}-{m:02d}"] = {"f": values["fuel"], "r": values["reparation"], "m": values["maintenance"], "p": 0}
+
+    # --- 2. Purchase Trend (Vehicle table is small, grouped directly) ---
+    purch_q = db.query(extract('year', models.Vehicle.purchase_date).label('y'), extract('month', models.Vehicle.purchase_date).label('m'), func.sum(models.Vehicle.purchase_price)).filter(models.Vehicle.purchase_date.between(start_dt, end_dt)).group_by('y', 'm').all()
+    for y, m, val in purch_q:
+        key = f"{int(y)}-{int(m):02d}"
+        if key not in monthly_data: monthly_data[key] = {"f":0,"r":0,"m":0,"p":0}
+        monthly_data[key]["p"] = val or 0
+
+    # --- 3. Totals for KPI and Distribution Chart ---
+    total_fuel_cost = sum(v["f"] for v in monthly_data.values())
+    total_reparation = sum(v["r"] for v in monthly_data.values())
+    total_maintenance = sum(v["m"] for v in monthly_data.values())
+    total_purchase = sum(v["p"] for v in monthly_data.values())
+
+    # Format Breakdown
+    final_breakdown = []
+    for k in sorted(monthly_data.keys()):
+        y_int, m_int = map(int, k.split('-'))
+        final_breakdown.append({
+            "month_year": month_label(y_int, m_int),
+            "fuel_cost": monthly_data[k]["f"],
+            "reparation_cost": monthly_data[k]["r"],
+            "maintenance_cost": monthly_data[k]["m"],
+            "purchase_cost": monthly_data[k]["p"]
+        })
+
+    return {
+        "total_fuel_cost": total_fuel_cost,
+        "total_reparation_cost": total_reparation,
+        "total_maintenance_cost": total_maintenance,
+        "total_vehicle_purchase_cost": total_purchase,
+        "monthly_breakdown": final_breakdown
+    }
@@ -0,0 +1,43 @@
+# app/utils/fast_json.py
+
+from typing import Iterable, List, Sequence, Type
+
+import orjson
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+from app.utils.pagination import NEXT_CURSOR_HEADER
+
+
+class FastJSONResponse(ORJSONResponse):
+    """
+    Default response class of the app. orjson instead of the stdlib encoder;
+    UTC datetimes end in 'Z' like Pydantic renders them.
+    """
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+
+
+# =================================================================
+# ROW FAST PATH (SQL tuples -> JSON, no ORM objects, no Pydantic models)
+# =================================================================
+def projection(model, schema: Type[BaseModel]) -> list:
+    """The columns of `model` named like the fields of `schema`, in field order."""
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+def rows_response(rows: Iterable[Sequence], schema: Type[BaseModel], response: Response) -> FastJSONResponse:
+    """
+    Serializes rows selected with `projection(model, schema)` straight to JSON.
+    The route keeps `response_model=List[schema]` for the OpenAPI docs; returning
+    a Response skips the per-row validation. Carries over the pagination header.
+    """
+    fields: List[str] = list(schema.model_fields)
+    return page_response([dict(zip(fields, row)) for row in rows], response)
+
+
+def page_response(content: list, response: Response) -> FastJSONResponse:
+    """A page built by hand, with the X-Next-Cursor header `paginate` set on the route's response."""
+    headers = {NEXT_CURSOR_HEADER: response.headers[NEXT_CURSOR_HEADER]} if NEXT_CURSOR_HEADER in response.headers else None
+    return FastJSONResponse(content, headers=headers)
@@ -0,0 +1,89 @@
+# app/utils/fleet_status.py
+
+from typing import Iterable, Optional
+
+from sqlalchemy import case, exists, func, literal, select, union_all, update
+from sqlalchemy.orm import Session
+
+from app import models
+
+Vehicle = models.Vehicle
+
+# Statuses owned by this engine. Anything else (set by hand on the vehicle) is
+# left alone once the vehicle has no open work.
+WORK_STATUSES = ("reparation", "panne", "maintenance")
+
+REPARATION_ACTIVE = "Inprogress"
+PANNE_ACTIVE = "active"
+MAINTENANCE_ACTIVE = "active"
+
+
+def _status_case(has_reparation, has_panne, has_maintenance, current_status):
+    """Priority: Reparation > Panne > Maintenance > Available."""
+    return case(
+        (has_reparation, "reparation"),
+        (has_panne, "panne"),
+        (has_maintenance, "maintenance"),
+        (current_status.in_(WORK_STATUSES), "available"),
+        else_=current_status,
+    )
+
+
+def _refresh_vehicles(db: Session, vehicle_ids: set):
+    """One UPDATE, CASE over correlated EXISTS probes (indexed on vehicle_id)."""
+    new_status = _status_case(
+        exists().where(models.Reparation.vehicle_id == Vehicle.id, models.Reparation.status == REPARATION_ACTIVE),
+        exists().where(models.Panne.vehicle_id == Vehicle.id, models.Panne.status == PANNE_ACTIVE),
+        exists().where(models.Maintenance.vehicle_id == Vehicle.id, models.Maintenance.status == MAINTENANCE_ACTIVE),
+        Vehicle.status,
+    )
+    db.execute(
+        update(Vehicle)
+        .where(Vehicle.id.in_(vehicle_ids), Vehicle.status.is_distinct_from(new_status))
+        .values(status=new_status)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _refresh_fleet(db: Session):
+    """
+    Whole-fleet mode: one pass over each work table, grouped per vehicle,
+    then a single UPDATE ... FROM touching only vehicles whose status changes.
+    """
+    work = union_all(
+        select(models.Reparation.vehicle_id.label("vehicle_id"), literal(3).label("priority"))
+        .where(models.Reparation.status == REPARATION_ACTIVE),
+        select(models.Panne.vehicle_id, literal(2)).where(models.Panne.status == PANNE_ACTIVE),
+        select(models.Maintenance.vehicle_id, literal(1)).where(models.Maintenance.status == MAINTENANCE_ACTIVE),
+    ).subquery("work")
+    top = select(work.c.vehicle_id, func.max(work.c.priority).label("priority"))\
+        .group_by(work.c.vehicle_id).subquery("top_work")
+
+    v = Vehicle.__table__.alias("v")
+    target = select(
+        v.c.id,
+        _status_case(top.c.priority == 3, top.c.priority == 2, top.c.priority == 1, v.c.status).label("status")
+    ).select_from(v.outerjoin(top, top.c.vehicle_id == v.c.id)).subquery("target")
+
+    vehicle = Vehicle.__table__
+    db.execute(
+        update(vehicle)
+        .where(vehicle.c.id == target.c.id, vehicle.c.status.is_distinct_from(target.c.status))
+        .values(status=target.c.status)
+    )
+
+
+def refresh(db: Session, vehicle_ids: Optional[Iterable[Optional[int]]] = None):
+    """
+    Re-derives Vehicle.status from open reparations, pannes and maintenances
+    inside the caller's transaction (flushes, never commits).
+    `vehicle_ids=None` recomputes the whole fleet.
+    """
+    db.flush()
+    if vehicle_ids is None:
+        _refresh_fleet(db)
+        return
+
+    ids = {vid for vid in vehicle_ids if vid is not None}
+    if ids:
+        _refresh_vehicles(db, ids)
@@ -0,0 +1,151 @@
+# app/utils/fuel_eligibility.py
+
+from datetime import datetime
+from itertools import chain
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import delete, event, exists, func, insert, inspect, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.utils.upsert import upsert
+
+State = models.VehicleFuelState
+Request = models.VehicleRequest
+
+# Upper bound for one batch check (the fuel page asks for its whole dropdown at once)
+MAX_VEHICLES = 1000
+
+# session.info key: vehicles whose completed missions changed in the current transaction
+_TOUCHED = "fuel_state_vehicles"
+
+
+# =================================================================
+# RULE
+# A vehicle can be refuelled when it is available and has completed a mission
+# since its last fuel slip (or has never been refuelled).
+# =================================================================
+def evaluate(status: Optional[str], last_fuel_at: Optional[datetime],
+             last_completed_mission_at: Optional[datetime]) -> Tuple[bool, str]:
+    if status != "available":
+        return False, "Vehicle is not available."
+    if last_fuel_at is not None and (last_completed_mission_at is None or last_completed_mission_at <= last_fuel_at):
+        return False, "No completed mission since last refueling."
+    return True, "Eligible."
+
+
+def check(db: Session, vehicle_ids: Iterable[int]) -> Dict[int, Tuple[bool, str]]:
+    """(eligible, message) per existing vehicle, read in one query from the derived state."""
+    ids = set(vehicle_ids)
+    if not ids:
+        return {}
+    rows = db.execute(
+        select(models.Vehicle.id, models.Vehicle.status, State.last_fuel_at, State.last_completed_mission_at)
+        .outerjoin(State, State.vehicle_id == models.Vehicle.id)
+        .where(models.Vehicle.id.in_(ids))
+    ).all()
+    return {row.id: evaluate(row.status, row.last_fuel_at, row.last_completed_mission_at) for row in rows}
+
+
+# =================================================================
+# INCREMENTAL MAINTENANCE
+# =================================================================
+def _last_fuel():
+    return select(models.Fuel.vehicle_id, func.max(models.Fuel.created_at).label("last_at"))\
+        .where(models.Fuel.vehicle_id.isnot(None)).group_by(models.Fuel.vehicle_id)
+
+
+def _last_completed_mission():
+    return select(Request.vehicle_id, func.max(Request.return_time).label("last_at"))\
+        .where(Request.vehicle_id.isnot(None), Request.status == "completed").group_by(Request.vehicle_id)
+
+
+def refresh(db: Session, vehicle_ids: Iterable[int]):
+    """
+    Recomputes the state of the given vehicles from the source tables inside the
+    caller's transaction: two grouped queries, whatever the number of vehicles.
+    """
+    ids = sorted({v for v in vehicle_ids if v is not None})
+    if not ids:
+        return
+    db.flush()
+    fuel = dict(db.execute(_last_fuel().where(models.Fuel.vehicle_id.in_(ids))).all())
+    missions = dict(db.execute(_last_completed_mission().where(Request.vehicle_id.in_(ids))).all())
+    upsert(db, State, [
+        {"vehicle_id": v, "last_fuel_at": fuel.get(v), "last_completed_mission_at": missions.get(v)}
+        for v in ids
+    ], key=["vehicle_id"], update_cols=["last_fuel_at", "last_completed_mission_at"], set_={"updated_at": func.now()})
+
+
+def forget_vehicle(db: Session, vehicle_id: int):
+    db.execute(delete(State).where(State.vehicle_id == vehicle_id))
+
+
+# =================================================================
+# REQUEST COMPLETION (registered on every Session, sync or async)
+# Requests are completed, reopened or edited from several places, so the affected
+# vehicles are collected at flush time and refreshed once, just before the commit.
+# The old status is not reliably in the attribute history (an instance expired by a
+# commit has none), so any change to status, vehicle or return time triggers a
+# refresh of its vehicles: two grouped queries per commit.
+# =================================================================
+# VehicleRequest.vehicle_id is mapped with active_history, so the vehicle a mission
+# leaves is in the history as well, even on an expired instance.
+_TRACKED = ("status", "vehicle_id", "return_time")
+
+
+def _vehicle_ids(state) -> set:
+    history = state.attrs["vehicle_id"].history
+    return {v for v in chain(history.added, history.unchanged, history.deleted) if v is not None}
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_completions(session: Session, flush_context):
+    # new/dirty/deleted and the attribute history still hold the pre-flush state here
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if not isinstance(obj, Request):
+            continue
+        state = inspect(obj)
+        if obj in session.new or obj in session.deleted or any(
+            state.attrs[key].history.has_changes() for key in _TRACKED
+        ):
+            session.info.setdefault(_TOUCHED, set()).update(_vehicle_ids(state))
+
+
+@event.listens_for(Session, "before_commit")
+def _refresh_on_commit(session: Session):
+    session.flush()
+    touched = session.info.pop(_TOUCHED, None)
+    if touched:
+        refresh(session, touched)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _forget_on_rollback(session: Session, transaction):
+    if transaction.parent is None:
+        session.info.pop(_TOUCHED, None)
+
+
+# =================================================================
+# FULL REBUILD (Backfill)
+# =================================================================
+def rebuild(db: Session):
+    """Recomputes the whole table with one INSERT ... SELECT over the fleet."""
+    fuel = _last_fuel().subquery()
+    missions = _last_completed_mission().subquery()
+    db.execute(delete(State))
+    db.execute(insert(State).from_select(
+        ["vehicle_id", "last_fuel_at", "last_completed_mission_at"],
+        select(models.Vehicle.id, fuel.c.last_at, missions.c.last_at)
+        .outerjoin(fuel, fuel.c.vehicle_id == models.Vehicle.id)
+        .outerjoin(missions, missions.c.vehicle_id == models.Vehicle.id)
+    ))
+
+
+def ensure_backfilled(db: Session):
+    """Builds the state once for databases that already hold fuel slips."""
+    if db.execute(select(exists().where(State.vehicle_id.isnot(None)))).scalar():
+        return
+    if db.execute(select(exists().where(models.Fuel.id.isnot(None)))).scalar():
+        rebuild(db)
+        db.commit()
@@ -0,0 +1,100 @@
+# app/utils/fuel_import.py
+
+from datetime import datetime
+from typing import Dict, List
+
+from fastapi import Request
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.utils import bulk_upload, expense_rollup, fuel_eligibility
+
+# Upper bound for one upload (a week of station invoices is a few hundred slips);
+# also keeps the single multi-row INSERT under the drivers' bind-parameter limits
+MAX_ROWS = 2000
+
+
+async def read_rows(request: Request) -> List[dict]:
+    return await bulk_upload.read_rows(request, MAX_ROWS)
+
+
+# =================================================================
+# VALIDATION + INSERT
+# =================================================================
+def _validate(raw_rows: List[dict]):
+    """Field-level checks. Returns (valid rows keyed by 1-based row number, errors)."""
+    valid: Dict[int, schemas.FuelBulkRow] = {}
+    errors: Dict[int, List[str]] = {}
+    for number, raw in enumerate(raw_rows, start=1):
+        if not isinstance(raw, dict):
+            errors[number] = ["Expected an object."]
+            continue
+        try:
+            row = schemas.FuelBulkRow.model_validate(raw)
+        except ValidationError as e:
+            errors[number] = bulk_upload.validation_messages(e)
+            continue
+        if row.quantity <= 0 or row.price_little <= 0:
+            errors[number] = ["Quantity and Price must be positive."]
+            continue
+        valid[number] = row
+    return valid, errors
+
+
+def ingest(db: Session, raw_rows: List[dict], partial: bool = False) -> dict:
+    """
+    Validates every slip, checks all referenced vehicles and fuel types with two
+    IN queries and inserts the accepted slips with one multi-row INSERT.
+    Without `partial`, any error rejects the whole upload (nothing is inserted).
+    """
+    valid, errors = _validate(raw_rows)
+
+    vehicle_ids = {row.vehicle_id for row in valid.values()}
+    fuel_type_ids = {row.fuel_type_id for row in valid.values()}
+    known_vehicles = set(db.execute(select(models.Vehicle.id).where(models.Vehicle.id.in_(vehicle_ids))).scalars()) if vehicle_ids else set()
+    known_fuel_types = set(db.execute(select(models.FuelType.id).where(models.FuelType.id.in_(fuel_type_ids))).scalars()) if fuel_type_ids else set()
+
+    for number, row in list(valid.items()):
+        missing = []
+        if row.vehicle_id not in known_vehicles:
+            missing.append(f"Vehicle {row.vehicle_id} not found.")
+        if row.fuel_type_id not in known_fuel_types:
+            missing.append(f"Fuel Type {row.fuel_type_id} not found.")
+        if missing:
+            errors[number] = missing
+            del valid[number]
+
+    report = {
+        "received": len(raw_rows),
+        "inserted": 0,
+        "ids": [],
+        "errors": [{"row": number, "errors": errors[number]} for number in sorted(errors)],
+    }
+    if not valid or (errors and not partial):
+        return report
+
+    now = datetime.utcnow()
+    values = [
+        {
+            "vehicle_id": row.vehicle_id,
+            "fuel_type_id": row.fuel_type_id,
+            "quantity": row.quantity,
+            "price_little": row.price_little,
+            "cost": round(row.quantity * row.price_little, 2),
+            "created_at": row.created_at or now,
+            "is_verified": False,
+            "verified_at": None,
+        }
+        for row in valid.values()
+    ]
+    ids = db.execute(insert(models.Fuel).values(values).returning(models.Fuel.id)).scalars().all()
+
+    expense_rollup.refresh_for_ids(db, "fuel", ids)
+    fuel_eligibility.refresh(db, [v["vehicle_id"] for v in values])
+    db.commit()
+
+    report["inserted"] = len(ids)
+    report["ids"] = sorted(ids)
+    return report
@@ -0,0 +1,91 @@
+# app/utils/kpi_engine.py
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select, func, case, true
+from sqlalchemy.orm import Session
+
+from app import models
+
+# Vehicle.status values counted as "Available" on the dashboard
+AVAILABLE_STATUSES = ("available", "active")
+
+
+def _count_if(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def fleet_kpi_statement(now: Optional[datetime] = None):
+    """
+    Builds ONE statement returning every dashboard number.
+    Each CTE yields a single row, so joining them on TRUE keeps a single result row.
+    """
+    now = now or datetime.utcnow()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    start_week = today - timedelta(days=today.weekday())
+    start_month = today.replace(day=1)
+
+    vehicle_stats = select(
+        func.count(models.Vehicle.id).label("total_vehicles"),
+        func.coalesce(func.sum(models.Vehicle.purchase_price), 0.0).label("total_purchase_cost"),
+        _count_if(models.Vehicle.status.in_(AVAILABLE_STATUSES)).label("available_vehicles"),
+        _count_if(models.Vehicle.status == "maintenance").label("maintenance_vehicles"),
+        _count_if(models.Vehicle.status == "panne").label("panne_vehicles"),
+        _count_if(models.Vehicle.status == "reparation").label("reparation_vehicles"),
+    ).cte("vehicle_stats")
+
+    panne_stats = select(
+        func.count(models.Panne.id).label("active_pannes")
+    ).where(models.Panne.status == "active").cte("panne_stats")
+
+    fuel_stats = select(
+        func.coalesce(func.sum(models.Fuel.cost), 0.0).label("fuel_cost_this_week")
+    ).where(models.Fuel.created_at >= start_week).cte("fuel_stats")
+
+    repair_stats = select(
+        func.count(models.Reparation.id).label("repairs_this_month")
+    ).where(models.Reparation.repair_date >= start_month).cte("repair_stats")
+
+    trip_stats = select(
+        func.count(models.VehicleRequest.id).label("planned_trips")
+    ).where(
+        models.VehicleRequest.status == models.RequestStatus.FULLY_APPROVED,
+        models.VehicleRequest.departure_time >= today
+    ).cte("trip_stats")
+
+    return select(
+        vehicle_stats.c.total_vehicles,
+        vehicle_stats.c.total_purchase_cost,
+        vehicle_stats.c.available_vehicles,
+        vehicle_stats.c.maintenance_vehicles,
+        vehicle_stats.c.panne_vehicles,
+        vehicle_stats.c.reparation_vehicles,
+        panne_stats.c.active_pannes,
+        fuel_stats.c.fuel_cost_this_week,
+        repair_stats.c.repairs_this_month,
+        trip_stats.c.planned_trips,
+    ).select_from(
+        vehicle_stats
+        .join(panne_stats, true())
+        .join(fuel_stats, true())
+        .join(repair_stats, true())
+        .join(trip_stats, true())
+    )
+
+
+def compute_fleet_kpis(db: Session, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Runs the KPI statement (single round-trip) and returns a plain dict."""
+    row = db.execute(fleet_kpi_statement(now)).mappings().one()
+    return {
+        "total_vehicles": int(row["total_vehicles"] or 0),
+        "total_purchase_cost": round(float(row["total_purchase_cost"] or 0.0), 2),
+        "available_vehicles": int(row["available_vehicles"] or 0),
+        "maintenance_vehicles": int(row["maintenance_vehicles"] or 0),
+        "panne_vehicles": int(row["panne_vehicles"] or 0),
+        "reparation_vehicles": int(row["reparation_vehicles"] or 0),
+        "active_pannes": int(row["active_pannes"] or 0),
+        "fuel_cost_this_week": round(float(row["fuel_cost_this_week"] or 0.0), 2),
+        "repairs_this_month": int(row["repairs_this_month"] or 0),
+        "planned_trips": int(row["planned_trips"] or 0),
+    }
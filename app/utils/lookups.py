@@ -0,0 +1,87 @@
+# app/utils/lookups.py
+
+import hashlib
+import json
+from typing import Dict, FrozenSet, List, NamedTuple, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import settings
+from app.utils.cache import TTLCache
+
+# Reference table key -> (model, display-name column, key in the /catalog payload)
+LOOKUP_TABLES = {
+    "vehicle_make": (models.VehicleMake, models.VehicleMake.vehicle_make, "vehicle_makes"),
+    "vehicle_model": (models.VehicleModel, models.VehicleModel.vehicle_model, "vehicle_models"),
+    "vehicle_type": (models.VehicleType, models.VehicleType.vehicle_type, "vehicle_types"),
+    "vehicle_transmission": (models.VehicleTransmission, models.VehicleTransmission.vehicle_transmission, "vehicle_transmissions"),
+    "fuel_type": (models.FuelType, models.FuelType.fuel_type, "fuel_types"),
+    "garage": (models.Garage, models.Garage.nom_garage, "garages"),
+    "category_maintenance": (models.CategoryMaintenance, models.CategoryMaintenance.cat_maintenance, "maintenance_categories"),
+    "category_panne": (models.CategoryPanne, models.CategoryPanne.panne_name, "panne_categories"),
+    "role": (models.Role, models.Role.name, "roles"),
+    "agency": (models.Agency, models.Agency.agency_name, "agencies"),
+    "service": (models.Service, models.Service.service_name, "services"),
+}
+
+_CATALOG_KEY = "__catalog__"
+
+
+class Lookup(NamedTuple):
+    rows: List[dict]             # Every column of the table, sorted by name
+    by_name: Dict[str, int]      # lower-cased name -> id (first id wins on duplicate names)
+    ids: FrozenSet[int]
+
+
+class Catalog(NamedTuple):
+    body: bytes    # Serialized once, served as-is
+    version: str   # Content hash: identical in every process holding the same data (used as ETag)
+
+
+# Small tables, read far more often than written; writers call invalidate(),
+# other processes catch up within the TTL.
+_cache = TTLCache(maxsize=64, ttl=settings.LOOKUP_CACHE_TTL_SECONDS)
+
+
+def get(db: Session, table: str) -> Lookup:
+    lookup = _cache.get(table)
+    if lookup is None:
+        model, name_col, _ = LOOKUP_TABLES[table]
+        rows = [dict(r) for r in db.execute(select(model.__table__).order_by(name_col, model.id)).mappings()]
+        by_name: Dict[str, int] = {}
+        for row in rows:
+            by_name.setdefault((row[name_col.key] or "").strip().lower(), row["id"])
+        lookup = Lookup(rows, by_name, frozenset(row["id"] for row in rows))
+        _cache.set(table, lookup)
+    return lookup
+
+
+def resolve(db: Session, table: str, value) -> Optional[int]:
+    """Accepts an id (int or digit string) or a name; returns the id, or None if unknown."""
+    lookup = get(db, table)
+    if isinstance(value, int) or (isinstance(value, str) and value.strip().isdigit()):
+        return int(value) if int(value) in lookup.ids else None
+    return lookup.by_name.get(str(value).strip().lower())
+
+
+def catalog(db: Session) -> Catalog:
+    """Every reference table in one JSON document, rebuilt only after an invalidation or the TTL."""
+    cached = _cache.get(_CATALOG_KEY)
+    if cached is None:
+        payload = {catalog_key: get(db, table).rows for table, (_, _, catalog_key) in LOOKUP_TABLES.items()}
+        version = hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()[:32]
+        body = json.dumps({"version": version, **payload}, separators=(",", ":"), default=str).encode()
+        cached = Catalog(body, version)
+        _cache.set(_CATALOG_KEY, cached)
+    return cached
+
+
+def invalidate(table: Optional[str] = None):
+    """Drop one table's entry (after a create/update/delete) and the catalog, or everything."""
+    if table is None:
+        _cache.clear()
+    else:
+        _cache.pop(table)
+        _cache.pop(_CATALOG_KEY)
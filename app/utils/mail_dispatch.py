@@ -0,0 +1,134 @@
+# app/utils/mail_dispatch.py
+
+import logging
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+from email.utils import formataddr, make_msgid
+from typing import List, Optional, Sequence, Tuple
+
+import aiosmtplib
+
+from app.config import settings
+
+# (filename, content, mime type) - attachments never touch the disk
+Attachment = Tuple[str, bytes, str]
+
+
+@dataclass
+class OutgoingMail:
+    to: str
+    subject: str
+    html: str
+    attachments: List[Attachment] = field(default_factory=list)
+
+
+def build_message(mail: OutgoingMail, sender: Optional[str] = None) -> EmailMessage:
+    msg = EmailMessage()
+    msg["From"] = sender or formataddr((settings.MAIL_FROM_NAME, settings.MAIL_FROM))
+    msg["To"] = mail.to
+    msg["Subject"] = mail.subject
+    msg["Message-ID"] = make_msgid()
+    msg.set_content("This message requires an HTML capable mail client.")
+    msg.add_alternative(mail.html, subtype="html")
+    for filename, content, mime_type in mail.attachments:
+        maintype, _, subtype = mime_type.partition("/")
+        msg.add_attachment(content, maintype=maintype, subtype=subtype, filename=filename)
+    return msg
+
+
+class MailDispatcher:
+    """
+    Sends a batch of messages over ONE SMTP session: a single connect, TLS
+    handshake and AUTH, then one MAIL/RCPT/DATA exchange per message.
+    A dropped connection is re-opened once and the batch resumes where it stopped.
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: bool = False,
+        start_tls: bool = False,
+        validate_certs: bool = True,
+        timeout: float = 30,
+    ):
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.start_tls = start_tls
+        self.validate_certs = validate_certs
+        self.timeout = timeout
+
+    @classmethod
+    def from_settings(cls) -> "MailDispatcher":
+        return cls(
+            hostname=settings.MAIL_SERVER,
+            port=settings.MAIL_PORT,
+            username=settings.MAIL_USERNAME if settings.USE_CREDENTIALS else None,
+            password=settings.MAIL_PASSWORD if settings.USE_CREDENTIALS else None,
+            use_tls=settings.MAIL_SSL_TLS,
+            start_tls=settings.MAIL_STARTTLS,
+        )
+
+    def _client(self) -> aiosmtplib.SMTP:
+        # aiosmtplib performs STARTTLS and AUTH inside connect()
+        return aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            username=self.username,
+            password=self.password,
+            use_tls=self.use_tls,
+            start_tls=self.start_tls,
+            validate_certs=self.validate_certs,
+            timeout=self.timeout,
+        )
+
+    async def send_batch(self, mails: Sequence[OutgoingMail]) -> List[Tuple[OutgoingMail, Exception]]:
+        """
+        Delivers `mails` in a single session. Returns the (mail, error) pairs that
+        failed; a refused recipient does not abort the rest of the batch.
+        """
+        failures: List[Tuple[OutgoingMail, Exception]] = []
+        if not mails:
+            return failures
+
+        messages = [build_message(mail) for mail in mails]
+        smtp = self._client()
+        reconnected = False
+        i = 0
+        try:
+            await smtp.connect()
+            while i < len(messages):
+                try:
+                    await smtp.send_message(messages[i])
+                except aiosmtplib.SMTPServerDisconnected:
+                    if reconnected:
+                        raise
+                    reconnected = True
+                    smtp = self._client()
+                    await smtp.connect()
+                    continue
+                except (aiosmtplib.SMTPRecipientsRefused, aiosmtplib.SMTPResponseException) as e:
+                    failures.append((mails[i], e))
+                i += 1
+        except (aiosmtplib.SMTPException, OSError) as e:
+            # Could not open (or keep) the session: nothing from mails[i] onwards went out
+            failures.extend((mail, e) for mail in mails[i:])
+        finally:
+            if smtp.is_connected:
+                try:
+                    await smtp.quit()
+                except aiosmtplib.SMTPException:
+                    smtp.close()
+
+        for mail, error in failures:
+            logging.error(f"Mail to {mail.to} ({mail.subject!r}) failed: {error}")
+        return failures
+
+
+async def send_batch(mails: Sequence[OutgoingMail]) -> List[Tuple[OutgoingMail, Exception]]:
+    return await MailDispatcher.from_settings().send_batch(mails)
@@ -0,0 +1,159 @@
+# app/utils/mail_outbox.py
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+
+import aiosmtplib
+from sqlalchemy import delete, exists, or_, select
+from sqlalchemy.orm import Session, selectinload
+
+from app import models
+from app.config import settings
+from app.utils.mail_dispatch import MailDispatcher, OutgoingMail
+
+Outbox = models.EmailOutbox
+Attachment = models.EmailAttachment
+AttachmentLink = models.EmailOutboxAttachment
+
+
+# =================================================================
+# PRODUCER SIDE (API)
+# =================================================================
+def enqueue(db: Session, mails: Sequence[OutgoingMail]) -> None:
+    """
+    Adds `mails` to the outbox. Does NOT commit: the rows go out with the
+    caller's own commit, so a rolled-back change never sends mail.
+    Every attachment is kept; one shared by several mails (a fan-out) is stored once.
+    """
+    attachments: Dict[tuple, models.EmailAttachment] = {}
+    for mail in mails:
+        links = []
+        for position, key in enumerate(mail.attachments):
+            attachment = attachments.get(key)
+            if attachment is None:
+                name, content, mime_type = key
+                attachment = attachments[key] = Attachment(name=name, mime_type=mime_type, content=content)
+            links.append(AttachmentLink(position=position, attachment=attachment))
+        db.add(Outbox(
+            recipient=mail.to,
+            subject=mail.subject,
+            html=mail.html,
+            attachment_links=links,
+        ))
+
+
+# =================================================================
+# CONSUMER SIDE (WORKER)
+# =================================================================
+def backoff(attempts: int) -> timedelta:
+    """Delay before retry number `attempts` (1-based): base * 2^(n-1), capped."""
+    seconds = settings.MAIL_OUTBOX_BACKOFF_SECONDS * (2 ** max(attempts - 1, 0))
+    return timedelta(seconds=min(seconds, settings.MAIL_OUTBOX_MAX_BACKOFF_SECONDS))
+
+
+def is_permanent(error: Exception) -> bool:
+    """5xx replies (unknown mailbox, rejected content) will not succeed on retry."""
+    if isinstance(error, aiosmtplib.SMTPRecipientsRefused):
+        return all(r.code >= 500 for r in error.recipients)
+    return isinstance(error, aiosmtplib.SMTPResponseException) and error.code >= 500
+
+
+def claim(db: Session, limit: int, now: Optional[datetime] = None) -> List[models.EmailOutbox]:
+    """
+    Leases up to `limit` due rows to this worker and commits the lease.
+    FOR UPDATE SKIP LOCKED lets several workers drain the table without
+    picking the same rows (SQLite ignores it; one worker there).
+    """
+    now = now or datetime.utcnow()
+    rows = db.query(Outbox).filter(
+        Outbox.status == "pending",
+        Outbox.next_attempt_at <= now,
+        or_(Outbox.locked_until.is_(None), Outbox.locked_until <= now)
+    ).order_by(Outbox.next_attempt_at, Outbox.id)\
+     .limit(limit).with_for_update(skip_locked=True)\
+     .options(selectinload(Outbox.attachment_links).selectinload(AttachmentLink.attachment)).all()
+
+    lease = now + timedelta(seconds=settings.MAIL_OUTBOX_LEASE_SECONDS)
+    for row in rows:
+        row.locked_until = lease
+    db.commit()
+    return rows
+
+
+def to_mail(row: models.EmailOutbox) -> OutgoingMail:
+    attachments = [
+        (link.attachment.name, link.attachment.content, link.attachment.mime_type or "application/octet-stream")
+        for link in row.attachment_links
+    ]
+    return OutgoingMail(row.recipient, row.subject, row.html, attachments)
+
+
+def record_results(db: Session, rows: Sequence[models.EmailOutbox], errors: Dict[int, Exception], now: Optional[datetime] = None) -> None:
+    """Marks rows sent, or schedules a retry / dead-letters those listed in `errors` (by row id)."""
+    now = now or datetime.utcnow()
+    for row in rows:
+        row.locked_until = None
+        error = errors.get(row.id)
+        if error is None:
+            row.status = "sent"
+            row.sent_at = now
+            row.last_error = None
+            continue
+
+        row.attempts += 1
+        row.last_error = str(error)[:2000]
+        if row.attempts >= settings.MAIL_OUTBOX_MAX_ATTEMPTS or is_permanent(error):
+            row.status = "dead"
+            logging.error(f"Outbox mail #{row.id} to {row.recipient} dead-lettered after {row.attempts} attempts: {error}")
+        else:
+            row.next_attempt_at = now + backoff(row.attempts)
+    db.commit()
+
+
+async def drain_once(db: Session, dispatcher: MailDispatcher, concurrency: int, batch_size: int) -> int:
+    """
+    Claims up to concurrency x batch_size due mails and sends them as `concurrency`
+    parallel batches, one SMTP session each. Returns how many rows were processed.
+    """
+    rows = claim(db, concurrency * batch_size)
+    if not rows:
+        return 0
+
+    chunks = [rows[i:i + batch_size] for i in range(0, len(rows), batch_size)]
+    mails = {row.id: to_mail(row) for row in rows}
+    results = await asyncio.gather(
+        *(dispatcher.send_batch([mails[row.id] for row in chunk]) for chunk in chunks),
+        return_exceptions=True
+    )
+
+    row_of_mail = {id(mail): row_id for row_id, mail in mails.items()}
+    errors: Dict[int, Exception] = {}
+    for chunk, result in zip(chunks, results):
+        if isinstance(result, BaseException):
+            errors.update((row.id, result) for row in chunk)
+        else:
+            errors.update((row_of_mail[id(mail)], error) for mail, error in result)
+
+    record_results(db, rows, errors)
+    return len(rows)
+
+
+# =================================================================
+# RETENTION
+# =================================================================
+def purge(db: Session, now: Optional[datetime] = None) -> int:
+    """
+    Deletes sent and dead rows older than MAIL_OUTBOX_RETENTION_DAYS, then the
+    attachments no row references any more. Returns how many rows were deleted.
+    """
+    now = now or datetime.utcnow()
+    cutoff = now - timedelta(days=settings.MAIL_OUTBOX_RETENTION_DAYS)
+    expired = select(Outbox.id).where(Outbox.status.in_(("sent", "dead")), Outbox.created_at < cutoff)
+    # Links first: SQLite does not enforce the ON DELETE CASCADE
+    db.execute(delete(AttachmentLink).where(AttachmentLink.outbox_id.in_(expired)))
+    deleted = db.execute(delete(Outbox).where(Outbox.id.in_(expired))).rowcount
+    db.execute(delete(Attachment).where(~exists().where(AttachmentLink.attachment_id == Attachment.id)))
+    db.commit()
+    return deleted
@@ -1,60 +1,37 @@
 # app/utils/mailer.py
 
-import os
-import tempfile
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
+from typing import Iterable, Tuple
+from sqlalchemy.orm import Session
 from app.config import settings
-from app.security import hash_password
+from app.security import hash_password_pooled
 from app.email_context import USER_VERIFY_ACCOUNT, FORGOT_PASSWORD
+from app.utils.mail_dispatch import OutgoingMail
+from app.utils.mail_outbox import enqueue
 
-# Configure using UPPERCASE attributes from app/config.py
-conf = ConnectionConfig(
-    MAIL_USERNAME=settings.MAIL_USERNAME,
-    MAIL_PASSWORD=settings.MAIL_PASSWORD,
-    MAIL_FROM=settings.MAIL_FROM,
-    MAIL_PORT=settings.MAIL_PORT,
-    MAIL_SERVER=settings.MAIL_SERVER,
-    MAIL_STARTTLS=settings.MAIL_STARTTLS,
-    MAIL_SSL_TLS=settings.MAIL_SSL_TLS,
-    USE_CREDENTIALS=settings.USE_CREDENTIALS,
-    VALIDATE_CERTS=True,
-    MAIL_FROM_NAME=settings.MAIL_FROM_NAME
-)
+# Every mail here is written to the outbox in the caller's transaction;
+# the caller's db.commit() is what releases it to the worker (app/mail_worker.py).
+# All queue_* functions are sync and take the session first.
 
 # ==============================================================================
 # INTERNAL HELPERS
 # ==============================================================================
-async def _send(email_to, subject, html_body, attachments=None):
-    message = MessageSchema(
-        subject=subject,
-        recipients=[email_to],
-        body=html_body,
-        subtype=MessageType.html,
-        attachments=attachments or []
-    )
-    fm = FastMail(conf)
-    await fm.send_message(message)
-
-async def _send_with_pdf(email_to, subject, html_body, pdf_bytes, filename):
-    tmp_dir = tempfile.gettempdir()
-    tmp_path = os.path.join(tmp_dir, filename)
-    try:
-        with open(tmp_path, 'wb') as f:
-            f.write(pdf_bytes)
-        # Pass the path to the temporary file
-        await _send(email_to, subject, html_body, [tmp_path])
-    finally:
-        if os.path.exists(tmp_path):
-            os.remove(tmp_path)
+def _queue(db: Session, email_to, subject, html_body):
+    enqueue(db, [OutgoingMail(email_to, subject, html_body)])
+
+def _pdf_mail(email_to, subject, html_body, pdf_bytes, filename) -> OutgoingMail:
+    return OutgoingMail(email_to, subject, html_body, [(filename, pdf_bytes, "application/pdf")])
+
+def _queue_with_pdf(db: Session, email_to, subject, html_body, pdf_bytes, filename):
+    enqueue(db, [_pdf_mail(email_to, subject, html_body, pdf_bytes, filename)])
 
 # ==============================================================================
 # AUTH EMAILS (Registration, Password Reset, Confirmation)
 # ==============================================================================
 
-async def send_account_verification_email(user, background_tasks):
-    # 1. Generate Token
+def queue_account_verification_email(db: Session, user):
+    # 1. Generate Token (bcrypt on the bounded hasher pool)
     string_context = user.get_context_string(context=USER_VERIFY_ACCOUNT)
-    token = hash_password(string_context)
+    token = hash_password_pooled(string_context, reject_when_full=False)
     
     # 2. Construct CLEAN URL -> Matches the ui_router in user.py
     activate_url = f"{settings.FRONTEND_HOST}/auth/verify-ui?token={token}&email={user.email}"
@@ -77,9 +54,9 @@ async def send_account_verification_email(user, background_tasks):
         </body>
     </html>
     """
-    await _send(user.email, f"Account Verification - {settings.APP_NAME}", html)
+    _queue(db, user.email, f"Account Verification - {settings.APP_NAME}", html)
 
-async def send_account_activation_confirmation_email(user, background_tasks):
+def queue_account_activation_confirmation_email(db: Session, user):
     login_url = f"{settings.FRONTEND_HOST}/login.html"
     
     html = f"""
@@ -97,12 +74,12 @@ async def send_account_activation_confirmation_email(user, background_tasks):
         </body>
     </html>
     """
-    await _send(user.email, f"Welcome - {settings.APP_NAME}", html)
+    _queue(db, user.email, f"Welcome - {settings.APP_NAME}", html)
 
-async def send_password_reset_email(user, background_tasks):
-    # 1. Generate Token
+def queue_password_reset_email(db: Session, user):
+    # 1. Generate Token (bcrypt on the bounded hasher pool)
     string_context = user.get_context_string(context=FORGOT_PASSWORD)
-    token = hash_password(string_context)
+    token = hash_password_pooled(string_context, reject_when_full=False)
     
     # 2. Construct CLEAN URL
     reset_url = f"{settings.FRONTEND_HOST}/reset-password.html?token={token}&email={user.email}"
@@ -123,9 +100,9 @@ async def send_password_reset_email(user, background_tasks):
         </body>
     </html>
     """
-    await _send(user.email, f"Reset Password - {settings.APP_NAME}", html)
+    _queue(db, user.email, f"Reset Password - {settings.APP_NAME}", html)
 
-async def send_password_changed_email(email: str, full_name: str):
+def queue_password_changed_email(db: Session, email: str, full_name: str):
     html = f"""
     <html>
         <body style="font-family: Arial, sans-serif; color: #333;">
@@ -142,14 +119,13 @@ async def send_password_changed_email(email: str, full_name: str):
         </body>
     </html>
     """
-    await _send(email, f"Security Alert - Password Changed", html)
+    _queue(db, email, f"Security Alert - Password Changed", html)
 
 # ==============================================================================
 # REQUEST & MISSION EMAILS
 # ==============================================================================
 
-async def send_mission_order_email(email_to: str, recipient_name: str, pdf_bytes: bytes, filename: str):
-    """Notification for Requester and Charoi role users upon Full Approval."""
+def _mission_order_mail(email_to: str, recipient_name: str, pdf_bytes: bytes, filename: str) -> OutgoingMail:
     html = f"""
     <html>
         <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
@@ -165,17 +141,21 @@ async def send_mission_order_email(email_to: str, recipient_name: str, pdf_bytes
         </body>
     </html>
     """
-    await _send_with_pdf(email_to, f"APPROVED Mission Order - {filename}", html, pdf_bytes, filename)
+    return _pdf_mail(email_to, f"APPROVED Mission Order - {filename}", html, pdf_bytes, filename)
 
-async def send_mission_update_email(email_to: str, requester_name: str, pdf_file: bytes, filename: str):
+def queue_mission_order_email(db: Session, email_to: str, recipient_name: str, pdf_bytes: bytes, filename: str):
+    """Notification for Requester and Charoi role users upon Full Approval."""
+    enqueue(db, [_mission_order_mail(email_to, recipient_name, pdf_bytes, filename)])
+
+def queue_mission_update_email(db: Session, email_to: str, requester_name: str, pdf_file: bytes, filename: str):
     """Original logic preserved for mission details updates."""
     html = f"""<html><body><p>Dear {requester_name}, details updated for your mission.</p></body></html>"""
-    await _send_with_pdf(email_to, f"UPDATED: Mission Order - {filename}", html, pdf_file, filename)
+    _queue_with_pdf(db, email_to, f"UPDATED: Mission Order - {filename}", html, pdf_file, filename)
 
 # ==============================================================================
 # FEATURE DEPRECATED: DRIVER EMAILS DISABLED
 # ==============================================================================
-# async def send_driver_assignment_email(email_to: str, driver_name: str, requester_name: str, destination: str, pdf_file: bytes, filename: str):
+# def queue_driver_assignment_email(db: Session, email_to: str, driver_name: str, requester_name: str, destination: str, pdf_file: bytes, filename: str):
 #     """Standard assignment email for the designated driver (Currently Disabled)."""
 #     html = f"""
 #     <html>
@@ -189,9 +169,9 @@ async def send_mission_update_email(email_to: str, requester_name: str, pdf_file
 #         </body>
 #     </html>
 #     """
-#     await _send_with_pdf(email_to, f"Driver Assignment: Mission to {destination}", html, pdf_file, filename)
+#     _queue_with_pdf(db, email_to, f"Driver Assignment: Mission to {destination}", html, pdf_file, filename)
 
-async def send_rejection_email(email_to: str, requester_name: str, request_id: int, reason: str, approver_name: str):
+def queue_rejection_email(db: Session, email_to: str, requester_name: str, request_id: int, reason: str, approver_name: str):
     """Notification sent ONLY to the requester when a request is denied."""
     html = f"""
     <html>
@@ -209,10 +189,9 @@ async def send_rejection_email(email_to: str, requester_name: str, request_id: i
         </body>
     </html>
     """
-    await _send(email_to, f"Update: Vehicle Request #{request_id} Denied", html)
+    _queue(db, email_to, f"Update: Vehicle Request #{request_id} Denied", html)
 
-async def send_accounting_email(email_to: str, accountant_name: str, pdf_bytes: bytes, filename: str, request_id: int):
-    """Customized function to notify the Accountant user role."""
+def _accounting_mail(email_to: str, accountant_name: str, pdf_bytes: bytes, filename: str, request_id: int) -> OutgoingMail:
     html = f"""
     <html>
         <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
@@ -226,4 +205,25 @@ async def send_accounting_email(email_to: str, accountant_name: str, pdf_bytes:
         </body>
     </html>
     """
-    await _send_with_pdf(email_to, f"Accounting Notification: Mission #{request_id}", html, pdf_bytes, filename)
\ No newline at end of file
+    return _pdf_mail(email_to, f"Accounting Notification: Mission #{request_id}", html, pdf_bytes, filename)
+
+def queue_accounting_email(db: Session, email_to: str, accountant_name: str, pdf_bytes: bytes, filename: str, request_id: int):
+    """Customized function to notify the Accountant user role."""
+    enqueue(db, [_accounting_mail(email_to, accountant_name, pdf_bytes, filename, request_id)])
+
+def queue_full_approval_emails(
+    db: Session,
+    recipients: Iterable[Tuple[str, str]],
+    accountants: Iterable[Tuple[str, str]],
+    pdf_bytes: bytes,
+    filename: str,
+    request_id: int
+):
+    """
+    Final-approval fan-out (requester + charoi users, then accounting users), queued
+    together so the worker sends them in one SMTP session, the same PDF attached to each.
+    `recipients` / `accountants` are (email, full_name) pairs.
+    """
+    mails = [_mission_order_mail(email, name, pdf_bytes, filename) for email, name in recipients]
+    mails += [_accounting_mail(email, name, pdf_bytes, filename, request_id) for email, name in accountants]
+    enqueue(db, mails)
@@ -0,0 +1,109 @@
+# app/utils/pagination.py
+
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional
+
+from fastapi import HTTPException, Query, Response, status
+from sqlalchemy import tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+MAX_PAGE_SIZE = 1000
+
+# Response header carrying the cursor of the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class PageParams:
+    def __init__(self, limit: int, cursor: Optional[str]):
+        self.limit = limit
+        self.cursor = cursor
+
+
+def page_params(default_limit: int = 100):
+    """Builds the `limit` / `cursor` query dependency for a list endpoint."""
+    def dependency(
+        limit: int = Query(default_limit, ge=1, le=MAX_PAGE_SIZE),
+        cursor: Optional[str] = Query(None, description="Opaque value from the X-Next-Cursor header of the previous page")
+    ) -> PageParams:
+        return PageParams(limit, cursor)
+    return dependency
+
+
+# =================================================================
+# CURSOR ENCODING
+# =================================================================
+def _to_json(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _from_json(column, value: Any):
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(values: List[Any]) -> str:
+    raw = json.dumps([_to_json(v) for v in values], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError("cursor does not match this endpoint")
+        return [_from_json(key, value) for key, value in zip(keys, values)]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor.")
+
+
+# =================================================================
+# KEYSET PAGINATION
+# =================================================================
+def _after_cursor(keys, cursor: str):
+    """WHERE clause selecting the rows that come after `cursor` in descending key order."""
+    values = decode_cursor(cursor, keys)
+    if len(keys) == 1:
+        return keys[0] < values[0]
+    return tuple_(*keys) < tuple_(*values)
+
+
+def _finish_page(rows: list, page: PageParams, response: Response, keys) -> list:
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([getattr(rows[-1], key.key) for key in keys])
+    return rows
+
+
+def paginate(query, page: PageParams, response: Response, *keys) -> list:
+    """
+    Returns one page of `query` ordered by `keys` descending, e.g. (created_at, id) or (id,).
+    The last key must be unique. Rows after the cursor are found with a row-value
+    comparison, so page N costs the same as page 1 (no OFFSET scan).
+    """
+    if page.cursor:
+        query = query.filter(_after_cursor(keys, page.cursor))
+    rows = query.order_by(*[key.desc() for key in keys]).limit(page.limit + 1).all()
+    return _finish_page(rows, page, response, keys)
+
+
+async def paginate_async(db: AsyncSession, stmt, page: PageParams, response: Response, *keys, scalars: bool = True) -> list:
+    """
+    `paginate` for a 2.0-style select() executed on an AsyncSession.
+    With scalars=False the rows of a column projection are returned as-is.
+    """
+    if page.cursor:
+        stmt = stmt.where(_after_cursor(keys, page.cursor))
+    result = await db.execute(stmt.order_by(*[key.desc() for key in keys]).limit(page.limit + 1))
+    rows = list(result.unique().scalars().all()) if scalars else list(result.all())
+    return _finish_page(rows, page, response, keys)
@@ -0,0 +1,108 @@
+# app/utils/pdf_cache.py
+
+import glob
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime
+from typing import Optional, Tuple
+
+from app.config import settings
+from app.utils.pdf_generator import generate_mission_order_pdf
+
+# Bump when the PDF layout changes so previously cached documents are not served
+TEMPLATE_VERSION = "2"
+
+
+# =================================================================
+# CONTENT KEY
+# =================================================================
+def _iso(value) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def mission_order_key(request, passenger_details, logistic_officer=None, darh_officer=None) -> str:
+    """
+    SHA-256 over every value printed on the mission order.
+    The document carries its generation date ("Fait à Bujumbura, le ..."), so the
+    day is part of the key as well: a cached copy is reused until midnight.
+    """
+    vehicle = request.vehicle
+    inputs = {
+        "template": TEMPLATE_VERSION,
+        "printed_on": datetime.now().strftime("%Y-%m-%d"),
+        "request": {
+            "id": request.id,
+            "destination": request.destination,
+            "description": request.description,
+            "departure_time": _iso(request.departure_time),
+            "return_time": _iso(request.return_time),
+        },
+        "vehicle": {
+            "plate_number": getattr(vehicle, "plate_number", None),
+            "make": getattr(getattr(vehicle, "make_ref", None), "vehicle_make", None),
+            "model": getattr(getattr(vehicle, "model_ref", None), "vehicle_model", None),
+        } if vehicle else None,
+        "driver": request.driver.full_name if request.driver else None,
+        "passengers": [
+            [p.full_name, getattr(p.service, "service_name", None) if getattr(p, "service", None) else None]
+            for p in (passenger_details or [])
+        ],
+        "logistic_officer": getattr(logistic_officer, "full_name", None),
+        "darh_officer": getattr(darh_officer, "full_name", None),
+    }
+    raw = json.dumps(inputs, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+# =================================================================
+# DISK STORE ({request_id}-{key}.pdf)
+# =================================================================
+def _path(request_id: int, key: str) -> str:
+    return os.path.join(settings.PDF_CACHE_DIR, f"{request_id}-{key}.pdf")
+
+
+def load(request_id: int, key: str) -> Optional[bytes]:
+    try:
+        with open(_path(request_id, key), "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def store(request_id: int, key: str, pdf_bytes: bytes):
+    """Atomically writes the document and drops older versions of the same request."""
+    try:
+        os.makedirs(settings.PDF_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=settings.PDF_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(pdf_bytes)
+        os.replace(tmp_path, _path(request_id, key))
+        invalidate(request_id, keep=key)
+    except OSError as e:
+        # The cache is an optimisation: a read-only or full disk must not break downloads
+        logging.warning(f"Mission order cache write failed for request {request_id}: {e}")
+
+
+def invalidate(request_id: int, keep: Optional[str] = None):
+    """Removes the cached documents of a request (all of them, or all but `keep`)."""
+    for path in glob.glob(os.path.join(settings.PDF_CACHE_DIR, f"{request_id}-*.pdf")):
+        if keep and path == _path(request_id, keep):
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def render(request, passenger_details, logistic_officer=None, darh_officer=None) -> Tuple[bytes, str]:
+    """Returns (pdf_bytes, key), generating and storing the document only on a cache miss."""
+    key = mission_order_key(request, passenger_details, logistic_officer, darh_officer)
+    pdf_bytes = load(request.id, key)
+    if pdf_bytes is None:
+        pdf_bytes = generate_mission_order_pdf(request, passenger_details, logistic_officer, darh_officer).getvalue()
+        store(request.id, key, pdf_bytes)
+    return pdf_bytes, key
+
@@ -1,83 +1,218 @@
 import os
+from typing import List, Optional, Tuple
+from xml.sax.saxutils import escape
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image, HRFlowable, Flowable
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.utils import ImageReader, simpleSplit
+from reportlab.platypus import BaseDocTemplate, PageTemplate, Frame, Paragraph, Spacer, Flowable
+from reportlab.lib.styles import ParagraphStyle
 from io import BytesIO
 from datetime import datetime
 
-# --- CUSTOM FLOWABLE FOR THE AUTHENTIC OVERLAID STAMP ---
-class StampedInk(Flowable):
+# =================================================================
+# STATIC ASSETS (Decoded once at import, shared by every document)
+# =================================================================
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMG_DIR = os.path.join(BASE_DIR, "static", "img")
+
+
+class CachedImage:
     """
-    Draws a stamp image OVER the text. 
-    It has 0 height/width so it doesn't push text down.
+    A PNG decoded once at import (ImageReader), shared by every document. Inside a
+    document it is embedded once, as a form XObject defined on first use; every
+    placement (each page's letterhead, the stamps) only references the form.
     """
-    def __init__(self, img_path, width=1.6*inch, height=1.6*inch, x_off=0, y_off=0):
-        Flowable.__init__(self)
-        self.img_path = img_path
-        self.w = width
-        self.h = height
-        self.x_off = x_off
-        self.y_off = y_off
-
-    def draw(self):
-        if os.path.exists(self.img_path):
-            # 'mask' handles transparency of the PNG
-            self.canv.drawImage(self.img_path, self.x_off, self.y_off, 
-                                width=self.w, height=self.h, mask='auto')
+    def __init__(self, path: str):
+        self.reader = ImageReader(path)
+        self.width, self.height = self.reader.getSize()
+        self.form_name = "img_" + os.path.splitext(os.path.basename(path))[0]
 
-def generate_mission_order_pdf(request, passenger_details, logistic_officer=None, darh_officer=None):
-    # --- DYNAMIC IMAGE PATHS ---
-    BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    IMG_DIR = os.path.join(BASE_DIR, "static", "img")
-    
-    LOGO_PATH = os.path.join(IMG_DIR, "logo.png")
-    SIG_LOGISTIC = os.path.join(IMG_DIR, "stamp_logistic.png")
-    SIG_DARH = os.path.join(IMG_DIR, "stamp_darh.png")
-    STAMP_ONE = os.path.join(IMG_DIR, "stamp_one.png")
+    def _ensure_form(self, canv):
+        if canv.hasForm(self.form_name):
+            return
+        canv.beginForm(self.form_name, 0, 0, self.width, self.height)
+        # 'mask' handles transparency of the PNG
+        canv.drawImage(self.reader, 0, 0, width=self.width, height=self.height, mask='auto')
+        canv.endForm()
 
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(
-        buffer, 
-        pagesize=A4, 
-        rightMargin=50, 
-        leftMargin=50, 
-        topMargin=30, 
-        bottomMargin=30
-    )
-    
-    styles = getSampleStyleSheet()
-    header_bold = ParagraphStyle('HeaderBold', fontSize=10, leading=12, fontName='Helvetica-Bold')
-    title_style = ParagraphStyle('TitleStyle', fontSize=13, leading=15, alignment=1, fontName='Helvetica-Bold', spaceAfter=20)
-    body_style = ParagraphStyle('BodyStyle', fontSize=11, leading=16, alignment=4) 
-    sig_style = ParagraphStyle('SigStyle', fontSize=10, leading=12, alignment=1, fontName='Helvetica-Bold')
-    footer_style = ParagraphStyle('FooterStyle', fontSize=7.5, leading=10, alignment=1)
+    def draw(self, canv, x, y, width, height):
+        self._ensure_form(canv)
+        canv.saveState()
+        canv.translate(x, y)
+        canv.scale(width / self.width, height / self.height)
+        canv.doForm(self.form_name)
+        canv.restoreState()
 
-    story = []
 
-    # --- 1. INSTITUTIONAL HEADER ---
+def _load_image(filename: str) -> Optional[CachedImage]:
+    path = os.path.join(IMG_DIR, filename)
+    if not os.path.exists(path):
+        return None
     try:
-        if os.path.exists(LOGO_PATH):
-            img = Image(LOGO_PATH, width=0.7*inch, height=0.7*inch)
-            img.hAlign = 'LEFT'
-            story.append(img)
-    except: pass
-    
-    story.append(Paragraph("BANQUE DE LA REPUBLIQUE DU BURUNDI", header_bold))
-    story.append(Spacer(1, 10))
-    story.append(Paragraph("DIRECTION DE L'ADMINISTRATION <br/>ET RESSOURCES HUMAINES", header_bold))
-    story.append(Spacer(1, 12))
-    story.append(Paragraph("Service Logistique et Patrimoine", header_bold))
-    story.append(Paragraph("Section Charroi", header_bold))
-    story.append(Spacer(1, 40))
+        return CachedImage(path)
+    except Exception:
+        return None
 
-    # --- 2. DOCUMENT TITLE (Underlined) ---
-    year = request.departure_time.year if request.departure_time else datetime.now().year
-    story.append(Paragraph(f"<u>ORDRE DE MISSION n°{request.id}/{year}</u>", title_style))
-    story.append(Spacer(1, 10))
 
-    # --- 3. VEHICLE DATA (Resolving names from refs) ---
+LOGO = _load_image("logo.png")
+SIG_LOGISTIC = _load_image("stamp_logistic.png")
+SIG_DARH = _load_image("stamp_darh.png")
+STAMP_ONE = _load_image("stamp_one.png")
+
+# --- Paragraph styles (immutable once built) ---
+title_style = ParagraphStyle('TitleStyle', fontSize=13, leading=15, alignment=1, fontName='Helvetica-Bold', spaceAfter=20)
+body_style = ParagraphStyle('BodyStyle', fontSize=11, leading=16, alignment=4)
+date_style = ParagraphStyle('DateRight', alignment=2, fontSize=11, rightIndent=20)
+
+# =================================================================
+# PAGE GEOMETRY (Letterhead header / footer)
+# =================================================================
+PAGE_WIDTH, PAGE_HEIGHT = A4
+LEFT_MARGIN = RIGHT_MARGIN = 50
+TOP_MARGIN = BOTTOM_MARGIN = 30
+CONTENT_WIDTH = PAGE_WIDTH - LEFT_MARGIN - RIGHT_MARGIN
+# Frames pad their content by 6pt; the letterhead lines up with the body text
+FRAME_PADDING = 6
+
+LOGO_SIZE = 0.7 * inch
+HEADER_FONT, HEADER_SIZE, HEADER_LEADING = 'Helvetica-Bold', 10, 12
+# (lines, space after) in drawing order
+HEADER_BLOCKS = [
+    (["BANQUE DE LA REPUBLIQUE DU BURUNDI"], 10),
+    (["DIRECTION DE L'ADMINISTRATION", "ET RESSOURCES HUMAINES"], 12),
+    (["Service Logistique et Patrimoine", "Section Charroi"], 40),
+]
+HEADER_HEIGHT = (LOGO_SIZE if LOGO else 0) + sum(len(lines) * HEADER_LEADING + space for lines, space in HEADER_BLOCKS)
+
+FOOTER_TEXT = "1, avenue du Gouvernement, BP: 705 Bujumbura, Tél: (257) 22 20 40 00/22 27 44 - Fax: (257) 22 22 31 28 - Courriel : brb@brb.bi"
+FOOTER_FONT, FOOTER_SIZE, FOOTER_LEADING = 'Helvetica', 7.5, 10
+FOOTER_LINES = simpleSplit(FOOTER_TEXT, FOOTER_FONT, FOOTER_SIZE, CONTENT_WIDTH)
+FOOTER_RULE_GAP = 5
+FOOTER_HEIGHT = len(FOOTER_LINES) * FOOTER_LEADING + FOOTER_RULE_GAP + 1
+
+
+def _draw_footer(canvas):
+    canvas.setFont(FOOTER_FONT, FOOTER_SIZE)
+    y = BOTTOM_MARGIN + (len(FOOTER_LINES) - 1) * FOOTER_LEADING + 2
+    for line in FOOTER_LINES:
+        canvas.drawCentredString(PAGE_WIDTH / 2, y, line)
+        y -= FOOTER_LEADING
+    rule_y = BOTTOM_MARGIN + FOOTER_HEIGHT - 1
+    canvas.setStrokeColor(colors.black)
+    canvas.setLineWidth(1)
+    canvas.line(LEFT_MARGIN + FRAME_PADDING, rule_y, PAGE_WIDTH - RIGHT_MARGIN - FRAME_PADDING, rule_y)
+
+
+def _draw_letterhead(canvas, doc):
+    """First page: institutional header + footer."""
+    canvas.saveState()
+    y = PAGE_HEIGHT - TOP_MARGIN
+    if LOGO:
+        LOGO.draw(canvas, LEFT_MARGIN + FRAME_PADDING, y - LOGO_SIZE, LOGO_SIZE, LOGO_SIZE)
+        y -= LOGO_SIZE
+    canvas.setFont(HEADER_FONT, HEADER_SIZE)
+    for lines, space_after in HEADER_BLOCKS:
+        for line in lines:
+            canvas.drawString(LEFT_MARGIN + FRAME_PADDING, y - HEADER_SIZE, line)
+            y -= HEADER_LEADING
+        y -= space_after
+    _draw_footer(canvas)
+    canvas.restoreState()
+
+
+def _draw_continuation(canvas, doc):
+    """Following pages: footer only."""
+    canvas.saveState()
+    _draw_footer(canvas)
+    canvas.restoreState()
+
+
+def _page_templates() -> List[PageTemplate]:
+    # Frames keep per-build state, so each document gets fresh instances of the cached geometry
+    body_bottom = BOTTOM_MARGIN + FOOTER_HEIGHT
+    first = Frame(LEFT_MARGIN, body_bottom, CONTENT_WIDTH, PAGE_HEIGHT - TOP_MARGIN - HEADER_HEIGHT - body_bottom, id='first')
+    later = Frame(LEFT_MARGIN, body_bottom, CONTENT_WIDTH, PAGE_HEIGHT - TOP_MARGIN - body_bottom, id='later')
+    return [
+        PageTemplate(id='Letterhead', frames=[first], onPage=_draw_letterhead, autoNextPageTemplate='Continuation'),
+        PageTemplate(id='Continuation', frames=[later], onPage=_draw_continuation),
+    ]
+
+
+# =================================================================
+# SIGNATURE BLOCK (Pre-measured, only the officer names vary)
+# =================================================================
+SIG_FONT, SIG_SIZE, SIG_LEADING = 'Helvetica-Bold', 10, 12
+SIG_IMAGE_SIZE = (1.1 * inch, 0.4 * inch)
+CELL_PADDING = 3
+STAMP_SIZE = 1.6 * inch
+# Stamp offset from the top-centre of the DARH column: right of the name, overlapping it
+STAMP_OFFSET = (20, -55)
+
+LOGISTIC_COLUMN = (2.8 * inch, SIG_LOGISTIC, simpleSplit("Chef du Service Logistique et Patrimoine", SIG_FONT, SIG_SIZE, 2.8 * inch))
+DARH_COLUMN = (3.2 * inch, SIG_DARH, simpleSplit("Directeur de l'Administration et Ressources Humaines", SIG_FONT, SIG_SIZE, 3.2 * inch))
+
+
+def _column_height(column) -> float:
+    _, signature, title_lines = column
+    body = SIG_LEADING + 2 + (SIG_IMAGE_SIZE[1] if signature else 0) + len(title_lines) * SIG_LEADING
+    return body + 2 * CELL_PADDING
+
+
+SIGNATURE_BLOCK_HEIGHT = max(_column_height(LOGISTIC_COLUMN), _column_height(DARH_COLUMN))
+
+
+class SignatureBlock(Flowable):
+    """
+    Both signatures on the same horizontal line: name, scanned signature, underlined title.
+    The DARH stamp is drawn OVER its column (it does not take up space).
+    """
+    def __init__(self, logistic_name: str, darh_name: str):
+        Flowable.__init__(self)
+        self.names = (logistic_name, darh_name)
+        self.width = LOGISTIC_COLUMN[0] + DARH_COLUMN[0]
+        self.height = SIGNATURE_BLOCK_HEIGHT
+        self.hAlign = 'CENTER'
+
+    def wrap(self, availWidth, availHeight):
+        return self.width, self.height
+
+    def _draw_column(self, x: float, column, name: str):
+        width, signature, title_lines = column
+        canv = self.canv
+        centre = x + width / 2
+        y = self.height - CELL_PADDING
+        canv.setFont(SIG_FONT, SIG_SIZE)
+        for line in simpleSplit(name, SIG_FONT, SIG_SIZE, width):
+            canv.drawCentredString(centre, y - SIG_SIZE, line)
+            y -= SIG_LEADING
+        y -= 2
+        if signature:
+            w, h = SIG_IMAGE_SIZE
+            signature.draw(canv, centre - w / 2, y - h, w, h)
+            y -= h
+        canv.setLineWidth(0.5)
+        for line in title_lines:
+            baseline = y - SIG_SIZE
+            canv.drawCentredString(centre, baseline, line)
+            half = canv.stringWidth(line, SIG_FONT, SIG_SIZE) / 2
+            canv.line(centre - half, baseline - 1.25, centre + half, baseline - 1.25)
+            y -= SIG_LEADING
+
+    def draw(self):
+        logistic_name, darh_name = self.names
+        self._draw_column(0, LOGISTIC_COLUMN, logistic_name)
+        darh_x = LOGISTIC_COLUMN[0]
+        if STAMP_ONE:
+            x_off, y_off = STAMP_OFFSET
+            STAMP_ONE.draw(self.canv, darh_x + DARH_COLUMN[0] / 2 + x_off, self.height - CELL_PADDING + y_off, STAMP_SIZE, STAMP_SIZE)
+        self._draw_column(darh_x, DARH_COLUMN, darh_name)
+
+
+# =================================================================
+# VARIABLE CONTENT
+# =================================================================
+def _vehicle_label(request) -> Tuple[str, str]:
     v_make_name = ""
     v_model_name = ""
     if request.vehicle:
@@ -85,15 +220,38 @@ def generate_mission_order_pdf(request, passenger_details, logistic_officer=None
             v_make_name = getattr(request.vehicle.make_ref, 'vehicle_make', '')
         if hasattr(request.vehicle, 'model_ref') and request.vehicle.model_ref:
             v_model_name = getattr(request.vehicle.model_ref, 'vehicle_model', '')
-
     vehicle_info = f"{v_make_name} {v_model_name}".strip() or "VÉHICULE DE SERVICE"
     plate = getattr(request.vehicle, 'plate_number', '_______')
+    return escape(vehicle_info), escape(plate or '_______')
+
 
-    # --- 4. TIME LOGIC ---
-    destination = request.destination or "________"
+def generate_mission_order_pdf(request, passenger_details, logistic_officer=None, darh_officer=None):
+    buffer = BytesIO()
+    doc = BaseDocTemplate(
+        buffer,
+        pagesize=A4,
+        rightMargin=RIGHT_MARGIN,
+        leftMargin=LEFT_MARGIN,
+        topMargin=TOP_MARGIN,
+        bottomMargin=BOTTOM_MARGIN,
+        pageTemplates=_page_templates()
+    )
+
+    story = []
+
+    # --- 1. DOCUMENT TITLE (Underlined) ---
+    year = request.departure_time.year if request.departure_time else datetime.now().year
+    story.append(Paragraph(f"<u>ORDRE DE MISSION n°{request.id}/{year}</u>", title_style))
+    story.append(Spacer(1, 10))
+
+    # --- 2. VEHICLE DATA (Resolving names from refs) ---
+    vehicle_info, plate = _vehicle_label(request)
+
+    # --- 3. TIME LOGIC ---
+    destination = escape(request.destination or "________")
     date_start = request.departure_time.strftime("%d/%m/%Y")
     is_same_day = request.departure_time.date() == request.return_time.date()
-    
+
     if is_same_day:
         time_text = f"une mission aller et retour à <b>{destination}</b> en date du <b>{date_start}</b>."
     else:
@@ -101,13 +259,13 @@ def generate_mission_order_pdf(request, passenger_details, logistic_officer=None
         time_text = (f"une mission à <b>{destination}</b> du <b>{date_start}</b> au "
                      f"{request.return_time.strftime('%d/%m/%Y')}. La durée est de <b>{delta} jours</b>.")
 
-    # --- 5. BODY PARAGRAPHS ---
+    # --- 4. BODY PARAGRAPHS ---
     story.append(Paragraph(f"Pour des raisons de service, le véhicule <b>{vehicle_info}</b> immatriculé <b>{plate}</b> est autorisé à effectuer {time_text}", body_style))
     story.append(Spacer(1, 12))
     story.append(Paragraph(f"Pour la personne à bord la mission s'étend du <b>{date_start}</b> au {request.return_time.strftime('%d/%m/%Y') if request.return_time else ''} (pas des frais de mission).", body_style))
     story.append(Spacer(1, 12))
-    
-    driver = request.driver.full_name if request.driver else "A désigner"
+
+    driver = escape(request.driver.full_name) if request.driver else "A désigner"
     story.append(Paragraph(f"Ledit véhicule est conduit par le chauffeur <b>{driver}</b>.", body_style))
     story.append(Spacer(1, 12))
 
@@ -117,63 +275,22 @@ def generate_mission_order_pdf(request, passenger_details, logistic_officer=None
             dept = "SMF"
             if hasattr(p, 'service') and p.service:
                 dept = getattr(p.service, 'service_name', 'SMF')
-            story.append(Paragraph(f"&nbsp;&nbsp;&nbsp;&nbsp;{i}. Mr/Mme <b>{p.full_name}</b>, du {dept}", body_style))
+            story.append(Paragraph(f"&nbsp;&nbsp;&nbsp;&nbsp;{i}. Mr/Mme <b>{escape(p.full_name)}</b>, du {escape(dept)}", body_style))
 
     story.append(Spacer(1, 20))
-    story.append(Paragraph(f"<b><u>Objet de la mission :</u></b> {request.description}", body_style))
+    story.append(Paragraph(f"<b><u>Objet de la mission :</u></b> {escape(request.description or '')}", body_style))
     story.append(Spacer(1, 30))
 
-    # --- 6. DATE (High position to avoid stamp overlap) ---
-    story.append(Paragraph(f"Fait à Bujumbura, le {datetime.now().strftime('%d/%m/%Y')}", ParagraphStyle('DateRight', alignment=2, fontSize=11, rightIndent=20)))
-    story.append(Spacer(1, 60)) 
-
-    # --- 7. SIGNATURE BLOCK (Same horizontal line) ---
+    # --- 5. DATE (High position to avoid stamp overlap) ---
+    story.append(Paragraph(f"Fait à Bujumbura, le {datetime.now().strftime('%d/%m/%Y')}", date_style))
+    story.append(Spacer(1, 60))
 
-    # --- Cell 1: LOGISTIC ---
-    log_cell = [
-        Paragraph(getattr(logistic_officer, 'full_name', "________________"), sig_style),
-        Spacer(1, 2)
-    ]
-    if os.path.exists(SIG_LOGISTIC):
-        log_cell.append(Image(SIG_LOGISTIC, width=1.1*inch, height=0.4*inch))
-    log_cell.append(Paragraph("<u>Chef du Service Logistique et Patrimoine</u>", sig_style))
-
-    # --- Cell 2: DARH (Stamp OVER Name and Signature) ---
-    darh_cell = []
-    
-    # We add the StampedInk Flowable.
-    # In the screenshot, the stamp was too high. 
-    # y_off: Negative values pull it DOWN towards the text.
-    # x_off: Positive values move it RIGHT.
-    if os.path.exists(STAMP_ONE):
-        # Adjusted: -40 pulls it down over the Name, 20 centers it horizontally in the cell
-        darh_cell.append(StampedInk(STAMP_ONE, width=1.6*inch, height=1.6*inch, x_off=20, y_off=-55))
-    
-    darh_cell.append(Paragraph(getattr(darh_officer, 'full_name', "________________"), sig_style))
-    darh_cell.append(Spacer(1, 2))
-    
-    if os.path.exists(SIG_DARH):
-        # Blue ink signature
-        darh_cell.append(Image(SIG_DARH, width=1.1*inch, height=0.4*inch))
-        
-    darh_cell.append(Paragraph("<u>Directeur de l'Administration et Ressources Humaines</u>", sig_style))
-
-    # Single row table keeps both cells on the same horizontal line
-    sig_table = Table([[log_cell, darh_cell]], colWidths=[2.8*inch, 3.2*inch])
-    sig_table.setStyle(TableStyle([
-        ('VALIGN', (0,0), (-1,-1), 'TOP'),
-        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-        ('LEFTPADDING', (0,0), (-1,-1), 0),
-        ('RIGHTPADDING', (0,0), (-1,-1), 0),
-    ]))
-    story.append(sig_table)
-
-    # --- 8. FOOTER ---
-    story.append(Spacer(1, 1.3 * inch))
-    story.append(HRFlowable(width="100%", thickness=1, color=colors.black, spaceBefore=1, spaceAfter=5))
-    footer_text = "1, avenue du Gouvernement, BP: 705 Bujumbura, Tél: (257) 22 20 40 00/22 27 44 - Fax: (257) 22 22 31 28 - Courriel : brb@brb.bi"
-    story.append(Paragraph(footer_text, footer_style))
+    # --- 6. SIGNATURE BLOCK (Same horizontal line) ---
+    story.append(SignatureBlock(
+        getattr(logistic_officer, 'full_name', None) or "________________",
+        getattr(darh_officer, 'full_name', None) or "________________"
+    ))
 
     doc.build(story)
     buffer.seek(0)
-    return buffer
\ No newline at end of file
+    return buffer
@@ -0,0 +1,85 @@
+# app/utils/request_inbox.py
+
+from typing import Optional
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+
+Request = models.VehicleRequest
+
+# Roles with oversight of every request
+OVERSIGHT_ROLES = ("admin", "superadmin", "darh")
+
+# Status a role acts on in the approval workflow (routers/approval.py)
+ACTION_STATUS = {
+    "chef": "pending",
+    "charoi": "approved_by_chef",
+    "logistic": "approved_by_charoi",
+    "darh": "approved_by_logistic",
+    "admin": "approved_by_logistic",
+    "superadmin": "approved_by_logistic",
+}
+
+# Still moving through the workflow (what a requester without a workflow step waits on)
+OPEN_STATUSES = ("pending", "approved_by_chef", "approved_by_charoi", "approved_by_logistic")
+
+
+# =================================================================
+# FILTERS
+# Each role maps to a fixed shape: an IN on status and/or requester_id, which the
+# (status, id) and (requester_id, id) indexes serve in id order, without joins.
+# =================================================================
+def _role(user) -> str:
+    return user.role.name.lower() if user.role else ""
+
+
+def _service_members(service_id):
+    return select(models.User.id).where(models.User.service_id == service_id)
+
+
+def visibility(user) -> Optional[object]:
+    """WHERE clause for the requests `user` may see (None: everything)."""
+    role = _role(user)
+    if role in OVERSIGHT_ROLES:
+        return None
+    if role == "chef":
+        # Own requests and those of their service's staff (the chef is one of them)
+        return Request.requester_id.in_(_service_members(user.service_id))
+    if role == "charoi":
+        # Own requests and those ready for asset allocation
+        return or_(Request.requester_id == user.id, Request.status.in_(["approved_by_chef", "fully_approved"]))
+    if role == "logistic":
+        # Own requests, those waiting for Charoi/Logistic and the approved ones
+        return or_(Request.requester_id == user.id, Request.status.in_(["approved_by_charoi", "fully_approved"]))
+    # Standard users and drivers
+    return Request.requester_id == user.id
+
+
+def actionable(user):
+    """
+    WHERE clause for the requests waiting on `user`: their workflow step, or for
+    roles without one, their own requests still in the workflow.
+    """
+    role = _role(user)
+    status = ACTION_STATUS.get(role)
+    if status is None:
+        return (Request.requester_id == user.id) & Request.status.in_(OPEN_STATUSES)
+    if role == "chef":
+        return (Request.status == status) & Request.requester_id.in_(_service_members(user.service_id))
+    return Request.status == status
+
+
+def visible(query, user):
+    """Restricts a select() on VehicleRequest to what `user` may see."""
+    clause = visibility(user)
+    return query if clause is None else query.where(clause)
+
+
+# =================================================================
+# COUNTS
+# =================================================================
+async def count_actionable(db: AsyncSession, user) -> int:
+    result = await db.execute(select(func.count(Request.id)).where(actionable(user)))
+    return result.scalar_one()
@@ -0,0 +1,144 @@
+# app/utils/table_versions.py
+
+import logging
+from itertools import chain
+from typing import Dict, Iterable
+
+from sqlalchemy import bindparam, event, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app import models
+from app.database import Base
+from app.utils.upsert import upsert
+
+TableVersion = models.TableVersion
+
+# session.info key: names of the tables written in the current transaction
+_CHANGED = "changed_tables"
+# session.info key: (connection, tables) to advance once the commit is durable (Postgres)
+_COMMITTED = "committed_tables"
+
+
+# =================================================================
+# STORAGE
+# Postgres: one sequence per table, advanced with nextval() right after the
+# commit. Sequences are not transactional and take no row lock, so concurrent
+# writers never queue on a shared counter row, and since the bump follows the
+# commit a reader never sees a new version before the data behind it.
+# Elsewhere (SQLite tests): the table_versions row, upserted in the transaction.
+# =================================================================
+def _uses_sequences(dialect_name: str) -> bool:
+    return dialect_name == "postgresql"
+
+
+def _sequence_name(table: str) -> str:
+    return f"{table}__version_seq"
+
+
+def ensure_sequences(engine: Engine):
+    """Creates the missing version sequences, one per mapped table (Postgres only)."""
+    if not _uses_sequences(engine.dialect.name):
+        return
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            conn.exec_driver_sql(f'CREATE SEQUENCE IF NOT EXISTS "{_sequence_name(table.name)}"')
+
+
+def _changed(session: Session) -> set:
+    return session.info.setdefault(_CHANGED, set())
+
+
+# =================================================================
+# CHANGE CAPTURE (registered on every Session, sync or async)
+# =================================================================
+@event.listens_for(Session, "after_flush")
+def _collect_flushed(session: Session, flush_context):
+    # new/dirty/deleted still hold the pre-flush state here
+    changed = _changed(session)
+    for obj in chain(session.new, session.dirty, session.deleted):
+        changed.update(table.name for table in inspect(obj).mapper.tables)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_statement(state):
+    # Bulk INSERT/UPDATE/DELETE statements (bulk imports, verify-bulk, fleet status, rollups)
+    if state.is_insert or state.is_update or state.is_delete:
+        table = getattr(state.statement, "table", None)
+        if table is not None and table.name != TableVersion.__tablename__:
+            _changed(state.session).add(table.name)
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_on_commit(session: Session):
+    session.flush()
+    if not _uses_sequences(session.get_bind().dialect.name):
+        changed = session.info.pop(_CHANGED, None)
+        if changed:
+            bump(session, changed)
+        return
+    # A savepoint release is not durable yet: its tables wait for the outer commit
+    if session.in_nested_transaction():
+        return
+    changed = session.info.pop(_CHANGED, None)
+    if changed:
+        session.info[_COMMITTED] = (session.connection(), changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _advance_after_commit(session: Session):
+    pending = session.info.pop(_COMMITTED, None)
+    if pending:
+        connection, tables = pending
+        advance(connection, tables)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _forget_on_rollback(session: Session, transaction):
+    if transaction.parent is None:
+        session.info.pop(_CHANGED, None)
+        session.info.pop(_COMMITTED, None)
+
+
+# =================================================================
+# READ / WRITE
+# =================================================================
+def bump(db: Session, tables: Iterable[str]):
+    """Increments the counters of `tables` inside the caller's transaction (creating missing rows)."""
+    rows = [{"name": name, "version": 1} for name in sorted(tables)]  # Fixed lock order across writers
+    upsert(db, TableVersion, rows, key=["name"], update_cols=[], set_={"version": TableVersion.version + 1})
+
+
+def advance(connection: Connection, tables: Iterable[str]):
+    """
+    Postgres: nextval() on the sequences of `tables`, on the connection that just
+    committed (its pool slot is still held, so no second checkout). The statement
+    opens a transaction that the session rolls back on release; nextval survives it.
+    """
+    calls = ", ".join(f"""nextval('"{_sequence_name(name)}"')""" for name in sorted(tables))
+    try:
+        connection.exec_driver_sql(f"SELECT {calls}")
+    except DBAPIError as e:
+        # The data is committed: a missed bump only delays revalidation until the next write
+        logging.warning(f"Table version bump failed for {sorted(tables)}: {e}")
+
+
+async def read(db: AsyncSession, tables: Iterable[str]) -> Dict[str, int]:
+    """Current counter per table; 0 for a table that was never written."""
+    names = sorted(set(tables))
+    if _uses_sequences(db.bind.dialect.name):
+        sequences = {_sequence_name(name): name for name in names}
+        result = await db.execute(
+            text(
+                "SELECT sequencename, last_value FROM pg_sequences "
+                "WHERE schemaname = current_schema() AND sequencename IN :names"
+            ).bindparams(bindparam("names", expanding=True)),
+            {"names": list(sequences)},
+        )
+        versions = {sequences[sequence]: value or 0 for sequence, value in result.all()}
+    else:
+        result = await db.execute(select(TableVersion.name, TableVersion.version).where(TableVersion.name.in_(names)))
+        versions = dict(result.all())
+    return {name: versions.get(name, 0) for name in names}
@@ -0,0 +1,47 @@
+# app/utils/upsert.py
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import and_, insert, update
+from sqlalchemy.orm import Session
+
+
+def upsert(db: Session, model, rows: List[dict], key: Sequence[str], update_cols: Sequence[str],
+           set_: Optional[Dict[str, Any]] = None):
+    """
+    Inserts `rows` into `model`'s table inside the caller's transaction; a row whose
+    `key` columns (a unique constraint) already exist updates that row instead:
+    `update_cols` take the value of the incoming row, `set_` columns an SQL expression
+    (e.g. func.now(), or Model.version + 1).
+
+    Postgres and SQLite run one INSERT ... ON CONFLICT DO UPDATE; other databases
+    fall back to an UPDATE per row, then an INSERT for the rows it did not find.
+    """
+    if not rows:
+        return
+    set_ = set_ or {}
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        stmt = dialect_insert(model).values(rows)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=list(key),
+            set_={**{col: stmt.excluded[col] for col in update_cols}, **set_},
+        ))
+        return
+
+    # Generic fallback
+    missing = []
+    for row in rows:
+        found = db.execute(
+            update(model)
+            .where(and_(*(getattr(model, col) == row[col] for col in key)))
+            .values({**{col: row[col] for col in update_cols}, **set_})
+        ).rowcount
+        if not found:
+            missing.append(row)
+    if missing:
+        db.execute(insert(model), missing)
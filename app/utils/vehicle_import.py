@@ -0,0 +1,136 @@
+# app/utils/vehicle_import.py
+
+from typing import Dict, List
+
+from fastapi import HTTPException, Request
+from pydantic import ValidationError
+from sqlalchemy import insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.utils import bulk_upload, lookups
+
+MAX_ROWS = 2000
+# Rows per multi-row INSERT (all batches share one transaction)
+INSERT_BATCH_SIZE = 500
+
+# Row field -> lookup table it references
+REFERENCE_FIELDS = {
+    "make": "vehicle_make",
+    "model": "vehicle_model",
+    "vehicle_type": "vehicle_type",
+    "vehicle_transmission": "vehicle_transmission",
+    "vehicle_fuel_type": "fuel_type",
+}
+
+
+async def read_rows(request: Request) -> List[dict]:
+    return await bulk_upload.read_rows(request, MAX_ROWS)
+
+
+def _validate(db: Session, raw_rows: List[dict]):
+    """
+    Field checks and name/id resolution. Returns (parsed values, insert values, errors),
+    all keyed by 1-based row number; parsed rows include those with unknown references.
+    """
+    parsed: Dict[int, dict] = {}
+    valid: Dict[int, dict] = {}
+    errors: Dict[int, List[str]] = {}
+    for number, raw in enumerate(raw_rows, start=1):
+        if not isinstance(raw, dict):
+            errors[number] = ["Expected an object."]
+            continue
+        try:
+            row = schemas.VehicleBulkRow.model_validate(raw)
+        except ValidationError as e:
+            errors[number] = bulk_upload.validation_messages(e)
+            continue
+
+        values = row.model_dump()
+        values["plate_number"] = values["plate_number"].strip()
+        values["vin"] = values["vin"].strip()
+        parsed[number] = values
+        problems = []
+        for field, table in REFERENCE_FIELDS.items():
+            resolved = lookups.resolve(db, table, values[field])
+            if resolved is None:
+                problems.append(f"{field}: unknown {table.replace('_', ' ')} '{values[field]}'.")
+            values[field] = resolved
+        if problems:
+            errors[number] = problems
+            continue
+        valid[number] = values
+    return parsed, valid, errors
+
+
+def _check_conflicts(db: Session, parsed: Dict[int, dict], valid: Dict[int, dict], errors: Dict[int, List[str]]):
+    """
+    Plate/VIN clashes with the fleet (one query) and within the upload itself, over
+    every parsed row, so a row reports all of its problems at once.
+    """
+    plates = {v["plate_number"] for v in parsed.values()}
+    vins = {v["vin"] for v in parsed.values()}
+    taken_plates, taken_vins = set(), set()
+    if parsed:
+        for plate, vin in db.execute(
+            select(models.Vehicle.plate_number, models.Vehicle.vin)
+            .where(or_(models.Vehicle.plate_number.in_(plates), models.Vehicle.vin.in_(vins)))
+        ).all():
+            taken_plates.add(plate)
+            taken_vins.add(vin)
+
+    seen_plates: Dict[str, int] = {}
+    seen_vins: Dict[str, int] = {}
+    for number, values in parsed.items():
+        problems = []
+        plate, vin = values["plate_number"], values["vin"]
+        if plate in taken_plates:
+            problems.append("Plate number already exists.")
+        elif plate in seen_plates:
+            problems.append(f"Plate number repeats row {seen_plates[plate]}.")
+        if vin in taken_vins:
+            problems.append("VIN already exists.")
+        elif vin in seen_vins:
+            problems.append(f"VIN repeats row {seen_vins[vin]}.")
+        seen_plates.setdefault(plate, number)
+        seen_vins.setdefault(vin, number)
+        if problems:
+            errors.setdefault(number, []).extend(problems)
+            valid.pop(number, None)
+
+
+def ingest(db: Session, raw_rows: List[dict], partial: bool = False) -> dict:
+    """
+    Validates the rows, resolves reference names through the cached lookups, checks
+    plate/VIN conflicts in one query and inserts in batches inside one transaction.
+    Without `partial`, any error rejects the whole upload (nothing is inserted).
+    """
+    parsed, valid, errors = _validate(db, raw_rows)
+    _check_conflicts(db, parsed, valid, errors)
+
+    report = {
+        "received": len(raw_rows),
+        "inserted": 0,
+        "ids": [],
+        "errors": [{"row": number, "errors": errors[number]} for number in sorted(errors)],
+    }
+    if not valid or (errors and not partial):
+        return report
+
+    values = [dict(v, status="available", is_verified=False, verified_at=None) for v in valid.values()]
+    ids: List[int] = []
+    try:
+        for i in range(0, len(values), INSERT_BATCH_SIZE):
+            ids += db.execute(
+                insert(models.Vehicle).values(values[i:i + INSERT_BATCH_SIZE]).returning(models.Vehicle.id)
+            ).scalars().all()
+        db.commit()
+    except IntegrityError:
+        # A plate or VIN was registered concurrently, after the conflict check
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Plate number or VIN already exists; nothing was imported.")
+
+    report["inserted"] = len(ids)
+    report["ids"] = sorted(ids)
+    return report
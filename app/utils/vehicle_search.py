@@ -0,0 +1,97 @@
+# app/utils/vehicle_search.py
+
+from typing import List, Optional, Sequence
+
+from sqlalchemy import case, func, or_, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.utils import lookups
+
+Vehicle = models.Vehicle
+
+MAX_RESULTS = 1000
+
+# Columns of a VehicleSearchHit row (make/model ids, turned into names by hits())
+HIT_COLUMNS = (
+    Vehicle.id, Vehicle.plate_number, Vehicle.vin, Vehicle.make, Vehicle.model,
+    Vehicle.vehicle_fuel_type, Vehicle.status,
+)
+
+
+# =================================================================
+# MATCHING
+# Plate and VIN substring matches are served on Postgres by the pg_trgm GIN
+# indexes (alembic: vehicle search trigram indexes); elsewhere (SQLite tests)
+# the same ILIKE runs as a scan. Make/model names come from the cached lookups,
+# so a name match becomes an IN on the indexed make/model columns.
+# =================================================================
+def _matching_reference_ids(db: Session, table: str, term: str) -> List[int]:
+    _, name_col, _ = lookups.LOOKUP_TABLES[table]
+    return [row["id"] for row in lookups.get(db, table).rows if term in (row[name_col.key] or "").lower()]
+
+
+def match(db: Session, q: str):
+    """WHERE clause: `q` appears in the plate, the VIN, the make or the model name (case-insensitive)."""
+    term = q.strip().lower()
+    clauses = [Vehicle.plate_number.icontains(term, autoescape=True), Vehicle.vin.icontains(term, autoescape=True)]
+    make_ids = _matching_reference_ids(db, "vehicle_make", term)
+    model_ids = _matching_reference_ids(db, "vehicle_model", term)
+    if make_ids:
+        clauses.append(Vehicle.make.in_(make_ids))
+    if model_ids:
+        clauses.append(Vehicle.model.in_(model_ids))
+    return or_(*clauses)
+
+
+def _rank(q: str):
+    """0 = exact plate ... 5 = make/model match only; ties are ordered by plate."""
+    term = q.strip().lower()
+    return case(
+        (func.lower(Vehicle.plate_number) == term, 0),
+        (Vehicle.plate_number.istartswith(term, autoescape=True), 1),
+        (func.lower(Vehicle.vin) == term, 2),
+        (Vehicle.plate_number.icontains(term, autoescape=True), 3),
+        (Vehicle.vin.icontains(term, autoescape=True), 4),
+        else_=5,
+    )
+
+
+# =================================================================
+# TYPEAHEAD SEARCH
+# =================================================================
+def search(db: Session, q: str = "", statuses: Optional[Sequence[str]] = None, limit: int = 10,
+           ids: Optional[Sequence[int]] = None) -> List[dict]:
+    """
+    Ranked typeahead hits (VehicleSearchHit). Without `q`, the first `limit`
+    vehicles by plate, so a dropdown can be filled from the same endpoint.
+    `ids` restricts the hits to those vehicles (labels for rows already on screen).
+    """
+    stmt = select(*HIT_COLUMNS)
+    if ids:
+        stmt = stmt.where(Vehicle.id.in_(ids))
+    if q.strip():
+        stmt = stmt.where(match(db, q)).order_by(_rank(q), Vehicle.plate_number)
+    else:
+        stmt = stmt.order_by(Vehicle.plate_number)
+    if statuses:
+        stmt = stmt.where(Vehicle.status.in_(statuses))
+    return hits(db, db.execute(stmt.limit(min(limit, MAX_RESULTS))).all())
+
+
+def hits(db: Session, rows) -> List[dict]:
+    """HIT_COLUMNS rows as VehicleSearchHit dicts, make/model names from the cached lookups."""
+    makes = {row["id"]: row["vehicle_make"] for row in lookups.get(db, "vehicle_make").rows}
+    vehicle_models = {row["id"]: row["vehicle_model"] for row in lookups.get(db, "vehicle_model").rows}
+    return [
+        {
+            "id": row.id,
+            "plate_number": row.plate_number,
+            "vin": row.vin,
+            "make": makes.get(row.make),
+            "model": vehicle_models.get(row.model),
+            "vehicle_fuel_type": row.vehicle_fuel_type,
+            "status": row.status,
+        }
+        for row in rows
+    ]
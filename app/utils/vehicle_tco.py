@@ -0,0 +1,172 @@
+# app/utils/vehicle_tco.py
+
+from collections import defaultdict
+from datetime import date
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.utils import lookups
+
+Rollup = models.MonthlyExpenseRollup
+Vehicle = models.Vehicle
+
+MAX_RESULTS = 1000
+
+
+# =================================================================
+# PER-VEHICLE TOTALS
+# Read from the monthly expense rollup (one row per vehicle x month x category,
+# kept current by app/utils/expense_rollup.py), so the fleet report scans
+# O(vehicles x months) pre-aggregated rows instead of every fuel slip and invoice.
+# =================================================================
+def _period(start: Optional[date], end: Optional[date]) -> list:
+    """WHERE clauses on the rollup: whole months from start's month to end's month."""
+    period = Rollup.year * 100 + Rollup.month
+    clauses = [Rollup.vehicle_id != 0]
+    if start:
+        clauses.append(period >= start.year * 100 + start.month)
+    if end:
+        clauses.append(period <= end.year * 100 + end.month)
+    return clauses
+
+
+def _amount(category: str):
+    return func.coalesce(func.sum(case((Rollup.category == category, Rollup.amount), else_=0.0)), 0.0)
+
+
+def _litres():
+    return func.coalesce(func.sum(case((Rollup.category == "fuel", Rollup.quantity), else_=0.0)), 0.0)
+
+
+def _totals(start: Optional[date], end: Optional[date]):
+    return select(
+        Rollup.vehicle_id,
+        _amount("fuel").label("fuel_cost"),
+        _amount("maintenance").label("maintenance_cost"),
+        _amount("reparation").label("reparation_cost"),
+        _litres().label("fuel_litres"),
+        func.count(case((Rollup.category == "fuel", 1))).label("fuel_months"),
+    ).where(*_period(start, end)).group_by(Rollup.vehicle_id).subquery()
+
+
+# =================================================================
+# FLEET REPORT
+# One statement: vehicles LEFT JOIN their totals, derived ratios, and window
+# functions for the fleet-wide figures (evaluated before ORDER BY / LIMIT, so
+# they describe the whole fleet even when only the top N rows are returned).
+# =================================================================
+def _report_columns(totals):
+    fuel = func.coalesce(totals.c.fuel_cost, 0.0)
+    maintenance = func.coalesce(totals.c.maintenance_cost, 0.0)
+    reparation = func.coalesce(totals.c.reparation_cost, 0.0)
+    litres = func.coalesce(totals.c.fuel_litres, 0.0)
+    running = fuel + maintenance + reparation
+    mileage = func.nullif(Vehicle.mileage, 0)
+    return {
+        "fuel_cost": fuel,
+        "maintenance_cost": maintenance,
+        "reparation_cost": reparation,
+        "running_cost": running,
+        "ownership_cost": func.coalesce(Vehicle.purchase_price, 0.0) + running,
+        "cost_per_km": running / mileage,
+        "fuel_litres": litres,
+        "avg_monthly_litres": litres / func.nullif(totals.c.fuel_months, 0),
+        "litres_per_100km": litres * 100 / mileage,
+        "mileage": Vehicle.mileage,
+        "purchase_price": Vehicle.purchase_price,
+        "plate_number": Vehicle.plate_number,
+    }
+
+
+# Sortable keys of the report
+SORT_KEYS = (
+    "running_cost", "ownership_cost", "cost_per_km", "fuel_cost", "maintenance_cost", "reparation_cost",
+    "fuel_litres", "avg_monthly_litres", "litres_per_100km", "mileage", "purchase_price", "plate_number",
+)
+
+
+def fleet_report(db: Session, start: Optional[date] = None, end: Optional[date] = None,
+                 sort: str = "running_cost", descending: bool = True, limit: int = 100,
+                 monthly: bool = False) -> dict:
+    """Cost of ownership per vehicle, sorted and cut to `limit` rows by the database."""
+    totals = _totals(start, end)
+    columns = _report_columns(totals)
+    running = columns["running_cost"]
+
+    sort_col = columns[sort]
+    order = (sort_col.desc() if descending else sort_col.asc()).nulls_last()
+    stmt = select(
+        Vehicle.id.label("vehicle_id"), Vehicle.make, Vehicle.model, Vehicle.status,
+        *(col.label(name) for name, col in columns.items()),
+        func.rank().over(order_by=running.desc()).label("cost_rank"),
+        (running / func.nullif(func.sum(running).over(), 0)).label("fleet_share"),
+        func.sum(running).over().label("fleet_running_cost"),
+        func.sum(columns["fuel_litres"]).over().label("fleet_fuel_litres"),
+        func.count().over().label("fleet_vehicles"),
+    ).select_from(Vehicle).outerjoin(totals, totals.c.vehicle_id == Vehicle.id)\
+     .order_by(order, Vehicle.id).limit(min(limit, MAX_RESULTS))
+
+    rows = db.execute(stmt).mappings().all()
+    makes = {row["id"]: row["vehicle_make"] for row in lookups.get(db, "vehicle_make").rows}
+    vehicle_models = {row["id"]: row["vehicle_model"] for row in lookups.get(db, "vehicle_model").rows}
+
+    vehicles = []
+    for row in rows:
+        item = {key: row[key] for key in ("vehicle_id", "status", "cost_rank", "fleet_share", *columns)}
+        item["make"] = makes.get(row["make"])
+        item["model"] = vehicle_models.get(row["model"])
+        vehicles.append(item)
+
+    if monthly and vehicles:
+        series = monthly_series(db, [v["vehicle_id"] for v in vehicles], start, end)
+        for item in vehicles:
+            item["monthly"] = series.get(item["vehicle_id"], [])
+
+    first = rows[0] if rows else {}
+    return {
+        "fleet": {
+            "vehicles": first.get("fleet_vehicles", 0),
+            "running_cost": float(first.get("fleet_running_cost") or 0.0),
+            "fuel_litres": float(first.get("fleet_fuel_litres") or 0.0),
+        },
+        "vehicles": vehicles,
+    }
+
+
+# =================================================================
+# MONTHLY SERIES
+# =================================================================
+def monthly_series(db: Session, vehicle_ids: Sequence[int], start: Optional[date] = None,
+                   end: Optional[date] = None) -> Dict[int, List[dict]]:
+    """
+    Per vehicle and month: cost by category, litres and the running total since
+    the start of the period (a window over the grouped rows), in one query.
+    """
+    running = _amount("fuel") + _amount("maintenance") + _amount("reparation")
+    stmt = select(
+        Rollup.vehicle_id, Rollup.year, Rollup.month,
+        _amount("fuel").label("fuel_cost"),
+        _amount("maintenance").label("maintenance_cost"),
+        _amount("reparation").label("reparation_cost"),
+        _litres().label("fuel_litres"),
+        func.sum(running).over(
+            partition_by=Rollup.vehicle_id, order_by=(Rollup.year, Rollup.month)
+        ).label("cumulative_cost"),
+    ).where(Rollup.vehicle_id.in_(vehicle_ids), *_period(start, end))\
+     .group_by(Rollup.vehicle_id, Rollup.year, Rollup.month)\
+     .order_by(Rollup.vehicle_id, Rollup.year, Rollup.month)
+
+    series: Dict[int, List[dict]] = defaultdict(list)
+    for row in db.execute(stmt).mappings():
+        series[row["vehicle_id"]].append({
+            "month": f"{row['year']}-{row['month']:02d}",
+            "fuel_cost": float(row["fuel_cost"]),
+            "maintenance_cost": float(row["maintenance_cost"]),
+            "reparation_cost": float(row["reparation_cost"]),
+            "fuel_litres": float(row["fuel_litres"]),
+            "cumulative_cost": float(row["cumulative_cost"]),
+        })
+    return dict(series)
@@ -1,9 +1,10 @@
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
-from app.main import app
-from app.database import Base, get_db
+from app import models
+from app.database import Base, get_db, get_async_db
 from app.config import get_settings
 
 settings = get_settings()
@@ -14,11 +15,18 @@ SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Same file through aiosqlite for the AsyncSession routes
+async_engine = create_async_engine("sqlite+aiosqlite:///./test.db")
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 @pytest.fixture(scope="module")
 def db_session():
     # Create tables
     Base.metadata.create_all(bind=engine)
     db = TestingSessionLocal()
+    # Registration assigns the 'user' role
+    db.add(models.Role(name="user"))
+    db.commit()
     try:
         yield db
     finally:
@@ -28,11 +36,19 @@ def db_session():
 
 @pytest.fixture(scope="module")
 def client(db_session):
+    # Imported here so the unit tests (tests/unit) never load the application
+    from app.main import app
+
     def override_get_db():
         try:
             yield db_session
         finally:
             db_session.close()
     
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     yield TestClient(app)
\ No newline at end of file
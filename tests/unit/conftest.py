@@ -0,0 +1,46 @@
+# Fixtures for the unit tests: no app.main, no test client, an in-memory database per test.
+
+import socket
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.utils import lookups
+
+
+@pytest.fixture
+def free_port():
+    """
+    A local TCP port nothing listens on. aiosmtpd's Controller needs a real one:
+    with port=0 it connects back to port 0 to check the server is up.
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def seed_rows():
+    """Rows added to the fresh database before the test; a test module overrides it."""
+    return []
+
+
+@pytest.fixture
+def db(seed_rows):
+    # One shared connection, usable from the threadpool that iterates streaming responses
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine, autoflush=False)()
+    session.add_all(seed_rows)
+    session.commit()
+    # The lookup catalog is process-wide: never let one test's rows leak into the next
+    lookups.invalidate()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+        lookups.invalidate()
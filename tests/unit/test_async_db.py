@@ -0,0 +1,54 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app import database, models
+from app.oauth2 import RolePrincipal, UserPrincipal
+from app.utils import request_inbox
+from app.utils.kpi_engine import compute_fleet_kpis
+
+
+def test_get_async_db_yields_one_session_and_closes_it():
+    async def run():
+        dependency = database.get_async_db()
+        session = await dependency.__anext__()
+        assert isinstance(session, AsyncSession)
+        assert session.bind is database.async_engine
+        with pytest.raises(StopAsyncIteration):
+            await dependency.__anext__()
+
+    asyncio.run(run())
+
+
+def test_async_session_serves_the_async_route_patterns():
+    # What the async routes do: awaited 2.0 selects, and sync helpers through run_sync
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(database.Base.metadata.create_all)
+        session_factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+        try:
+            async with session_factory() as db:
+                db.add_all([
+                    models.Vehicle(id=1, plate_number="A-1", vin="V1", color="white", status="available"),
+                    models.VehicleRequest(id=1, destination="X", status="pending", requester_id=2,
+                                          departure_time=datetime(2026, 1, 1), return_time=datetime(2026, 1, 2)),
+                ])
+                await db.commit()
+
+                plates = (await db.execute(select(models.Vehicle.plate_number))).scalars().all()
+                kpis = await db.run_sync(compute_fleet_kpis)
+                requester = UserPrincipal(id=2, full_name="User 2", matricule="M2", email="u2@x.org", role_id=1, service_id=None,
+                                          agency_id=None, is_active=True, role=RolePrincipal(id=1, name="user"))
+                pending = await request_inbox.count_actionable(db, requester)
+            return plates, kpis, pending
+        finally:
+            await engine.dispose()
+
+    plates, kpis, pending = asyncio.run(run())
+    assert plates == ["A-1"]
+    assert kpis["total_vehicles"] == 1
+    assert pending == 1  # the requester's own open request
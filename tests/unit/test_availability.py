@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import models
+from app.utils import availability
+
+T0 = datetime(2026, 3, 2, 8, 0)
+
+
+@pytest.fixture
+def seed_rows():
+    return [
+        models.Role(id=1, name="user"),
+        models.Role(id=2, name="Driver"),
+        models.Vehicle(id=1, plate_number="A-1", vin="V1", color="white", status="available"),
+        models.Vehicle(id=2, plate_number="B-2", vin="V2", color="white", status="active"),
+        models.Vehicle(id=3, plate_number="C-3", vin="V3", color="white", status="panne"),
+        *(
+            models.User(id=n, matricule=f"M{n}", full_name=f"User {n}", agency_id=1, service_id=1, role_id=role_id,
+                        telephone=f"0{n}", email=f"u{n}@x.org", password="x", is_active=active)
+            for n, role_id, active in ((1, 1, True), (2, 2, True), (3, 2, True), (4, 2, False))
+        ),
+    ]
+
+
+def _book(db, vehicle_id, driver_id, hours, status="fully_approved"):
+    req = models.VehicleRequest(requester_id=1, vehicle_id=vehicle_id, driver_id=driver_id, destination="X",
+                                departure_time=T0 + timedelta(hours=hours[0]), return_time=T0 + timedelta(hours=hours[1]),
+                                status=status)
+    db.add(req)
+    db.commit()
+    return req
+
+
+def _free(db, start_h, end_h, exclude=None):
+    start, end = T0 + timedelta(hours=start_h), T0 + timedelta(hours=end_h)
+    return ([v["id"] for v in availability.free_vehicles(db, start, end, exclude)],
+            [d["id"] for d in availability.free_drivers(db, start, end, exclude)])
+
+
+def test_only_assignable_vehicles_and_active_drivers(db):
+    assert _free(db, 0, 4) == ([1, 2], [2, 3])
+
+
+def test_overlapping_bookings_hold_their_resources(db):
+    req = _book(db, 1, 2, (2, 6))
+    assert _free(db, 0, 4) == ([2], [3])
+    assert _free(db, 5, 8) == ([2], [3])
+    # Half-open windows: back-to-back trips do not clash
+    assert _free(db, 6, 9) == ([1, 2], [2, 3])
+    assert _free(db, 0, 2) == ([1, 2], [2, 3])
+    # The request being reassigned does not block itself
+    assert _free(db, 0, 4, exclude=req.id) == ([1, 2], [2, 3])
+
+
+def test_closed_requests_release_their_resources(db):
+    _book(db, 1, 2, (2, 6), status="completed")
+    _book(db, 2, 3, (2, 6), status="denied")
+    assert _free(db, 0, 4) == ([1, 2], [2, 3])
+
+
+def test_conflicts_name_the_blocking_request(db):
+    blocking = _book(db, 1, 2, (2, 6), status="in_progress")
+    req = _book(db, None, None, (4, 8), status="approved_by_chef")
+    assert availability.conflicts(db, req, 1, 2) == [
+        f"Vehicle 1 is already booked by request {blocking.id} over this period.",
+        f"Driver 2 is already booked by request {blocking.id} over this period.",
+    ]
+    assert availability.conflicts(db, req, 2, 3) == []
+    assert availability.conflicts(db, blocking, 1, 2) == []
@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from app import models
+from app.utils import bulk_verify
+
+
+def test_reports_verified_already_verified_and_missing(db):
+    now = datetime.utcnow()
+    fresh = models.Panne(vehicle_id=1, category_panne_id=1, panne_date=now)
+    done = models.Panne(vehicle_id=1, category_panne_id=1, panne_date=now, is_verified=True, verified_at=now)
+    db.add_all([fresh, done])
+    db.commit()
+
+    result = bulk_verify.verify(db, models.Panne, [fresh.id, done.id, 999, fresh.id])
+    db.commit()
+
+    assert result == {"verified": [fresh.id], "already_verified": [done.id], "missing": [999]}
+    db.refresh(fresh)
+    assert fresh.is_verified and fresh.verified_at is not None
+
+
+def test_empty_selection_is_a_no_op(db):
+    assert bulk_verify.verify(db, models.Fuel, []) == {"verified": [], "already_verified": [], "missing": []}
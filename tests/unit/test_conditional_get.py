@@ -0,0 +1,77 @@
+import hashlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app import models, oauth2
+from app.database import Base, get_async_db
+from app.oauth2 import RolePrincipal, UserPrincipal
+from app.utils import conditional_get
+
+USER = UserPrincipal(id=1, full_name="Ada", matricule="M1", email="ada@x.org", role_id=1, service_id=1,
+                     agency_id=1, is_active=True, role=RolePrincipal(id=1, name="admin"))
+
+
+@pytest.fixture
+def client(tmp_path):
+    path = tmp_path / "versions.db"
+    Base.metadata.create_all(bind=create_engine(f"sqlite:///{path}"))
+    # NullPool: no aiosqlite connection outlives the TestClient's event loop
+    sessions = async_sessionmaker(create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool))
+
+    async def test_db():
+        async with sessions() as db:
+            yield db
+
+    app = FastAPI()
+    app.add_middleware(conditional_get.ConditionalGetMiddleware)
+    app.dependency_overrides[get_async_db] = test_db
+
+    @app.get("/private", dependencies=[conditional_get.validated_by(models.VehicleMake)])
+    def private():
+        return []
+
+    @app.get("/public", dependencies=[conditional_get.validated_by(models.VehicleMake, public=True)])
+    def public():
+        return []
+
+    with TestClient(app) as test_client:
+        yield app, test_client
+
+
+def _anonymous_tag(path):
+    return hashlib.sha256(f"{path}||anon|vehicle_make=0".encode()).hexdigest()[:32]
+
+
+def test_private_route_answers_401_before_any_304(client):
+    app, http = client
+    assert http.get("/private").status_code == 401
+    # Even with the tag an anonymous caller would get, nothing is confirmed without a login
+    assert http.get("/private", headers={"If-None-Match": f'"{_anonymous_tag("/private")}"'}).status_code == 401
+    assert http.get("/private", headers={"If-None-Match": "*"}).status_code == 401
+
+
+def test_authenticated_caller_revalidates(client):
+    app, http = client
+    app.dependency_overrides[oauth2.get_current_user] = lambda: USER
+
+    first = http.get("/private")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert etag.strip('"') != _anonymous_tag("/private")
+
+    again = http.get("/private", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["etag"] == etag
+
+
+def test_public_route_serves_anonymous_callers(client):
+    app, http = client
+    first = http.get("/public")
+    assert first.status_code == 200
+    assert first.headers["etag"] == f'"{_anonymous_tag("/public")}"'
+    assert http.get("/public", headers={"If-None-Match": first.headers["etag"]}).status_code == 304
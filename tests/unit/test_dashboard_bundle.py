@@ -0,0 +1,54 @@
+from datetime import date, datetime
+
+import pytest
+
+from app import models, schemas
+from app.utils import dashboard_bundle
+
+
+@pytest.fixture
+def seed_rows():
+    return [
+        models.Vehicle(id=1, plate_number="A-1", vin="V1", color="white", status="panne", purchase_price=100),
+        models.CategoryPanne(id=1, panne_name="Engine"),
+        models.VehicleRequest(vehicle_id=1, destination="X", departure_time=datetime(2026, 1, 10),
+                              return_time=datetime(2026, 1, 11), status="completed"),
+        models.VehicleRequest(vehicle_id=1, destination="Y", departure_time=datetime(2026, 3, 2),
+                              return_time=datetime(2026, 3, 3), status="pending"),
+        models.VehicleRequest(vehicle_id=1, destination="Z", departure_time=datetime(2026, 3, 5),
+                              return_time=datetime(2026, 3, 6), status="denied"),
+        models.Maintenance(vehicle_id=1, maintenance_cost=30, receipt="r", maintenance_date=datetime(2026, 3, 20)),
+        models.Panne(vehicle_id=1, category_panne_id=1, description="Overheating", panne_date=datetime(2026, 1, 12)),
+    ]
+
+
+@pytest.fixture
+def db(db):
+    # Each test has its own database; never serve it a bundle cached by another
+    dashboard_bundle._cache.clear()
+    yield db
+    dashboard_bundle._cache.clear()
+
+
+def test_monthly_activity_counts_every_month_of_the_period(db):
+    chart = dashboard_bundle.monthly_activity(db, datetime(2025, 12, 1), datetime(2026, 3, 31, 23, 59))
+    assert chart == {
+        "labels": ["Dec '25", "Jan '26", "Feb '26", "Mar '26"],
+        "trips": [0, 1, 0, 1],  # the denied request is not a trip
+        "maintenances": [0, 0, 0, 1],
+        "pannes": [0, 1, 0, 0],
+    }
+    schemas.MonthlyActivityChartData.model_validate(chart)
+
+
+def test_bundle_is_shared_per_period(db):
+    bundle = dashboard_bundle.cached(db, date(2026, 1, 1), date(2026, 3, 31))
+    assert bundle["vehicle_status"]["counts"] == [0, 0, 1, 0]
+    assert bundle["alerts"]["critical_panne"]["message"] == "Breakdown: Overheating"
+    assert [a["plate_number"] for a in bundle["recent_alerts"]] == ["A-1"]
+    schemas.DashboardBundle.model_validate({**bundle, "pending_requests": 0})
+
+    db.add(models.Panne(vehicle_id=1, category_panne_id=1, panne_date=datetime(2026, 2, 1)))
+    db.commit()
+    assert dashboard_bundle.cached(db, date(2026, 1, 1), date(2026, 3, 31)) is bundle
+    assert dashboard_bundle.cached(db, date(2026, 1, 1), date(2026, 2, 28)) is not bundle
@@ -0,0 +1,127 @@
+import asyncio
+import csv
+import io
+import json
+from datetime import date, datetime
+
+import orjson
+import pytest
+from fastapi.responses import StreamingResponse
+
+from app import models
+from app.routers import analytics_api
+from app.utils import expense_export
+
+
+@pytest.fixture
+def seed_rows():
+    march = datetime(2026, 3, 10, 9, 30)
+    return [
+        models.VehicleMake(id=1, vehicle_make="Toyota"),
+        models.VehicleModel(id=1, vehicle_model="Hilux"),
+        models.Vehicle(id=1, plate_number="A-1", vin="VIN-1", color="white", status="available",
+                       make=1, model=1, purchase_date=datetime(2026, 3, 1), purchase_price=30000),
+        models.Vehicle(id=2, plate_number="B-2", vin="VIN-2", color="white", status="available",
+                       purchase_date=datetime(2025, 1, 1), purchase_price=20000),
+        models.FuelType(id=1, fuel_type="Diesel"),
+        models.Garage(id=1, nom_garage="Garage Central"),
+        models.CategoryMaintenance(id=1, cat_maintenance="Oil change"),
+        models.CategoryPanne(id=1, panne_name="Engine"),
+        models.Panne(id=1, vehicle_id=1, category_panne_id=1, description="Overheating", panne_date=march),
+        models.Fuel(id=1, vehicle_id=1, fuel_type_id=1, quantity=40, price_little=2.5, cost=100, created_at=march),
+        models.Fuel(id=2, vehicle_id=2, fuel_type_id=1, quantity=10, price_little=2.5, cost=25,
+                    created_at=datetime(2026, 4, 1)),
+        models.Maintenance(id=1, vehicle_id=1, cat_maintenance_id=1, garage_id=1, maintenance_cost=80,
+                           receipt="r", maintenance_date=march),
+        models.Reparation(id=1, panne_id=1, vehicle_id=1, garage_id=1, cost=300, receipt="r", repair_date=march),
+    ]
+
+
+def _export(db, fmt, start=date(2026, 3, 1), end=date(2026, 3, 31), categories=None):
+    response = analytics_api.get_detailed_expense_records(start, end, categories, fmt, db)
+    if not isinstance(response, StreamingResponse):
+        return response, response.body.decode()
+
+    async def read():
+        return "".join([chunk async for chunk in response.body_iterator])
+
+    return response, asyncio.run(read())
+
+
+# =================================================================
+# JSON
+# =================================================================
+def test_json_report_lists_every_category_in_range(db):
+    _, body = _export(db, "json")
+
+    assert orjson.loads(body) == {
+        "fuel_records": [{"id": 1, "vehicle_plate": "A-1", "date": "2026-03-10T09:30:00", "quantity": 40.0,
+                          "cost": 100.0, "notes": ""}],
+        "reparation_records": [{"id": 1, "vehicle_plate": "A-1", "repair_date": "2026-03-10",
+                                "description": "Overheating", "cost": 300.0, "provider": "Garage Central"}],
+        "maintenance_records": [{"id": 1, "vehicle_plate": "A-1", "maintenance_date": "2026-03-10",
+                                 "description": "Oil change", "maintenance_cost": 80.0, "provider": "Garage Central"}],
+        "purchase_records": [{"id": 1, "plate_number": "A-1", "make": "Toyota", "model": "Hilux",
+                              "purchase_date": "2026-03-01", "purchase_price": 30000.0}],
+    }
+
+
+def test_json_report_keeps_only_the_requested_categories(db):
+    report = orjson.loads(_export(db, "json", categories=["fuel"])[1])
+    assert [r["id"] for r in report["fuel_records"]] == [1]
+    assert report["reparation_records"] == report["maintenance_records"] == report["purchase_records"] == []
+
+
+# =================================================================
+# NDJSON
+# =================================================================
+def test_ndjson_streams_one_tagged_object_per_line(db):
+    response, body = _export(db, "ndjson")
+
+    assert response.media_type == "application/x-ndjson"
+    assert response.headers["content-disposition"] == 'attachment; filename="expenses_2026-03-01_2026-03-31.ndjson"'
+    assert body.endswith("\n")
+    lines = [json.loads(line) for line in body.splitlines()]
+    assert [(line["category"], line["id"]) for line in lines] == [
+        ("fuel", 1), ("reparation", 1), ("maintenance", 1), ("purchases", 1)
+    ]
+    assert lines[0] == {"category": "fuel", "id": 1, "vehicle_plate": "A-1", "date": "2026-03-10T09:30:00",
+                        "quantity": 40.0, "cost": 100.0, "notes": ""}
+
+
+def test_ndjson_chunks_large_exports(db, monkeypatch):
+    monkeypatch.setattr(expense_export, "CHUNK_SIZE", 1)
+    chunks = list(expense_export.stream_ndjson(db, datetime(2026, 1, 1), datetime(2026, 12, 31), ["fuel"]))
+    assert len(chunks) == 2
+    assert all(chunk.count("\n") == 1 for chunk in chunks)
+
+
+# =================================================================
+# CSV
+# =================================================================
+def test_csv_has_the_header_then_one_row_per_record(db):
+    response, body = _export(db, "csv")
+
+    assert response.media_type.startswith("text/csv")
+    assert response.headers["content-disposition"] == 'attachment; filename="expenses_2026-03-01_2026-03-31.csv"'
+    rows = list(csv.reader(io.StringIO(body)))
+    assert rows == [
+        ["category", "id", "vehicle_plate", "date", "description", "quantity", "amount", "provider"],
+        ["fuel", "1", "A-1", "2026-03-10T09:30:00", "", "40.0", "100.0", ""],
+        ["reparation", "1", "A-1", "2026-03-10T09:30:00", "Overheating", "", "300.0", "Garage Central"],
+        ["maintenance", "1", "A-1", "2026-03-10T09:30:00", "Oil change", "", "80.0", "Garage Central"],
+        ["purchases", "1", "A-1", "2026-03-01T00:00:00", "Toyota Hilux", "", "30000.0", ""],
+    ]
+
+
+# =================================================================
+# EMPTY RANGE
+# =================================================================
+def test_empty_range_in_every_format(db):
+    empty = {"start": date(2024, 1, 1), "end": date(2024, 1, 31)}
+
+    assert orjson.loads(_export(db, "json", **empty)[1]) == {
+        "fuel_records": [], "reparation_records": [], "maintenance_records": [], "purchase_records": []
+    }
+    assert _export(db, "ndjson", **empty)[1] == ""
+    assert list(csv.reader(io.StringIO(_export(db, "csv", **empty)[1]))) == [expense_export.CSV_COLUMNS]
@@ -0,0 +1,179 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select
+
+from app import models, schemas
+from app.routers import fuel as fuel_router
+from app.routers import maintenance as maintenance_router
+from app.routers import reparation as reparation_router
+from app.utils import expense_rollup
+
+Rollup = models.MonthlyExpenseRollup
+
+
+@pytest.fixture
+def seed_rows():
+    return [
+        models.Vehicle(id=1, plate_number="P-1", vin="VIN-1", color="white", status="available"),
+        models.Vehicle(id=2, plate_number="P-2", vin="VIN-2", color="white", status="available"),
+        models.FuelType(id=1, fuel_type="Diesel"),
+        models.CategoryPanne(id=1, panne_name="Engine"),
+        models.Garage(id=1, nom_garage="G"),
+    ]
+
+
+def _rollup(db, category):
+    """{(vehicle_id, year, month): (amount, verified_amount, quantity, record_count)} for one category."""
+    return {
+        (r.vehicle_id, r.year, r.month): (r.amount, r.verified_amount, r.quantity, r.record_count)
+        for r in db.scalars(select(Rollup).where(Rollup.category == category))
+    }
+
+
+def _assert_matches_rebuild(db):
+    """The incrementally maintained table must equal a full rebuild from the source tables."""
+    incremental = {c: _rollup(db, c) for c in expense_rollup.CATEGORIES}
+    expense_rollup.rebuild(db)
+    assert {c: _rollup(db, c) for c in expense_rollup.CATEGORIES} == incremental
+
+
+# =================================================================
+# ROUTER HOOKS
+# =================================================================
+def test_maintenance_hooks_follow_insert_edit_move_and_delete(db):
+    jan, mar = datetime(2026, 1, 10), datetime(2026, 3, 5)
+    first = maintenance_router.create_maintenance(schemas.MaintenanceCreate(
+        vehicle_id=1, maintenance_cost=100, receipt="r", maintenance_date=jan, status="resolved"), db, None)
+    maintenance_router.create_maintenance(schemas.MaintenanceCreate(
+        vehicle_id=1, maintenance_cost=50, receipt="r", maintenance_date=jan, status="resolved"), db, None)
+    assert _rollup(db, "maintenance") == {(1, 2026, 1): (150, 0, 0, 2)}
+
+    maintenance_router.update_maintenance(first.id, schemas.MaintenanceUpdate(maintenance_cost=120), db, None)
+    assert _rollup(db, "maintenance") == {(1, 2026, 1): (170, 0, 0, 2)}
+
+    # Moving to another vehicle and month leaves the old bucket with only what stayed behind
+    maintenance_router.update_maintenance(
+        first.id, schemas.MaintenanceUpdate(vehicle_id=2, maintenance_date=mar), db, None)
+    assert _rollup(db, "maintenance") == {(1, 2026, 1): (50, 0, 0, 1), (2, 2026, 3): (120, 0, 0, 1)}
+
+    maintenance_router.delete_maintenance(first.id, db, None)
+    assert _rollup(db, "maintenance") == {(1, 2026, 1): (50, 0, 0, 1)}
+    _assert_matches_rebuild(db)
+
+
+def test_fuel_hooks_follow_insert_edit_move_and_delete(db):
+    slip = fuel_router.create_new_fuel_record(
+        schemas.FuelCreatePayload(vehicle_id=1, fuel_type_id=1, quantity=10, price_little=2), db, None)
+    year, month = slip.created_at.year, slip.created_at.month
+    assert _rollup(db, "fuel") == {(1, year, month): (20, 0, 10, 1)}
+
+    fuel_router.update_existing_fuel_record(slip.id, schemas.FuelUpdatePayload(quantity=15), db, None)
+    assert _rollup(db, "fuel") == {(1, year, month): (30, 0, 15, 1)}
+
+    # The emptied bucket of vehicle 1 is removed, not left at zero
+    fuel_router.update_existing_fuel_record(slip.id, schemas.FuelUpdatePayload(vehicle_id=2), db, None)
+    assert _rollup(db, "fuel") == {(2, year, month): (30, 0, 15, 1)}
+
+    fuel_router.delete_existing_fuel_record(slip.id, db, None)
+    assert _rollup(db, "fuel") == {}
+    _assert_matches_rebuild(db)
+
+
+def test_reparation_hooks_follow_insert_edit_move_and_delete(db):
+    jan, feb = datetime(2026, 1, 20), datetime(2026, 2, 2)
+    panne = models.Panne(vehicle_id=1, category_panne_id=1, panne_date=jan, status="active")
+    db.add(panne)
+    db.commit()
+
+    rep = reparation_router.create_reparation(schemas.ReparationCreate(
+        panne_id=panne.id, cost=300, receipt="r", garage_id=1, repair_date=jan), db, None)
+    assert _rollup(db, "reparation") == {(1, 2026, 1): (300, 0, 0, 1)}
+
+    reparation_router.update_reparation(rep.id, schemas.ReparationUpdate(cost=250, repair_date=feb), db, None)
+    assert _rollup(db, "reparation") == {(1, 2026, 2): (250, 0, 0, 1)}
+
+    reparation_router.delete_reparation(rep.id, db, None)
+    assert _rollup(db, "reparation") == {}
+    _assert_matches_rebuild(db)
+
+
+def test_bulk_verify_moves_amount_to_verified(db):
+    maint = maintenance_router.create_maintenance(schemas.MaintenanceCreate(
+        vehicle_id=1, maintenance_cost=80, receipt="r", maintenance_date=datetime(2026, 1, 3), status="resolved"), db, None)
+
+    maintenance_router.verify_maintenance_bulk(schemas.MaintenanceBulkVerify(ids=[maint.id]), db, None)
+
+    assert _rollup(db, "maintenance") == {(1, 2026, 1): (80, 80, 0, 1)}
+
+
+# =================================================================
+# READ SIDE
+# =================================================================
+def _source_totals(db, start, end):
+    """Reference answer: every category summed straight from the source tables."""
+    totals = {}
+    for category in expense_rollup.CATEGORIES:
+        model, date_col, amount_col, _ = expense_rollup._source(category)
+        for when, amount in db.execute(select(date_col, amount_col).where(date_col >= start, date_col <= end)):
+            month = totals.setdefault((when.year, when.month), {c: 0.0 for c in expense_rollup.CATEGORIES})
+            month[category] += amount
+    return totals
+
+
+@pytest.fixture
+def spread(db):
+    """Fuel and maintenance on both sides of the edges of every range tested below."""
+    days = [datetime(2026, 1, 5), datetime(2026, 1, 25), datetime(2026, 2, 14),
+            datetime(2026, 3, 1), datetime(2026, 3, 20), datetime(2026, 4, 2), datetime(2026, 4, 28)]
+    for n, when in enumerate(days, start=1):
+        db.add(models.Fuel(vehicle_id=1, fuel_type_id=1, quantity=n, price_little=1, cost=n, created_at=when))
+        db.add(models.Maintenance(vehicle_id=2, maintenance_cost=10 * n, receipt="r", maintenance_date=when))
+    db.flush()
+    expense_rollup.rebuild(db)
+    db.commit()
+    return db
+
+
+@pytest.mark.parametrize("start, end", [
+    (datetime(2026, 1, 1), datetime(2026, 4, 30, 23, 59, 59, 999999)),  # whole months only
+    (datetime(2026, 1, 20), datetime(2026, 4, 10)),                      # partial at both edges
+    (datetime(2026, 1, 20), datetime(2026, 3, 31, 23, 59, 59, 999999)),  # partial start only
+    (datetime(2026, 2, 1), datetime(2026, 4, 10)),                       # partial end only
+    (datetime(2026, 3, 10), datetime(2026, 3, 25)),                      # inside a single month
+])
+def test_monthly_totals_match_the_source_tables(spread, start, end):
+    assert expense_rollup.monthly_expense_totals(spread, start, end) == _source_totals(spread, start, end)
+
+
+def test_partial_edge_months_are_read_from_the_source(spread):
+    # A stale rollup only shows up in the whole months: the edges never read it
+    spread.query(Rollup).update({Rollup.amount: 0.0})
+    spread.commit()
+
+    totals = expense_rollup.monthly_expense_totals(spread, datetime(2026, 1, 20), datetime(2026, 4, 10))
+
+    assert totals[(2026, 1)] == {"fuel": 2, "maintenance": 20, "reparation": 0}
+    assert totals[(2026, 4)] == {"fuel": 6, "maintenance": 60, "reparation": 0}
+    assert totals[(2026, 2)] == totals[(2026, 3)] == {"fuel": 0, "maintenance": 0, "reparation": 0}
+
+
+# =================================================================
+# BACKFILL
+# =================================================================
+def test_ensure_backfilled_builds_once(db):
+    expense_rollup.ensure_backfilled(db)
+    assert db.scalar(select(func.count(Rollup.id))) == 0
+
+    db.add(models.Fuel(vehicle_id=1, fuel_type_id=1, quantity=5, price_little=2, cost=10,
+                       created_at=datetime(2026, 5, 5)))
+    db.commit()
+    expense_rollup.ensure_backfilled(db)
+    assert _rollup(db, "fuel") == {(1, 2026, 5): (10, 0, 5, 1)}
+
+    # Rows already there: a second start leaves the table alone
+    db.add(models.Fuel(vehicle_id=1, fuel_type_id=1, quantity=5, price_little=2, cost=10,
+                       created_at=datetime(2026, 5, 6)))
+    db.commit()
+    expense_rollup.ensure_backfilled(db)
+    assert _rollup(db, "fuel") == {(1, 2026, 5): (10, 0, 5, 1)}
@@ -0,0 +1,28 @@
+from datetime import datetime, timezone
+
+import orjson
+from fastapi import Response
+
+from app import models, schemas
+from app.utils import fast_json
+from app.utils.pagination import NEXT_CURSOR_HEADER
+
+
+def test_projection_follows_the_schema_fields():
+    columns = fast_json.projection(models.Fuel, schemas.FuelOut)
+    assert [c.key for c in columns] == list(schemas.FuelOut.model_fields)
+
+
+def test_rows_response_matches_the_pydantic_rendering():
+    created = datetime(2024, 5, 1, 8, 30, tzinfo=timezone.utc)
+    fields = list(schemas.FuelOut.model_fields)
+    row = tuple({"vehicle_id": 1, "fuel_type_id": 2, "quantity": 40.0, "price_little": 1.5,
+                 "cost": 60.0, "id": 7, "created_at": created, "is_verified": True}[f] for f in fields)
+    sub_response = Response()
+    sub_response.headers[NEXT_CURSOR_HEADER] = "abc"
+
+    response = fast_json.rows_response([row], schemas.FuelOut, sub_response)
+
+    expected = schemas.FuelOut.model_validate(dict(zip(fields, row))).model_dump(mode="json")
+    assert orjson.loads(response.body) == [expected]
+    assert response.headers[NEXT_CURSOR_HEADER] == "abc"
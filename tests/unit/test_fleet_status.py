@@ -0,0 +1,48 @@
+from datetime import datetime
+
+from app import models
+from app.utils import fleet_status
+
+
+def _vehicle(db, n, status="available"):
+    vehicle = models.Vehicle(plate_number=f"P-{n}", vin=f"VIN-{n}", color="white", status=status)
+    db.add(vehicle)
+    db.flush()
+    return vehicle
+
+
+def _status(db, vehicle):
+    db.expire(vehicle)
+    return vehicle.status
+
+
+def test_priority_reparation_over_panne_over_maintenance(db):
+    now = datetime.utcnow()
+    v = _vehicle(db, 1)
+    db.add(models.Maintenance(vehicle_id=v.id, receipt="r", maintenance_date=now, status="active"))
+    fleet_status.refresh(db, [v.id])
+    assert _status(db, v) == "maintenance"
+
+    panne = models.Panne(vehicle_id=v.id, category_panne_id=1, panne_date=now, status="active")
+    db.add(panne)
+    fleet_status.refresh(db, [v.id])
+    assert _status(db, v) == "panne"
+
+    db.flush()
+    db.add(models.Reparation(vehicle_id=v.id, panne_id=panne.id, receipt="r", repair_date=now, status="Inprogress"))
+    fleet_status.refresh(db, [v.id])
+    assert _status(db, v) == "reparation"
+
+
+def test_whole_fleet_mode_resets_only_engine_statuses(db):
+    now = datetime.utcnow()
+    stale = _vehicle(db, 1, status="panne")
+    manual = _vehicle(db, 2, status="retired")
+    busy = _vehicle(db, 3)
+    db.add(models.Maintenance(vehicle_id=busy.id, receipt="r", maintenance_date=now, status="active"))
+
+    fleet_status.refresh(db)
+
+    assert _status(db, stale) == "available"
+    assert _status(db, manual) == "retired"
+    assert _status(db, busy) == "maintenance"
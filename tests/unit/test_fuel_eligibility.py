@@ -0,0 +1,104 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+from app import models
+from app.utils import fuel_eligibility
+
+
+@pytest.fixture
+def seed_rows():
+    return [
+        models.Vehicle(id=1, plate_number="P-1", vin="VIN-1", color="white", status="available"),
+        models.Vehicle(id=2, plate_number="P-2", vin="VIN-2", color="white", status="available"),
+        models.Vehicle(id=3, plate_number="P-3", vin="VIN-3", color="white", status="panne"),
+        models.FuelType(id=1, fuel_type="Diesel"),
+    ]
+
+
+def _refuel(db, vehicle_id, when):
+    fuel = models.Fuel(vehicle_id=vehicle_id, fuel_type_id=1, quantity=10, price_little=2, cost=20, created_at=when)
+    db.add(fuel)
+    fuel_eligibility.refresh(db, [vehicle_id])
+    db.commit()
+    return fuel
+
+
+def _mission(db, vehicle_id, returned, status="in_progress"):
+    req = models.VehicleRequest(vehicle_id=vehicle_id, destination="X", departure_time=datetime(2026, 1, 1),
+                                return_time=returned, status=status)
+    db.add(req)
+    db.commit()
+    return req
+
+
+def test_rule_follows_fuel_and_completed_missions(db):
+    assert fuel_eligibility.check(db, [1, 3, 99]) == {
+        1: (True, "Eligible."),
+        3: (False, "Vehicle is not available."),
+    }
+
+    _refuel(db, 1, datetime(2026, 1, 5))
+    assert fuel_eligibility.check(db, [1])[1] == (False, "No completed mission since last refueling.")
+
+    # Completing a mission that ended after the refuel, from any code path, updates the state at commit
+    req = _mission(db, 1, datetime(2026, 1, 8))
+    assert fuel_eligibility.check(db, [1])[1][0] is False
+    req.status = "completed"
+    db.commit()
+    assert fuel_eligibility.check(db, [1])[1] == (True, "Eligible.")
+
+    # Reopening it takes the mission back
+    req.status = "in_progress"
+    db.commit()
+    assert fuel_eligibility.check(db, [1])[1][0] is False
+
+
+def test_moving_a_completed_mission_refreshes_both_vehicles(db):
+    _refuel(db, 1, datetime(2026, 1, 5))
+    _refuel(db, 2, datetime(2026, 1, 5))
+    req = _mission(db, 1, datetime(2026, 1, 8), status="completed")
+    assert fuel_eligibility.check(db, [1, 2]) == {1: (True, "Eligible."), 2: (False, "No completed mission since last refueling.")}
+
+    req.vehicle_id = 2
+    db.commit()
+    assert fuel_eligibility.check(db, [1, 2]) == {1: (False, "No completed mission since last refueling."), 2: (True, "Eligible.")}
+
+
+def test_missions_before_the_last_refuel_do_not_count(db):
+    _mission(db, 2, datetime(2026, 1, 3), status="completed")
+    _refuel(db, 2, datetime(2026, 1, 5))
+    assert fuel_eligibility.check(db, [2])[2][0] is False
+
+
+def test_rolled_back_completion_is_not_applied(db):
+    _refuel(db, 1, datetime(2026, 1, 5))
+    req = _mission(db, 1, datetime(2026, 1, 8))
+    req.status = "completed"
+    db.flush()
+    db.rollback()
+    db.commit()
+    assert fuel_eligibility.check(db, [1])[1][0] is False
+
+
+def test_rebuild_matches_incremental_state(db):
+    _refuel(db, 1, datetime(2026, 1, 5))
+    _mission(db, 1, datetime(2026, 1, 8), status="completed")
+    _refuel(db, 2, datetime(2026, 1, 6))
+    incremental = db.execute(select(models.VehicleFuelState.vehicle_id, models.VehicleFuelState.last_fuel_at,
+                                    models.VehicleFuelState.last_completed_mission_at)
+                             .where(models.VehicleFuelState.vehicle_id.in_([1, 2]))
+                             .order_by(models.VehicleFuelState.vehicle_id)).all()
+
+    fuel_eligibility.rebuild(db)
+    db.commit()
+    rebuilt = db.execute(select(models.VehicleFuelState.vehicle_id, models.VehicleFuelState.last_fuel_at,
+                                models.VehicleFuelState.last_completed_mission_at)
+                         .where(models.VehicleFuelState.vehicle_id.in_([1, 2]))
+                         .order_by(models.VehicleFuelState.vehicle_id)).all()
+    assert rebuilt == incremental
+    assert fuel_eligibility.check(db, [1, 2]) == {
+        1: (True, "Eligible."),
+        2: (False, "No completed mission since last refueling."),
+    }
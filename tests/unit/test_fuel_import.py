@@ -0,0 +1,39 @@
+import pytest
+
+from app import models
+from app.utils import bulk_upload, fuel_import
+
+
+@pytest.fixture
+def seed_rows():
+    return [
+        models.Vehicle(id=1, plate_number="P-1", vin="VIN-1", color="white"),
+        models.FuelType(id=1, fuel_type="Diesel"),
+    ]
+
+
+CSV = (
+    "\ufeffvehicle_id,fuel_type_id,quantity,price_little,created_at\n"
+    "1,1,40,2.5,2024-05-02T08:00:00\n"
+    "1,1,-3,2.5,\n"
+    "7,1,10,2.5,\n"
+    "1,1,12.5,3,\n"
+).encode("utf-8")
+
+
+def test_csv_report_rejects_whole_upload_by_default(db):
+    report = fuel_import.ingest(db, bulk_upload.parse_csv(CSV))
+
+    assert report["received"] == 4
+    assert report["inserted"] == 0
+    assert [e["row"] for e in report["errors"]] == [2, 3]
+    assert report["errors"][1]["errors"] == ["Vehicle 7 not found."]
+    assert db.query(models.Fuel).count() == 0
+
+
+def test_partial_inserts_valid_rows_with_computed_cost(db):
+    report = fuel_import.ingest(db, bulk_upload.parse_csv(CSV), partial=True)
+
+    assert report["inserted"] == 2
+    costs = sorted(f.cost for f in db.query(models.Fuel).filter(models.Fuel.id.in_(report["ids"])))
+    assert costs == [37.5, 100.0]
@@ -0,0 +1,71 @@
+from datetime import datetime
+
+import pytest
+
+from app import models
+from app.utils.kpi_engine import compute_fleet_kpis
+
+# A Wednesday: the week starts on Monday 16, the month on the 1st
+NOW = datetime(2026, 3, 18, 14, 0)
+
+
+def _vehicle(n, status, price):
+    return models.Vehicle(id=n, plate_number=f"P-{n}", vin=f"VIN-{n}", color="white", status=status, purchase_price=price)
+
+
+def _trip(n, status, departure):
+    return models.VehicleRequest(id=n, destination="X", status=status, departure_time=departure,
+                                 return_time=departure.replace(hour=23))
+
+
+@pytest.fixture
+def seed_rows():
+    return [
+        _vehicle(1, "available", 10000.5),
+        _vehicle(2, "active", 20000),
+        _vehicle(3, "maintenance", 5000),
+        _vehicle(4, "panne", 0),
+        _vehicle(5, "reparation", 1000.25),
+        _vehicle(6, "retired", 0),
+        models.FuelType(id=1, fuel_type="Diesel"),
+        models.CategoryPanne(id=1, panne_name="Engine"),
+        models.Panne(id=1, vehicle_id=4, category_panne_id=1, status="active", panne_date=datetime(2026, 3, 17)),
+        models.Panne(id=2, vehicle_id=5, category_panne_id=1, status="active", panne_date=datetime(2026, 2, 1)),
+        models.Panne(id=3, vehicle_id=1, category_panne_id=1, status="resolved", panne_date=datetime(2026, 3, 2)),
+        # This week: Monday midnight counts, Sunday evening does not
+        models.Fuel(vehicle_id=1, fuel_type_id=1, quantity=10, price_little=2, cost=20.1, created_at=datetime(2026, 3, 16)),
+        models.Fuel(vehicle_id=2, fuel_type_id=1, quantity=5, price_little=2, cost=10.2, created_at=datetime(2026, 3, 18, 9)),
+        models.Fuel(vehicle_id=2, fuel_type_id=1, quantity=50, price_little=2, cost=100, created_at=datetime(2026, 3, 15, 23, 59)),
+        # This month: from the 1st, whatever the status
+        models.Reparation(id=1, panne_id=2, vehicle_id=5, receipt="r", repair_date=datetime(2026, 3, 1), status="Completed"),
+        models.Reparation(id=2, panne_id=1, vehicle_id=4, receipt="r", repair_date=datetime(2026, 3, 17), status="Inprogress"),
+        models.Reparation(id=3, panne_id=3, vehicle_id=1, receipt="r", repair_date=datetime(2026, 2, 28, 23), status="Completed"),
+        # Planned trips: fully approved and leaving today or later
+        _trip(1, models.RequestStatus.FULLY_APPROVED, datetime(2026, 3, 18, 6)),
+        _trip(2, models.RequestStatus.FULLY_APPROVED, datetime(2026, 4, 2, 8)),
+        _trip(3, models.RequestStatus.FULLY_APPROVED, datetime(2026, 3, 17, 8)),
+        _trip(4, models.RequestStatus.APPROVED_BY_CHAROI, datetime(2026, 3, 20, 8)),
+        _trip(5, models.RequestStatus.IN_PROGRESS, datetime(2026, 3, 18, 10)),
+    ]
+
+
+def test_kpis_on_seeded_fleet(db):
+    assert compute_fleet_kpis(db, NOW) == {
+        "total_vehicles": 6,
+        "total_purchase_cost": 36000.75,
+        "available_vehicles": 2,
+        "maintenance_vehicles": 1,
+        "panne_vehicles": 1,
+        "reparation_vehicles": 1,
+        "active_pannes": 2,
+        "fuel_cost_this_week": 30.3,
+        "repairs_this_month": 2,
+        "planned_trips": 2,
+    }
+
+
+def test_time_windows_follow_now(db):
+    # Wednesday April 1st: a new month and a new week, one approved trip still ahead
+    kpis = compute_fleet_kpis(db, datetime(2026, 4, 1, 12))
+    assert (kpis["fuel_cost_this_week"], kpis["repairs_this_month"], kpis["planned_trips"]) == (0, 0, 1)
+    assert kpis["total_vehicles"] == 6
@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from app import models
+from app.utils import lookups
+from app.utils.cache import etag_matches
+
+
+@pytest.fixture
+def seed_rows():
+    return [
+        models.VehicleMake(id=1, vehicle_make="Toyota"),
+        models.Role(id=1, name="admin"),
+    ]
+
+
+def test_catalog_holds_every_table_and_its_version(db):
+    catalog = lookups.catalog(db)
+    body = json.loads(catalog.body)
+
+    assert body["version"] == catalog.version
+    assert {key for _, _, key in lookups.LOOKUP_TABLES.values()} <= body.keys()
+    assert body["vehicle_makes"] == [{"id": 1, "vehicle_make": "Toyota"}]
+    assert body["roles"][0]["name"] == "admin"
+    assert body["garages"] == []
+
+
+def test_version_only_changes_with_the_data(db):
+    first = lookups.catalog(db)
+    lookups.invalidate("role")
+    rebuilt = lookups.catalog(db)
+    assert rebuilt.version == first.version
+
+    db.add(models.Role(id=2, name="driver"))
+    db.commit()
+    assert lookups.catalog(db) is rebuilt        # Still cached until a writer invalidates
+    lookups.invalidate("role")
+    assert lookups.catalog(db).version != first.version
+
+
+def test_etag_matches():
+    assert etag_matches('"abc"', "abc")
+    assert etag_matches('W/"x", "abc"', "abc")
+    assert etag_matches("*", "abc")
+    assert not etag_matches('"abd"', "abc")
+    assert not etag_matches(None, "abc")
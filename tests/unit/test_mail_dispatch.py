@@ -0,0 +1,99 @@
+import asyncio
+import email
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from app.utils.mail_dispatch import MailDispatcher, OutgoingMail
+
+
+class RecordingHandler:
+    """aiosmtpd stand-in for the real relay: keeps every message and the session it came in on."""
+
+    def __init__(self):
+        self.messages = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("refused"):
+            return "550 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        # The session itself, not id(session): the id of a closed session can be reused
+        self.messages.append((session, envelope.rcpt_tos[:], envelope.content))
+        return "250 Message accepted"
+
+
+class DroppingHandler(RecordingHandler):
+    """Closes the first session after one delivered message, as a relay hitting its per-session limit would."""
+
+    def __init__(self):
+        super().__init__()
+        self.dropped = False
+
+    async def handle_MAIL(self, server, session, envelope, address, mail_options):
+        if self.messages and not self.dropped:
+            self.dropped = True
+            server.transport.close()
+            return "421 Closing connection"
+        envelope.mail_from = address
+        return "250 OK"
+
+
+@pytest.fixture
+def smtp_server(free_port):
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port)
+    controller.start()
+    try:
+        yield handler, controller.port
+    finally:
+        controller.stop()
+
+
+def test_fan_out_uses_one_session_and_in_memory_pdf(smtp_server):
+    handler, port = smtp_server
+    pdf = b"%PDF-1.4 mission order"
+    mails = [
+        OutgoingMail(f"user{i}@example.com", "Mission Order", "<p>Hello</p>", [("Mission_Order_1.pdf", pdf, "application/pdf")])
+        for i in range(5)
+    ]
+
+    failures = asyncio.run(MailDispatcher("127.0.0.1", port).send_batch(mails))
+
+    assert failures == []
+    assert len(handler.messages) == 5
+    assert len({session for session, _, _ in handler.messages}) == 1
+    parsed = email.message_from_bytes(handler.messages[0][2])
+    attachment = next(part for part in parsed.walk() if part.get_filename() == "Mission_Order_1.pdf")
+    assert attachment.get_payload(decode=True) == pdf
+
+
+def test_refused_recipient_does_not_abort_the_batch(smtp_server):
+    handler, port = smtp_server
+    mails = [
+        OutgoingMail("a@example.com", "s", "<p>1</p>"),
+        OutgoingMail("refused@example.com", "s", "<p>2</p>"),
+        OutgoingMail("b@example.com", "s", "<p>3</p>"),
+    ]
+
+    failures = asyncio.run(MailDispatcher("127.0.0.1", port).send_batch(mails))
+
+    assert [mail.to for mail, _ in failures] == ["refused@example.com"]
+    assert [rcpts for _, rcpts, _ in handler.messages] == [["a@example.com"], ["b@example.com"]]
+
+
+def test_dropped_session_is_reopened_and_the_batch_resumes(free_port):
+    handler = DroppingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port)
+    controller.start()
+    try:
+        mails = [OutgoingMail(f"user{i}@example.com", "s", f"<p>{i}</p>") for i in range(3)]
+        failures = asyncio.run(MailDispatcher("127.0.0.1", free_port).send_batch(mails))
+    finally:
+        controller.stop()
+
+    assert failures == []
+    assert [rcpts for _, rcpts, _ in handler.messages] == [["user0@example.com"], ["user1@example.com"], ["user2@example.com"]]
+    assert len({session for session, _, _ in handler.messages}) == 2
@@ -0,0 +1,147 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import aiosmtplib
+import pytest
+from aiosmtpd.controller import Controller
+
+from app import models
+from app.config import settings
+from app.utils import mail_outbox
+from app.utils.mail_dispatch import MailDispatcher, OutgoingMail
+
+
+class Handler:
+    def __init__(self):
+        self.delivered = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("refused"):
+            return "550 No such user"
+        if address.startswith("busy"):
+            return "451 Try again later"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.delivered.extend(envelope.rcpt_tos)
+        return "250 Message accepted"
+
+
+@pytest.fixture
+def db(db):
+    # Like the worker's session: rows stay loaded across the lease commit
+    db.expire_on_commit = False
+    return db
+
+
+@pytest.fixture
+def smtp_server(free_port):
+    handler = Handler()
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port)
+    controller.start()
+    try:
+        yield handler, MailDispatcher("127.0.0.1", free_port)
+    finally:
+        controller.stop()
+
+
+def test_rolled_back_change_sends_nothing(db):
+    mail_outbox.enqueue(db, [OutgoingMail("a@example.com", "s", "<p>x</p>")])
+    db.rollback()
+    assert db.query(models.EmailOutbox).count() == 0
+
+
+def test_drain_sends_retries_and_dead_letters(db, smtp_server):
+    handler, dispatcher = smtp_server
+    mail_outbox.enqueue(db, [
+        OutgoingMail("a@example.com", "s", "<p>1</p>", [("Mission_Order_1.pdf", b"%PDF", "application/pdf")]),
+        OutgoingMail("busy@example.com", "s", "<p>2</p>"),
+        OutgoingMail("refused@example.com", "s", "<p>3</p>"),
+    ])
+    db.commit()
+
+    processed = asyncio.run(mail_outbox.drain_once(db, dispatcher, concurrency=2, batch_size=2))
+
+    assert processed == 3
+    assert handler.delivered == ["a@example.com"]
+    rows = {row.recipient: row for row in db.query(models.EmailOutbox)}
+    assert rows["a@example.com"].status == "sent"
+    # 4xx: retried later with backoff; 5xx: dead-lettered straight away
+    assert rows["busy@example.com"].status == "pending"
+    assert rows["busy@example.com"].attempts == 1
+    assert rows["busy@example.com"].locked_until is None
+    assert rows["refused@example.com"].status == "dead"
+
+    # Nothing is due until the backoff has elapsed
+    assert asyncio.run(mail_outbox.drain_once(db, dispatcher, concurrency=2, batch_size=2)) == 0
+
+
+def test_retryable_failure_dead_letters_after_max_attempts(db):
+    mail_outbox.enqueue(db, [OutgoingMail("busy@example.com", "s", "<p>x</p>")])
+    db.commit()
+    row = db.query(models.EmailOutbox).one()
+    row.attempts = settings.MAIL_OUTBOX_MAX_ATTEMPTS - 2
+    db.commit()
+
+    busy = aiosmtplib.SMTPResponseException(451, "Try again later")
+    mail_outbox.record_results(db, [row], {row.id: busy})
+    assert (row.status, row.attempts) == ("pending", settings.MAIL_OUTBOX_MAX_ATTEMPTS - 1)
+
+    mail_outbox.record_results(db, [row], {row.id: busy})
+    assert (row.status, row.attempts) == ("dead", settings.MAIL_OUTBOX_MAX_ATTEMPTS)
+    assert "Try again later" in row.last_error
+
+
+def test_fan_out_stores_the_attachment_once(db):
+    pdf = ("Mission_Order_1.pdf", b"%PDF", "application/pdf")
+    mail_outbox.enqueue(db, [OutgoingMail(f"{n}@example.com", "s", "<p>x</p>", [pdf]) for n in "abc"])
+    db.commit()
+
+    assert db.query(models.EmailOutbox).count() == 3
+    assert db.query(models.EmailAttachment).count() == 1
+    assert {mail_outbox.to_mail(row).attachments[0] for row in db.query(models.EmailOutbox)} == {pdf}
+
+
+def test_every_attachment_is_kept_in_order(db):
+    pdf = ("Mission_Order_1.pdf", b"%PDF", "application/pdf")
+    receipt = ("receipt.png", b"\x89PNG", "image/png")
+    mail_outbox.enqueue(db, [
+        OutgoingMail("a@example.com", "s", "<p>1</p>", [pdf, receipt]),
+        OutgoingMail("b@example.com", "s", "<p>2</p>", [receipt]),
+    ])
+    db.commit()
+
+    mails = {row.recipient: mail_outbox.to_mail(row) for row in db.query(models.EmailOutbox)}
+    assert mails["a@example.com"].attachments == [pdf, receipt]
+    assert mails["b@example.com"].attachments == [receipt]
+    assert db.query(models.EmailAttachment).count() == 2
+
+
+def test_purge_drops_old_terminal_rows_and_orphan_attachments(db):
+    pdf = ("Mission_Order_1.pdf", b"%PDF", "application/pdf")
+    mail_outbox.enqueue(db, [
+        OutgoingMail("sent@example.com", "s", "<p>1</p>", [pdf]),
+        OutgoingMail("dead@example.com", "s", "<p>2</p>"),
+        OutgoingMail("pending@example.com", "s", "<p>3</p>"),
+        OutgoingMail("recent@example.com", "s", "<p>4</p>"),
+    ])
+    db.commit()
+    rows = {row.recipient: row for row in db.query(models.EmailOutbox)}
+    old = datetime.utcnow() - timedelta(days=settings.MAIL_OUTBOX_RETENTION_DAYS + 1)
+    for recipient, status in (("sent", "sent"), ("dead", "dead"), ("pending", "pending")):
+        rows[f"{recipient}@example.com"].status = status
+        rows[f"{recipient}@example.com"].created_at = old
+    rows["recent@example.com"].status = "sent"
+    db.commit()
+
+    assert mail_outbox.purge(db) == 2
+    assert {row.recipient for row in db.query(models.EmailOutbox)} == {"pending@example.com", "recent@example.com"}
+    assert db.query(models.EmailAttachment).count() == 0
+
+
+def test_backoff_doubles_and_is_capped():
+    base = settings.MAIL_OUTBOX_BACKOFF_SECONDS
+    assert mail_outbox.backoff(1) == timedelta(seconds=base)
+    assert mail_outbox.backoff(2) == timedelta(seconds=2 * base)
+    assert mail_outbox.backoff(50) == timedelta(seconds=settings.MAIL_OUTBOX_MAX_BACKOFF_SECONDS)
@@ -0,0 +1,21 @@
+from app import models
+from app.email_context import USER_VERIFY_ACCOUNT
+from app.security import verify_password
+from app.utils import mailer
+
+
+def test_queue_functions_write_outbox_rows_in_the_callers_transaction(db):
+    user = models.User(id=1, matricule="M1", full_name="User 1", email="u1@x.org", password="x", telephone="01",
+                       agency_id=1, service_id=1, role_id=1)
+    db.add(user)
+    db.flush()
+
+    mailer.queue_account_verification_email(db, user)
+    mailer.queue_account_activation_confirmation_email(db, user)
+    mailer.queue_password_changed_email(db, user.email, user.full_name)
+    db.commit()
+
+    rows = db.query(models.EmailOutbox).order_by(models.EmailOutbox.id).all()
+    assert [row.recipient for row in rows] == ["u1@x.org"] * 3
+    token = rows[0].html.split("token=")[1].split("&")[0]
+    assert verify_password(user.get_context_string(context=USER_VERIFY_ACCOUNT), token)
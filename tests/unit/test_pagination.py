@@ -0,0 +1,54 @@
+import pytest
+from datetime import datetime, timezone
+from fastapi import HTTPException, Response
+
+from app import models
+from app.routers import panne as panne_router
+from app.utils.pagination import NEXT_CURSOR_HEADER, PageParams, encode_cursor, decode_cursor
+
+
+@pytest.fixture
+def seed_rows():
+    return [models.Vehicle(id=1, plate_number="P-1", vin="VIN-1", color="white", status="panne"),
+            models.CategoryPanne(id=1, panne_name="Engine")] + [
+        models.Panne(id=n, vehicle_id=1, category_panne_id=1, panne_date=datetime(2026, 1, n),
+                     status="active" if n % 3 else "resolved")
+        for n in range(1, 11)
+    ]
+
+
+def _walk(db, limit, **filters):
+    """Follows X-Next-Cursor the way the SPA's "Load more" does; returns the ids of each page."""
+    pages, cursor = [], None
+    while True:
+        response = Response()
+        rows = panne_router.get_all_pannes(response, db, PageParams(limit, cursor), **filters)
+        pages.append([row.id for row in rows])
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            return pages
+
+
+def test_cursor_round_trip():
+    keys = (models.Fuel.created_at, models.Fuel.id)
+    values = [datetime(2024, 5, 1, 8, 30, tzinfo=timezone.utc), 42]
+    assert decode_cursor(encode_cursor(values), keys) == values
+
+
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor("not-a-cursor", (models.Fuel.id,))
+    assert exc.value.status_code == 400
+    # A cursor from a (created_at, id) endpoint does not fit an id-only one
+    with pytest.raises(HTTPException):
+        decode_cursor(encode_cursor([datetime.now(), 1]), (models.Fuel.id,))
+
+
+def test_following_the_cursor_returns_every_row_once(db):
+    assert _walk(db, 4, panne_status=None) == [[10, 9, 8, 7], [6, 5, 4, 3], [2, 1]]
+    # An exact multiple of the page size ends without an empty extra page
+    assert _walk(db, 5, panne_status=None) == [[10, 9, 8, 7, 6], [5, 4, 3, 2, 1]]
+
+
+def test_cursor_pages_keep_the_status_filter(db):
+    assert _walk(db, 4, panne_status="active") == [[10, 8, 7, 5], [4, 2, 1]]
@@ -0,0 +1,48 @@
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app import oauth2
+from app.routers import user as user_router
+from app.security import PasswordHasherPool
+
+
+def test_calls_beyond_workers_and_queue_get_a_503():
+    pool = PasswordHasherPool(max_workers=1, max_queue=1)
+    release = threading.Event()
+    # One call running, one queued: the pool is full
+    waiting = [threading.Thread(target=pool.run, args=(release.wait,)) for _ in range(2)]
+    for thread in waiting:
+        thread.start()
+    while pool.stats()["running"] + pool.stats()["queued"] < 2:
+        time.sleep(0.01)
+
+    with pytest.raises(HTTPException) as excinfo:
+        pool.run(len, "x")
+    assert excinfo.value.status_code == 503
+    assert excinfo.value.headers == {"Retry-After": "1"}
+
+    # Work that must not fail (mail tokens) still queues up
+    late = threading.Thread(target=pool.run, args=(len, "x"), kwargs={"reject_when_full": False})
+    late.start()
+
+    release.set()
+    for thread in (*waiting, late):
+        thread.join(timeout=5)
+    assert pool.stats() == {"workers": 1, "max_queue": 1, "running": 0, "queued": 0, "completed": 3, "rejected": 1}
+
+
+def test_stats_endpoint_reports_the_shared_pool():
+    app = FastAPI()
+    app.include_router(user_router.router)
+    client = TestClient(app)
+
+    assert client.get("/api/v1/auth/password-hasher/stats").status_code == 401
+
+    app.dependency_overrides[oauth2.require_admin_role_for_api] = lambda: None
+    response = client.get("/api/v1/auth/password-hasher/stats")
+    assert response.status_code == 200
+    assert set(response.json()) == {"workers", "max_queue", "running", "queued", "completed", "rejected"}
@@ -0,0 +1,142 @@
+import glob
+import os
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from app import models, schemas
+from app.config import settings
+from app.oauth2 import RolePrincipal, UserPrincipal
+from app.routers import approval
+from app.routers import request as request_router
+from app.utils import pdf_cache
+
+
+# =================================================================
+# CONTENT KEY
+# =================================================================
+def _order():
+    """Plain stand-ins for what get_pdf loads: request, passengers and the two signing officers."""
+    vehicle = SimpleNamespace(plate_number="A-1", make_ref=SimpleNamespace(vehicle_make="Toyota"),
+                              model_ref=SimpleNamespace(vehicle_model="Hilux"))
+    request = SimpleNamespace(id=7, destination="Gitega", description="Audit", status="fully_approved",
+                              departure_time=datetime(2026, 3, 1, 8), return_time=datetime(2026, 3, 2, 18),
+                              vehicle=vehicle, driver=SimpleNamespace(full_name="Driver"))
+    passengers = [SimpleNamespace(full_name="Ada", service=SimpleNamespace(service_name="IT"))]
+    return request, passengers, SimpleNamespace(full_name="Logistic"), SimpleNamespace(full_name="Darh")
+
+
+def _key(order):
+    return pdf_cache.mission_order_key(*order)
+
+
+def test_key_is_stable_for_the_same_inputs():
+    assert _key(_order()) == _key(_order())
+    assert len(_key(_order())) == 64
+
+
+@pytest.mark.parametrize("change", [
+    lambda r, p, lo, do: setattr(r, "destination", "Ngozi"),
+    lambda r, p, lo, do: setattr(r, "description", "Training"),
+    lambda r, p, lo, do: setattr(r, "departure_time", datetime(2026, 3, 1, 9)),
+    lambda r, p, lo, do: setattr(r, "return_time", datetime(2026, 3, 3, 18)),
+    lambda r, p, lo, do: setattr(r.vehicle, "plate_number", "B-2"),
+    lambda r, p, lo, do: setattr(r.vehicle.make_ref, "vehicle_make", "Nissan"),
+    lambda r, p, lo, do: setattr(r.vehicle.model_ref, "vehicle_model", "Patrol"),
+    lambda r, p, lo, do: setattr(r, "vehicle", None),
+    lambda r, p, lo, do: setattr(r.driver, "full_name", "Other driver"),
+    lambda r, p, lo, do: setattr(p[0], "full_name", "Bob"),
+    lambda r, p, lo, do: setattr(p[0].service, "service_name", "HR"),
+    lambda r, p, lo, do: p.append(SimpleNamespace(full_name="Eve", service=None)),
+    lambda r, p, lo, do: setattr(lo, "full_name", "New logistic"),
+    lambda r, p, lo, do: setattr(do, "full_name", "New darh"),
+])
+def test_key_changes_with_every_printed_field(change):
+    order = _order()
+    before = _key(order)
+    change(*order)
+    assert _key(order) != before
+
+
+def test_key_ignores_fields_not_printed():
+    order = _order()
+    before = _key(order)
+    order[0].status = "in_progress"
+    assert _key(order) == before
+
+
+def test_key_changes_with_the_template_version(monkeypatch):
+    before = _key(_order())
+    monkeypatch.setattr(pdf_cache, "TEMPLATE_VERSION", "next")
+    assert _key(_order()) != before
+
+
+# =================================================================
+# DOWNLOAD ROUTE AND INVALIDATION
+# =================================================================
+@pytest.fixture
+def seed_rows():
+    return [
+        models.Role(id=1, name="admin"),
+        models.Service(id=1, service_name="IT"),
+        models.User(id=1, matricule="M1", full_name="Driver", agency_id=1, service_id=1, role_id=1,
+                    telephone="1", email="d@x.org", password="x", is_active=True),
+        models.User(id=2, matricule="M2", full_name="Other driver", agency_id=1, service_id=1, role_id=1,
+                    telephone="2", email="o@x.org", password="x", is_active=True),
+        models.Vehicle(id=1, plate_number="A-1", vin="VIN-1", color="white", status="available"),
+        models.VehicleRequest(id=7, destination="Gitega", status=models.RequestStatus.FULLY_APPROVED,
+                              vehicle_id=1, driver_id=1, passengers=["M1"],
+                              departure_time=datetime(2026, 3, 1, 8), return_time=datetime(2026, 3, 2, 18)),
+    ]
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PDF_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _cached(cache_dir, request_id):
+    return glob.glob(os.path.join(cache_dir, f"{request_id}-*.pdf"))
+
+
+def test_get_pdf_answers_304_for_a_matching_etag(db, cache_dir, monkeypatch):
+    first = approval.get_pdf(7, db, None)
+    assert first.status_code == 200
+    assert first.body.startswith(b"%PDF")
+    etag = first.headers["etag"]
+    assert len(_cached(cache_dir, 7)) == 1
+
+    # A revalidation neither renders nor reads the document
+    monkeypatch.setattr(pdf_cache, "render", lambda *args: pytest.fail("rendered on a 304"))
+    revalidated = approval.get_pdf(7, db, etag)
+    assert revalidated.status_code == 304
+    assert revalidated.body == b""
+    assert revalidated.headers["etag"] == etag
+
+    assert approval.get_pdf(7, db, f'W/"other", {etag}').status_code == 304
+
+
+def test_get_pdf_serves_a_new_document_once_the_order_changes(db, cache_dir):
+    etag = approval.get_pdf(7, db, None).headers["etag"]
+
+    db.get(models.VehicleRequest, 7).destination = "Ngozi"
+    db.commit()
+    changed = approval.get_pdf(7, db, etag)
+
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    # store() keeps only the latest version of a request
+    assert len(_cached(cache_dir, 7)) == 1
+
+
+def test_assign_drops_the_cached_documents(db, cache_dir):
+    approval.get_pdf(7, db, None)
+    assert _cached(cache_dir, 7)
+
+    admin = UserPrincipal(id=1, full_name="Driver", matricule="M1", email="d@x.org", role_id=1, service_id=1,
+                          agency_id=1, is_active=True, role=RolePrincipal(id=1, name="admin"))
+    request_router.assign_vehicle_and_driver(7, schemas.RequestAssignment(vehicle_id=1, driver_id=2), db, admin)
+
+    assert _cached(cache_dir, 7) == []
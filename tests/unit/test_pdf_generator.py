@@ -0,0 +1,27 @@
+from io import BytesIO
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen.canvas import Canvas
+
+from app.utils import pdf_generator
+
+
+def _render(placements: int) -> bytes:
+    buffer = BytesIO()
+    canv = Canvas(buffer, pagesize=A4)
+    for _ in range(placements):
+        pdf_generator.LOGO.draw(canv, 50, 700, 120, 60)
+        canv.showPage()
+    canv.save()
+    return buffer.getvalue()
+
+
+def test_logo_is_embedded_once_per_document():
+    assert pdf_generator.LOGO is not None
+    once, twice = _render(1), _render(2)
+
+    images = once.count(b"/Subtype /Image")
+    assert images >= 1
+    # The second page references the same form XObject instead of a new image
+    assert twice.count(b"/Subtype /Image") == images
+    assert twice.count(b"/Subtype /Form") == once.count(b"/Subtype /Form")
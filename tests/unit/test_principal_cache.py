@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import models, oauth2, schemas
+from app.database import Base
+from app.routers import user as user_router
+
+
+@pytest.fixture
+def stores(tmp_path):
+    """
+    One sqlite file seen through a sync Session (the auth routes) and an async engine
+    (the oauth2 dependencies), plus the statements the async side runs.
+    """
+    path = tmp_path / "auth.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    statements = []
+    event.listen(async_engine.sync_engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+
+    db = sessionmaker(bind=engine, autoflush=False)()
+    db.add_all([
+        models.Role(id=1, name="admin"),
+        models.User(id=1, matricule="M1", full_name="Ada", agency_id=1, service_id=1, role_id=1, telephone="1",
+                    email="ada@x.org", password="x", is_active=True),
+        models.User(id=2, matricule="M2", full_name="Bob", agency_id=1, service_id=1, role_id=1, telephone="2",
+                    email="bob@x.org", password="x", is_active=True),
+    ])
+    db.commit()
+    oauth2._principal_cache.clear()
+    try:
+        yield db, async_sessionmaker(async_engine, expire_on_commit=False), statements
+    finally:
+        oauth2._principal_cache.clear()
+        db.close()
+        engine.dispose()
+        asyncio.run(async_engine.dispose())
+
+
+def _lookup(stores, token):
+    _, async_session, _ = stores
+
+    async def run():
+        async with async_session() as adb:
+            return await oauth2.get_token_user(token, adb)
+
+    return asyncio.run(run())
+
+
+def _login(stores, user_id):
+    db = stores[0]
+    return user_router._generate_tokens_helper(db.get(models.User, user_id), db)
+
+
+def test_cache_hit_does_not_touch_the_database(stores):
+    statements = stores[2]
+    access_token = _login(stores, 1)["access_token"]
+
+    first = _lookup(stores, access_token)
+    assert first.full_name == "Ada" and first.role.name == "admin"
+    assert statements
+
+    statements.clear()
+    assert _lookup(stores, access_token) is first
+    assert statements == []
+
+
+def test_refresh_evicts_the_expired_token(stores):
+    tokens = _login(stores, 1)
+    assert _lookup(stores, tokens["access_token"]) is not None
+
+    renewed = user_router.refresh_token(tokens["refresh_token"], stores[0])
+
+    assert _lookup(stores, tokens["access_token"]) is None
+    assert _lookup(stores, renewed["access_token"]).id == 1
+
+
+def test_update_user_evicts_every_principal_of_that_user(stores):
+    db, _, statements = stores
+    ada_tokens = [_login(stores, 1)["access_token"] for _ in range(2)]
+    bob_token = _login(stores, 2)["access_token"]
+    for token in ada_tokens + [bob_token]:
+        _lookup(stores, token)
+    admin = _lookup(stores, bob_token)
+
+    user_router.update_user(1, schemas.UserUpdate(full_name="Ada L."), db, admin)
+
+    statements.clear()
+    assert [_lookup(stores, token).full_name for token in ada_tokens] == ["Ada L.", "Ada L."]
+    assert statements
+    # Other users keep their cached principal
+    statements.clear()
+    assert _lookup(stores, bob_token) is admin
+    assert statements == []
+
+
+def test_delete_user_evicts_the_principal(stores):
+    db = stores[0]
+    ada_token = _login(stores, 1)["access_token"]
+    admin = _lookup(stores, _login(stores, 2)["access_token"])
+    assert _lookup(stores, ada_token) is not None
+
+    user_router.delete_user(1, db, admin)
+
+    assert _lookup(stores, ada_token) is None
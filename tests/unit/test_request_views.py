@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app import models, schemas
+from app.oauth2 import RolePrincipal, UserPrincipal
+from app.routers.request import _summary_query, _summary_row
+from app.utils import request_inbox
+
+
+def _user(db, n, service_id):
+    user = models.User(matricule=f"M{n}", full_name=f"User {n}", agency_id=1, service_id=service_id,
+                       role_id=1, telephone=f"0{n}", email=f"u{n}@x.org", password="x")
+    db.add(user)
+    db.flush()
+    return user
+
+
+def _principal(user, role):
+    return UserPrincipal(id=user.id, full_name=user.full_name, matricule=user.matricule, email=user.email,
+                         role_id=1, service_id=user.service_id, agency_id=1, is_active=True,
+                         role=RolePrincipal(id=1, name=role))
+
+
+def test_summary_rows_carry_the_joined_names(db):
+    now = datetime.utcnow()
+    requester, driver = _user(db, 1, service_id=1), _user(db, 2, service_id=1)
+    vehicle = models.Vehicle(plate_number="P-1", vin="VIN-1", color="white")
+    db.add(vehicle)
+    db.flush()
+    db.add_all([
+        models.VehicleRequest(requester_id=requester.id, vehicle_id=vehicle.id, driver_id=driver.id, destination="A",
+                              departure_time=now, return_time=now + timedelta(hours=2), status="pending", passengers=["M1"]),
+        models.VehicleRequest(requester_id=requester.id, destination="B",
+                              departure_time=now, return_time=now, status="pending"),
+    ])
+    db.commit()
+
+    rows = [_summary_row(r) for r in db.execute(_summary_query().order_by(models.VehicleRequest.id)).all()]
+
+    assert rows[0]["requester"] == {"id": requester.id, "full_name": "User 1", "matricule": "M1"}
+    assert rows[0]["vehicle"] == {"id": vehicle.id, "plate_number": "P-1"}
+    assert rows[0]["driver"] == {"id": driver.id, "full_name": "User 2"}
+    assert rows[1]["vehicle"] is None and rows[1]["driver"] is None
+    for row in rows:
+        schemas.VehicleRequestSummaryOut.model_validate(row)
+
+
+def test_summary_respects_role_visibility(db):
+    now = datetime.utcnow()
+    chef, colleague, outsider = _user(db, 1, service_id=1), _user(db, 2, service_id=1), _user(db, 3, service_id=2)
+    for user in (chef, colleague, outsider):
+        db.add(models.VehicleRequest(requester_id=user.id, destination="X", departure_time=now, return_time=now, status="pending"))
+    db.commit()
+
+    def requesters(principal):
+        return sorted(r.requester_id for r in db.execute(request_inbox.visible(_summary_query(), principal)).all())
+
+    assert requesters(_principal(chef, "chef")) == [chef.id, colleague.id]
+    assert requesters(_principal(outsider, "user")) == [outsider.id]
+    assert requesters(_principal(outsider, "admin")) == [chef.id, colleague.id, outsider.id]
+
+
+def test_actionable_follows_the_workflow_step(db):
+    now = datetime.utcnow()
+    chef, colleague, outsider = _user(db, 1, service_id=1), _user(db, 2, service_id=1), _user(db, 3, service_id=2)
+    db.add_all([
+        models.VehicleRequest(requester_id=colleague.id, destination="A", departure_time=now, return_time=now, status="pending"),
+        models.VehicleRequest(requester_id=outsider.id, destination="B", departure_time=now, return_time=now, status="pending"),
+        models.VehicleRequest(requester_id=outsider.id, destination="C", departure_time=now, return_time=now, status="approved_by_chef"),
+        models.VehicleRequest(requester_id=outsider.id, destination="D", departure_time=now, return_time=now, status="completed"),
+    ])
+    db.commit()
+
+    def destinations(principal):
+        query = select(models.VehicleRequest.destination).where(request_inbox.actionable(principal))
+        return sorted(db.execute(query).scalars())
+
+    assert destinations(_principal(chef, "chef")) == ["A"]
+    assert destinations(_principal(chef, "charoi")) == ["C"]
+    assert destinations(_principal(outsider, "user")) == ["B", "C"]
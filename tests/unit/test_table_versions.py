@@ -0,0 +1,77 @@
+import pytest
+from sqlalchemy import select, update
+
+from app import models
+from app.utils import table_versions  # registers the session hooks
+
+
+def _versions(db):
+    return dict(db.execute(select(models.TableVersion.name, models.TableVersion.version)).all())
+
+
+def test_orm_writes_bump_their_tables_once_per_commit(db):
+    db.add(models.VehicleMake(vehicle_make="Toyota"))
+    db.add(models.VehicleMake(vehicle_make="Nissan"))
+    db.commit()
+    assert _versions(db) == {"vehicle_make": 1}
+
+    make = db.query(models.VehicleMake).first()
+    make.vehicle_make = "Isuzu"
+    db.add(models.FuelType(fuel_type="Diesel"))
+    db.commit()
+    assert _versions(db) == {"vehicle_make": 2, "fuel_type": 1}
+
+
+def test_bulk_statements_are_tracked(db):
+    db.add(models.VehicleMake(id=1, vehicle_make="Toyota"))
+    db.commit()
+
+    db.execute(update(models.VehicleMake).where(models.VehicleMake.id == 1).values(vehicle_make="Hino"))
+    db.commit()
+    assert _versions(db)["vehicle_make"] == 2
+
+
+def test_rolled_back_writes_do_not_bump(db):
+    db.add(models.VehicleMake(vehicle_make="Toyota"))
+    db.flush()
+    db.rollback()
+    db.commit()
+    assert _versions(db) == {}
+
+
+@pytest.fixture
+def sequences(monkeypatch):
+    """Takes the Postgres path (advance after commit) and records the tables each commit advances."""
+    advanced = []
+    monkeypatch.setattr(table_versions, "_uses_sequences", lambda dialect_name: True)
+    monkeypatch.setattr(table_versions, "advance", lambda connection, tables: advanced.append(sorted(tables)))
+    return advanced
+
+
+def test_sequence_path_advances_after_commit_without_the_counter_row(db, sequences):
+    db.add(models.VehicleMake(vehicle_make="Toyota"))
+    db.add(models.FuelType(fuel_type="Diesel"))
+    db.flush()
+    assert sequences == []
+
+    db.commit()
+    assert sequences == [["fuel_type", "vehicle_make"]]
+    assert _versions(db) == {}
+
+
+def test_sequence_path_waits_for_the_outer_commit(db, sequences):
+    db.add(models.VehicleMake(vehicle_make="Toyota"))
+    with db.begin_nested():
+        db.add(models.FuelType(fuel_type="Diesel"))
+    assert sequences == []
+
+    db.commit()
+    assert sequences == [["fuel_type", "vehicle_make"]]
+
+
+def test_sequence_path_skips_rolled_back_writes(db, sequences):
+    db.add(models.VehicleMake(vehicle_make="Toyota"))
+    db.flush()
+    db.rollback()
+    db.commit()
+    assert sequences == []
@@ -0,0 +1,23 @@
+from sqlalchemy import select
+
+from app import models
+from app.utils.upsert import upsert
+
+TableVersion = models.TableVersion
+
+
+def _versions(db):
+    return dict(db.execute(select(TableVersion.name, TableVersion.version)).all())
+
+
+def test_inserts_new_keys_and_updates_existing_ones(db):
+    upsert(db, TableVersion, [{"name": "a", "version": 1}], key=["name"], update_cols=["version"])
+    upsert(db, TableVersion, [{"name": "a", "version": 5}, {"name": "b", "version": 2}], key=["name"], update_cols=["version"])
+    assert _versions(db) == {"a": 5, "b": 2}
+
+
+def test_set_expressions_apply_on_conflict_only(db):
+    rows = [{"name": "a", "version": 1}]
+    for _ in range(3):
+        upsert(db, TableVersion, rows, key=["name"], update_cols=[], set_={"version": TableVersion.version + 1})
+    assert _versions(db) == {"a": 3}
@@ -0,0 +1,65 @@
+import pytest
+
+from app import models
+from app.utils import vehicle_import
+
+
+@pytest.fixture
+def seed_rows():
+    return [
+        models.VehicleMake(id=1, vehicle_make="Toyota"),
+        models.VehicleModel(id=1, vehicle_model="Hilux"),
+        models.VehicleType(id=1, vehicle_type="Pickup"),
+        models.VehicleTransmission(id=1, vehicle_transmission="Manual"),
+        models.FuelType(id=1, fuel_type="Diesel"),
+        models.Vehicle(plate_number="EXISTING", vin="VIN-0", color="white"),
+    ]
+
+
+def _row(plate, vin, **overrides):
+    row = {
+        "plate_number": plate, "vin": vin, "color": "white", "year": 2022,
+        "make": "toyota", "model": "Hilux", "vehicle_type": 1, "vehicle_transmission": "1",
+        "vehicle_fuel_type": "Diesel", "purchase_date": "2022-01-10T00:00:00",
+    }
+    row.update(overrides)
+    return row
+
+
+def test_names_resolve_and_conflicts_are_reported_per_row(db):
+    rows = [
+        _row("A-1", "VIN-1"),
+        _row("EXISTING", "VIN-2"),
+        _row("A-1", "VIN-3"),
+        _row("A-4", "VIN-4", make="Unknown"),
+    ]
+
+    report = vehicle_import.ingest(db, rows, partial=True)
+
+    assert report["inserted"] == 1
+    assert {e["row"]: e["errors"] for e in report["errors"]} == {
+        2: ["Plate number already exists."],
+        3: ["Plate number repeats row 1."],
+        4: ["make: unknown vehicle make 'Unknown'."],
+    }
+    vehicle = db.get(models.Vehicle, report["ids"][0])
+    assert (vehicle.make, vehicle.model, vehicle.vehicle_transmission, vehicle.vehicle_fuel_type) == (1, 1, 1, 1)
+
+
+def test_unresolved_rows_still_get_conflict_errors(db):
+    rows = [_row("EXISTING", "VIN-1", make="Unknown"), _row("C-1", "VIN-1")]
+
+    report = vehicle_import.ingest(db, rows, partial=True)
+
+    assert report["inserted"] == 0
+    assert {e["row"]: e["errors"] for e in report["errors"]} == {
+        1: ["make: unknown vehicle make 'Unknown'.", "Plate number already exists."],
+        2: ["VIN repeats row 1."],
+    }
+
+
+def test_any_error_rejects_the_upload_by_default(db):
+    report = vehicle_import.ingest(db, [_row("B-1", "VIN-9"), _row("B-2", "VIN-0")])
+
+    assert report["inserted"] == 0
+    assert db.query(models.Vehicle).count() == 1
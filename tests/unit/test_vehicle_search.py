@@ -0,0 +1,43 @@
+import pytest
+
+from app import models
+from app.utils import vehicle_search
+
+
+@pytest.fixture
+def seed_rows():
+    return [
+        models.VehicleMake(id=1, vehicle_make="Toyota"),
+        models.VehicleMake(id=2, vehicle_make="Nissan"),
+        models.VehicleModel(id=1, vehicle_model="Hilux"),
+        models.Vehicle(plate_number="AB123", vin="JT1", color="white", make=1, model=1, status="available"),
+        models.Vehicle(plate_number="XAB12", vin="JT2", color="white", make=2, status="panne"),
+        models.Vehicle(plate_number="C_900", vin="AB-77", color="white", make=2, status="available"),
+    ]
+
+
+def _plates(hits):
+    return [hit["plate_number"] for hit in hits]
+
+
+def test_plate_prefix_ranks_before_substring_and_vin(db):
+    assert _plates(vehicle_search.search(db, "ab")) == ["AB123", "XAB12", "C_900"]
+
+
+def test_make_and_model_names_match_and_are_returned(db):
+    hits = vehicle_search.search(db, "hilux")
+    assert _plates(hits) == ["AB123"]
+    assert hits[0]["make"] == "Toyota" and hits[0]["model"] == "Hilux"
+    assert _plates(vehicle_search.search(db, "nissan")) == ["C_900", "XAB12"]
+
+
+def test_status_filter_limit_and_wildcards(db):
+    assert _plates(vehicle_search.search(db, "ab", statuses=["available"])) == ["AB123", "C_900"]
+    assert _plates(vehicle_search.search(db, "", limit=2)) == ["AB123", "C_900"]
+    assert _plates(vehicle_search.search(db, "_9")) == ["C_900"]
+    assert vehicle_search.search(db, "%") == []
+
+
+def test_ids_restrict_the_hits(db):
+    assert _plates(vehicle_search.search(db, ids=[1, 3])) == ["AB123", "C_900"]
+    assert _plates(vehicle_search.search(db, "ab", ids=[2, 3])) == ["XAB12", "C_900"]
@@ -0,0 +1,71 @@
+from datetime import date, datetime
+
+import pytest
+
+from app import models
+from app.utils import expense_rollup, vehicle_tco
+
+
+@pytest.fixture
+def seed_rows():
+    return [
+        models.VehicleMake(id=1, vehicle_make="Toyota"),
+        models.FuelType(id=1, fuel_type="Diesel"),
+        models.Vehicle(id=1, plate_number="A-1", vin="V1", color="white", make=1, mileage=1000, purchase_price=5000),
+        models.Vehicle(id=2, plate_number="B-2", vin="V2", color="white", mileage=0, purchase_price=9000),
+        models.Vehicle(id=3, plate_number="C-3", vin="V3", color="white", mileage=500),
+        # Vehicle 1: fuel in Jan and Feb, a service in Feb; vehicle 2: one repair in Mar
+        models.Fuel(vehicle_id=1, fuel_type_id=1, quantity=40, price_little=2, cost=80, created_at=datetime(2026, 1, 10)),
+        models.Fuel(vehicle_id=1, fuel_type_id=1, quantity=20, price_little=2, cost=40, created_at=datetime(2026, 2, 3)),
+        models.Maintenance(vehicle_id=1, maintenance_cost=30, receipt="r", maintenance_date=datetime(2026, 2, 20)),
+        models.Reparation(vehicle_id=2, cost=200, receipt="r", repair_date=datetime(2026, 3, 1)),
+    ]
+
+
+@pytest.fixture
+def db(db):
+    expense_rollup.rebuild(db)
+    db.commit()
+    return db
+
+
+def test_fleet_report_totals_ratios_and_windows(db):
+    report = vehicle_tco.fleet_report(db)
+    assert report["fleet"] == {"vehicles": 3, "running_cost": 350.0, "fuel_litres": 60.0}
+
+    first, second, third = report["vehicles"]
+    assert (first["plate_number"], first["running_cost"], first["cost_rank"]) == ("B-2", 200.0, 1)
+    assert first["cost_per_km"] is None  # no mileage recorded
+    assert first["ownership_cost"] == 9200.0
+
+    assert second["plate_number"] == "A-1" and second["make"] == "Toyota"
+    assert (second["fuel_cost"], second["maintenance_cost"], second["reparation_cost"]) == (120.0, 30.0, 0.0)
+    assert second["cost_per_km"] == pytest.approx(0.15)
+    assert second["avg_monthly_litres"] == 30.0
+    assert second["litres_per_100km"] == 6.0
+    assert second["fleet_share"] == pytest.approx(150 / 350)
+
+    assert third["plate_number"] == "C-3" and third["running_cost"] == 0.0 and third["avg_monthly_litres"] is None
+
+
+def test_sort_and_top_n_keep_fleet_wide_figures(db):
+    report = vehicle_tco.fleet_report(db, sort="fuel_litres", limit=1)
+    assert [v["plate_number"] for v in report["vehicles"]] == ["A-1"]
+    assert report["vehicles"][0]["cost_rank"] == 2
+    assert report["fleet"]["vehicles"] == 3
+
+    report = vehicle_tco.fleet_report(db, sort="plate_number", descending=False)
+    assert [v["plate_number"] for v in report["vehicles"]] == ["A-1", "B-2", "C-3"]
+
+
+def test_period_and_monthly_series(db):
+    report = vehicle_tco.fleet_report(db, start=date(2026, 2, 15), end=date(2026, 2, 15), monthly=True)
+    a1 = next(v for v in report["vehicles"] if v["vehicle_id"] == 1)
+    assert a1["running_cost"] == 70.0
+    assert [m["month"] for m in a1["monthly"]] == ["2026-02"]
+
+    series = vehicle_tco.monthly_series(db, [1, 2])
+    assert [(m["month"], m["fuel_litres"], m["cumulative_cost"]) for m in series[1]] == [
+        ("2026-01", 40.0, 80.0), ("2026-02", 20.0, 150.0),
+    ]
+    assert [m["cumulative_cost"] for m in series[2]] == [200.0]